@@ -1,2 +1,2 @@
 #: The package version string.
-__version__ = '0.6.3'
+__version__ = '0.7.0'
@@ -4,12 +4,15 @@ from __future__ import annotations
 import os
 from argparse import ArgumentParser, Namespace
 from collections.abc import Mapping, Sequence
+from enum import Enum
 from pathlib import Path
 from typing import final, TypeVar, Final, Any, Union, Optional
 
-from .sign import Signatures
+from .queue import DropPolicy
+from .sign import get_algorithm, Signatures
 
-__all__ = ['ConfigT_co', 'ConfigError', 'TransientConfigError', 'BaseConfig']
+__all__ = ['ConfigT_co', 'ConfigError', 'TransientConfigError',
+           'ProbeStrategy', 'BaseConfig']
 
 #: Covariant type variable for :class:`BaseConfig` sub-classes.
 ConfigT_co = TypeVar('ConfigT_co', bound='BaseConfig', covariant=True)
@@ -41,6 +44,23 @@ class TransientConfigError(ConfigError):
         self.wait_hint: Final = wait_hint
 
 
+class ProbeStrategy(Enum):
+    """Determines how the cluster member is chosen each time a :term:`ping` is
+    sent for failure detection.
+
+    """
+
+    #: A cluster member is chosen at random each time. A failed member may go
+    #: unchecked for an unbounded number of intervals.
+    RANDOM = 'random'
+
+    #: Cluster members are chosen in rounds, each a new random order of every
+    #: member, with new members placed at a random point in the current round.
+    #: A failed member is checked within twice the number of cluster members
+    #: intervals.
+    ROUND_ROBIN = 'round-robin'
+
+
 class BaseConfig:
     """Configure the cluster behavior and characteristics.
     :class:`~swimprotocol.transport.Transport` implementations should
@@ -48,22 +68,64 @@ class BaseConfig:
 
     Args:
         secret: The shared secret for cluster packet signing, see
-            :class:`Signatures`.
+            :class:`~swimprotocol.sign.Signatures`.
+        sign_algorithm: The name of the algorithm used for cluster packet
+            signing, see :func:`~swimprotocol.sign.get_algorithm`.
         local_name: The unique name of the local cluster member.
         peers: At least one name of another known node in the cluster.
         local_metadata: The initial local cluster member metadata.
         ping_interval: Time between :term:`ping` attempts to random cluster
             members.
+        probe_strategy: How the cluster member is chosen for each
+            :term:`ping` attempt.
         ping_timeout: Time to wait for an :term:`ack` after sending a
-            :term:`ping`.
+            :term:`ping`, until the round-trip time to the cluster member has
+            been measured.
+        ping_min_timeout: The least time to wait for an :term:`ack` after
+            sending a :term:`ping`, when the timeout is derived from the
+            round-trip time to the cluster member.
+        ping_max_timeout: The most time to wait for an :term:`ack` after
+            sending a :term:`ping`, when the timeout is derived from the
+            round-trip time to the cluster member.
         ping_req_count: Number of nodes to send a :term:`ping-req` when a
             :term:`ping` fails.
         ping_req_timeout: Time to wait for an *ack* after sending a
-            :term:`ping-req`.
+            :term:`ping-req`, until the round-trip times to the cluster
+            members involved have been measured.
+        ping_req_min_timeout: The least time to wait for an *ack* after
+            sending a :term:`ping-req`, when the timeout is derived from
+            round-trip times.
+        ping_req_max_timeout: The most time to wait for an *ack* after
+            sending a :term:`ping-req`, when the timeout is derived from
+            round-trip times.
         suspect_timeout: Time to wait after losing connectivity with a cluster
             member before marking it offline.
+        reconnect_interval: Time between :term:`ping` attempts to an
+            :term:`offline` cluster member, after it first goes offline.
+        reconnect_max_interval: The time between :term:`ping` attempts to an
+            :term:`offline` cluster member doubles after each attempt, up to
+            this maximum.
+        offline_ttl: Time a cluster member may be offline before it is
+            gossiped as a :term:`tombstone`, or ``None`` to keep offline
+            members forever. The *peers* are never removed.
+        tombstone_retention: Time a :term:`tombstone` is kept, and gossiped,
+            before the cluster member is removed.
         sync_interval: Time between sync attempts to disseminate cluster
             changes.
+        compress_threshold: Packet payloads of at least this many bytes are
+            compressed by transports that support it. Compression is disabled
+            by default.
+        compress_dict: A preset dictionary of data commonly found in packet
+            payloads, e.g. metadata keys and values, to improve compression.
+            This must be the same for all cluster members.
+        probe_queue_size: The maximum number of :term:`ping`, :term:`ping-req`,
+            and :term:`ack` packets waiting to be sent or handled.
+        probe_queue_policy: The drop policy when *probe_queue_size* is
+            reached.
+        gossip_queue_size: The maximum number of :term:`gossip` packets
+            waiting to be sent or handled.
+        gossip_queue_policy: The drop policy when *gossip_queue_size* is
+            reached.
 
     Raises:
         ConfigError: The given configuration was invalid.
@@ -75,31 +137,81 @@ class BaseConfig:
     _empty: dict[str, bytes] = {}
 
     def __init__(self, *, secret: Union[None, str, bytes],
+                 sign_algorithm: str = 'hmac-sha256',
                  local_name: str,
                  peers: Sequence[str],
                  local_metadata: Mapping[str, bytes] = _empty,
                  ping_interval: float = 1.0,
+                 probe_strategy: ProbeStrategy = ProbeStrategy.ROUND_ROBIN,
                  ping_timeout: float = 0.3,
+                 ping_min_timeout: float = 0.05,
+                 ping_max_timeout: float = 1.0,
                  ping_req_count: int = 1,
                  ping_req_timeout: float = 0.9,
+                 ping_req_min_timeout: float = 0.15,
+                 ping_req_max_timeout: float = 3.0,
                  suspect_timeout: float = 5.0,
-                 sync_interval: float = 0.5) -> None:
+                 reconnect_interval: float = 1.0,
+                 reconnect_max_interval: float = 300.0,
+                 offline_ttl: Optional[float] = None,
+                 tombstone_retention: float = 60.0,
+                 sync_interval: float = 0.5,
+                 compress_threshold: Optional[int] = None,
+                 compress_dict: Optional[bytes] = None,
+                 probe_queue_size: int = 1024,
+                 probe_queue_policy: DropPolicy = DropPolicy.DROP_OLDEST,
+                 gossip_queue_size: int = 1024,
+                 gossip_queue_policy: DropPolicy = DropPolicy.COALESCE) \
+            -> None:
         super().__init__()
-        self._signatures = Signatures(secret)
+        try:
+            algorithm = get_algorithm(sign_algorithm)
+        except ValueError as exc:
+            raise ConfigError(
+                f'Unknown signing algorithm: {sign_algorithm!r}') from exc
+        self._signatures = Signatures(secret, algorithm=algorithm)
         self.local_name: Final = local_name
         self.peers: Final = peers
         self.local_metadata: Final = local_metadata
         self.ping_interval: Final = ping_interval
+        self.probe_strategy: Final = probe_strategy
         self.ping_timeout: Final = ping_timeout
+        self.ping_min_timeout: Final = ping_min_timeout
+        self.ping_max_timeout: Final = ping_max_timeout
         self.ping_req_count: Final = ping_req_count
         self.ping_req_timeout: Final = ping_req_timeout
+        self.ping_req_min_timeout: Final = ping_req_min_timeout
+        self.ping_req_max_timeout: Final = ping_req_max_timeout
         self.suspect_timeout: Final = suspect_timeout
+        self.reconnect_interval: Final = reconnect_interval
+        self.reconnect_max_interval: Final = reconnect_max_interval
+        self.offline_ttl: Final = offline_ttl
+        self.tombstone_retention: Final = tombstone_retention
         self.sync_interval: Final = sync_interval
+        self.compress_threshold: Final = compress_threshold
+        self.compress_dict: Final = compress_dict
+        self.probe_queue_size: Final = probe_queue_size
+        self.probe_queue_policy: Final = probe_queue_policy
+        self.gossip_queue_size: Final = gossip_queue_size
+        self.gossip_queue_policy: Final = gossip_queue_policy
         self._validate()
 
     def _validate(self) -> None:
         if not self.local_name:
             raise ConfigError('This cluster instance needs a local name.')
+        if self.probe_queue_size < 1 or self.gossip_queue_size < 1:
+            raise ConfigError('Queue sizes must be positive.')
+        if self.ping_min_timeout <= 0.0 \
+                or self.ping_max_timeout < self.ping_min_timeout \
+                or self.ping_req_min_timeout <= 0.0 \
+                or self.ping_req_max_timeout < self.ping_req_min_timeout:
+            raise ConfigError('Invalid ping timeouts.')
+        if self.reconnect_interval <= 0.0 \
+                or self.reconnect_max_interval < self.reconnect_interval:
+            raise ConfigError('Invalid reconnect intervals.')
+        if self.offline_ttl is not None and self.offline_ttl < 0.0 \
+                or self.tombstone_retention < 0.0:
+            raise ConfigError('Tombstone times must not be negative.')
 
     @property
     def signatures(self) -> Signatures:
@@ -131,6 +243,10 @@ class BaseConfig:
         group.add_argument(f'{prefix}secret', dest='swim_secret',
                            metavar='STRING',
                            help='The secret string used to verify messages.')
+        group.add_argument(f'{prefix}sign-algorithm',
+                           dest='swim_sign_algorithm', metavar='NAME',
+                           help='The algorithm used to sign messages, e.g. '
+                                'hmac-sha256 or blake2b.')
         group.add_argument(f'{prefix}name', dest='swim_name',
                            metavar='localname',
                            help='External name or address for this node.')
@@ -176,6 +292,9 @@ class BaseConfig:
         ``SWIM_SECRET``, ``SWIM_SECRET_FILE`` [*]_
           The *secret* keyword argument.
 
+        ``SWIM_SIGN_ALGORITHM``
+          The *sign_algorithm* keyword argument.
+
         ``SWIM_NAME``
           The *local_name* keyword argument.
 
@@ -190,11 +309,16 @@ class BaseConfig:
 
         """
         secret = args.swim_secret or cls._get_env(env_prefix, 'SECRET')
+        sign_algorithm = args.swim_sign_algorithm \
+            or cls._get_env(env_prefix, 'SIGN_ALGORITHM')
         local_name = args.swim_name or cls._get_env(env_prefix, 'NAME')
         peers = args.swim_peers or cls._get_env_list(env_prefix, 'PEERS')
-        return {'secret': secret,
-                'local_name': local_name,
-                'peers': peers}
+        kwargs: dict[str, Any] = {'secret': secret,
+                                  'local_name': local_name,
+                                  'peers': peers}
+        if sign_algorithm:
+            kwargs['sign_algorithm'] = sign_algorithm
+        return kwargs
 
     @final
     @classmethod
@@ -4,11 +4,11 @@ from __future__ import annotations
 import random
 import time
 from collections import defaultdict
-from collections.abc import Generator, Iterator, Mapping, Set
+from collections.abc import Collection, Generator, Iterator, Mapping, Set
 from dataclasses import dataclass
 from functools import total_ordering
 from typing import Final, Optional, Any
-from weakref import WeakKeyDictionary, WeakValueDictionary
+from weakref import WeakValueDictionary
 
 from .config import BaseConfig
 from .listener import Listener
@@ -18,8 +18,20 @@ from .status import Status
 
 __all__ = ['MemberSnapshot', 'Member', 'Members']
 
+_all_statuses: Final = tuple(Status.all_statuses())
 
-@dataclass(frozen=True)
+# smoothing factors for round-trip times, as in RFC 6298
+_rtt_alpha: Final = 0.125
+_rtt_beta: Final = 0.25
+
+# bit N is set if the status is included in _all_statuses[N]
+_status_bits: Final = {
+    status: sum(1 << index for index, other in enumerate(_all_statuses)
+                if status & other)
+    for status in _all_statuses}
+
+
+@dataclass(frozen=True, slots=True)
 class MemberSnapshot:
     """Represents a :term:`member` at a previous moment in time.
 
@@ -50,22 +62,43 @@ class Member:
     #: <https://docs.python.org/3/reference/expressions.html#is-not>`_.
     METADATA_UNKNOWN: Mapping[str, bytes] = {}
 
-    def __init__(self, name: str, local: bool) -> None:
+    __slots__ = ('__weakref__', 'name', 'local', '_index', '_clock',
+                 '_validity', '_source', '_known_clocks', '_change_seq',
+                 '_prev_change_seq', '_prev_clock', '_gossip_watermark',
+                 '_status', '_status_time', '_metadata', '_metadata_clocks',
+                 '_removed_clocks', '_history_clock', '_tombstone_time',
+                 '_removed', '_rtt', '_rtt_deviation', '_previous',
+                 '_pending_clock', '_pending_status', '_pending_metadata',
+                 '_pending_tombstone')
+
+    def __init__(self, name: str, local: bool, index: int) -> None:
         super().__init__()
         self.name: Final = name
         self.local: Final = local
+        self._index: Final = index
         self._clock = 0
         self._validity = random.randbytes(8)
-        self._known_clocks: WeakKeyDictionary[Member, int] = \
-            WeakKeyDictionary()
+        self._source = Source(name, self._validity)
+        self._known_clocks: dict[int, int] = {}
+        self._change_seq = 0
+        self._prev_change_seq = 0
+        self._prev_clock = 0
+        self._gossip_watermark = 0
         self._status = Status.OFFLINE
         self._status_time = time.time()
-        self._metadata: frozenset[tuple[str, bytes]] = frozenset()
-        self._metadata_dict = self.METADATA_UNKNOWN
+        self._metadata = self.METADATA_UNKNOWN
+        self._metadata_clocks: dict[str, int] = {}
+        self._removed_clocks: dict[str, int] = {}
+        self._history_clock = 0
+        self._tombstone_time: Optional[float] = None
+        self._removed = False
+        self._rtt: Optional[float] = None
+        self._rtt_deviation = 0.0
         self._previous = self._snapshot()
         self._pending_clock: Optional[int] = None
         self._pending_status: Optional[Status] = None
-        self._pending_metadata: Optional[frozenset[tuple[str, bytes]]] = None
+        self._pending_metadata: Optional[Mapping[str, bytes]] = None
+        self._pending_tombstone: Optional[bool] = None
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, Member):
@@ -85,7 +118,7 @@ class Member:
 
     @property
     def source(self) -> Source:
-        return Source(self.name, self._validity)
+        return self._source
 
     @property
     def clock(self) -> int:
@@ -109,13 +142,71 @@ class Member:
     @property
     def metadata(self) -> Mapping[str, bytes]:
         """The last known :term:`metadata` of the cluster member."""
-        return self._metadata_dict
+        return self._metadata
+
+    @property
+    def tombstone(self) -> bool:
+        """True if the cluster member has been :term:`offline` long enough
+        that it is a :term:`tombstone`, and will be removed.
+
+        """
+        return self._tombstone_time is not None
+
+    @property
+    def removed(self) -> bool:
+        """True if the cluster member was a :term:`tombstone` that has been
+        removed from the cluster. The
+        :attr:`~swimprotocol.members.Members.listener` is notified one last
+        time when this happens.
+
+        """
+        return self._removed
+
+    @property
+    def rtt(self) -> Optional[float]:
+        """The smoothed round-trip time, in seconds, of :term:`ping` and
+        :term:`ack` packets sent directly to the cluster member, or ``None``
+        if it has not been measured.
+
+        """
+        return self._rtt
+
+    @property
+    def rtt_deviation(self) -> float:
+        """The smoothed mean deviation of the round-trip times measured for
+        :attr:`.rtt`.
+
+        """
+        return self._rtt_deviation
 
     @property
     def previous(self) -> MemberSnapshot:
         """A snapshot of the member before the most recent change."""
         return self._previous
 
+    def metadata_since(self, clock: int) \
+            -> Optional[tuple[Mapping[str, bytes], Set[str]]]:
+        """Return the :attr:`.metadata` keys and values that changed after the
+        given sequence clock, along with the keys that were removed.
+
+        ``None`` is returned if the changes after *clock* are not fully known,
+        because the changes to a non-local member before it was last updated
+        by a full snapshot were never seen.
+
+        Args:
+            clock: The sequence clock of a previous change to the member.
+
+        """
+        if clock < self._history_clock:
+            return None
+        metadata = self._metadata
+        changed = {key: metadata[key]
+                   for key, key_clock in self._metadata_clocks.items()
+                   if key_clock > clock}
+        removed = {key for key, key_clock in self._removed_clocks.items()
+                   if key_clock > clock}
+        return changed, removed
+
     def _snapshot(self) -> MemberSnapshot:
         return MemberSnapshot(name=self.name,
                               clock=self.clock,
@@ -123,10 +214,6 @@ class Member:
                               status_time=self.status_time,
                               metadata=self.metadata)
 
-    def _needs_gossip(self, member: Member) -> bool:
-        known_clock = self._known_clocks.get(member, -1)
-        return member.clock > known_clock
-
     def _set_clock(self, clock: int, next_clock: int) -> None:
         assert self._pending_clock is None
         if clock > self._clock:
@@ -140,40 +227,87 @@ class Member:
 
     def _set_metadata(self, metadata: Mapping[str, bytes]) -> None:
         assert self._pending_metadata is None
-        pending_metadata = frozenset(metadata.items())
-        if self._metadata_dict is self.METADATA_UNKNOWN or \
-                pending_metadata != self._metadata:
-            self._pending_metadata = pending_metadata
+        if self._metadata is self.METADATA_UNKNOWN or \
+                metadata != self._metadata:
+            self._pending_metadata = dict(metadata)
+
+    def _set_tombstone(self, tombstone: bool) -> None:
+        assert self._pending_tombstone is None
+        if tombstone != self.tombstone:
+            self._pending_tombstone = tombstone
+
+    def _update_metadata_clocks(self, previous: Mapping[str, bytes]) -> None:
+        clock = self._clock
+        metadata = self._metadata
+        metadata_clocks = self._metadata_clocks
+        removed_clocks = self._removed_clocks
+        for key, val in metadata.items():
+            if previous.get(key) != val:
+                metadata_clocks[key] = clock
+                removed_clocks.pop(key, None)
+        for key in previous.keys() - metadata.keys():
+            metadata_clocks.pop(key, None)
+            removed_clocks[key] = clock
+
+    def _update_history(self, base_clock: Optional[int],
+                        changed: Collection[str],
+                        removed: Collection[str]) -> None:
+        if base_clock is None:
+            self._history_clock = self._clock
+            return
+        # a delta lists every change after base_clock, even those to keys
+        # that were added and removed again before this member saw them
+        clock = self._clock
+        metadata_clocks = self._metadata_clocks
+        removed_clocks = self._removed_clocks
+        self._history_clock = max(self._history_clock, base_clock)
+        for key in changed:
+            metadata_clocks[key] = clock
+            removed_clocks.pop(key, None)
+        for key in removed:
+            metadata_clocks.pop(key, None)
+            removed_clocks[key] = clock
 
     def _save(self, source: Optional[Member], next_clock: int) -> bool:
-        updated = False
         ignore_update = self.local and source is not None
-        previous = self._snapshot()
         pending_clock = self._pending_clock
         pending_status = self._pending_status
         pending_metadata = self._pending_metadata
+        pending_tombstone = self._pending_tombstone
         self._pending_clock = None
         self._pending_status = None
         self._pending_metadata = None
+        self._pending_tombstone = None
         if pending_clock is None and self != source:
             return False
+        elif pending_status is None and pending_metadata is None \
+                and pending_tombstone is None:
+            if pending_clock is not None and not self.local \
+                    and source is not None:
+                # the state is unchanged, but is now known at a newer clock
+                self._previous = self._snapshot()
+                self._clock = pending_clock
+            return False
         elif ignore_update:
             pending_clock = next_clock
-        if pending_status is not None:
-            updated = True
-            if not ignore_update:
+        previous = self._snapshot()
+        if not ignore_update:
+            if pending_status is not None:
                 self._status = pending_status
                 self._status_time = time.time()
-        if pending_metadata is not None:
-            updated = True
-            if not ignore_update:
+            if pending_metadata is not None:
                 self._metadata = pending_metadata
-                self._metadata_dict = dict(pending_metadata)
-        if updated and pending_clock is not None:
+            if pending_tombstone is not None:
+                self._tombstone_time = time.time() \
+                    if pending_tombstone else None
+            if self._status != Status.OFFLINE:
+                self._tombstone_time = None
+        if pending_clock is not None:
             self._clock = pending_clock
-        if updated:
-            self._previous = previous
-        return updated
+        if pending_metadata is not None and not ignore_update:
+            self._update_metadata_clocks(previous.metadata)
+        self._previous = previous
+        return True
 
 
 class Members(Set[Member]):
@@ -188,11 +322,20 @@ class Members(Set[Member]):
         super().__init__()
         self.listener: Listener[Member] = Listener()
         self._next_clock = 1
-        self._local = Member(config.local_name, True)
+        self._change_seq = 0
+        self._changes: dict[int, Member] = {}
+        self._next_index = 0
+        self._indexes: dict[int, Member] = {}
+        self._peers = frozenset(config.peers)
+        self._offline_ttl = config.offline_ttl
+        self._tombstone_retention = config.tombstone_retention
+        self._local = self._new_member(config.local_name, True)
         self._non_local: set[Member] = set()
         self._members = WeakValueDictionary({config.local_name: self._local})
+        self._status_shuffles: list[WeakShuffle[Member]] = \
+            [WeakShuffle() for _ in _all_statuses]
         self._statuses: defaultdict[Status, WeakShuffle[Member]] = \
-            defaultdict(WeakShuffle)
+            defaultdict(WeakShuffle, zip(_all_statuses, self._status_shuffles))
         for peer in config.peers:
             self.get(peer)
         self.update(self._local, new_status=Status.ONLINE,
@@ -207,14 +350,35 @@ class Members(Set[Member]):
     def __len__(self) -> int:
         return len(self._members)
 
-    def _refresh_statuses(self, member: Member) -> None:
+    def _new_member(self, name: str, local: bool) -> Member:
+        index = self._next_index
+        self._next_index = index + 1
+        self._indexes[index] = member = Member(name, local, index)
+        return member
+
+    def _remove(self, member: Member) -> None:
+        self._non_local.discard(member)
+        self._members.pop(member.name, None)
+        self._changes.pop(member._change_seq, None)
+        self._indexes.pop(member._index, None)
+        for shuffle in self._status_shuffles:
+            shuffle.discard(member)
+        member._removed = True
+        self.listener.notify(member)
+
+    def _refresh_statuses(self, member: Member,
+                          prev_status: Optional[Status]) -> None:
         if not member.local:
-            member_status = member.status
-            for status in Status.all_statuses():
-                if member_status & status:
-                    self._statuses[status].add(member)
-                else:
-                    self._statuses[status].discard(member)
+            bits = _status_bits[member.status]
+            changed = bits
+            if prev_status is not None:
+                changed ^= _status_bits[prev_status]
+            for index, shuffle in enumerate(self._status_shuffles):
+                if changed >> index & 1:
+                    if bits >> index & 1:
+                        shuffle.add(member)
+                    else:
+                        shuffle.discard(member)
 
     @property
     def local(self) -> Member:
@@ -237,14 +401,7 @@ class Members(Set[Member]):
             exclude: Members that must not be included in the resulting list.
 
         """
-        shuffle = self._statuses[status]
-        results: set[Member] = set()
-        num_excluded = sum(1 for member in exclude if member in shuffle)
-        num_remaining = len(shuffle) - num_excluded
-        num_results = min(num_remaining, count)
-        while len(results) < num_results:
-            results.add(shuffle.choice())
-        return frozenset(results)
+        return frozenset(self._statuses[status].sample(count, exclude))
 
     def get_status(self, status: Status) -> Shuffle[Member]:
         """Return all of the non-local cluster members with the given status.
@@ -272,33 +429,74 @@ class Members(Set[Member]):
         """
         member = self._members.get(name)
         if member is None:
-            member = Member(name, False)
+            member = self._new_member(name, False)
             self._non_local.add(member)
             self._members[name] = member
-            for status in Status.all_statuses():
-                if member.status & status:
-                    self._statuses[status].add(member)
+            self._refresh_statuses(member, None)
         if not member.local and validity is not None \
                 and member._validity != validity:
-            member._known_clocks.clear()
+            member._known_clocks = {}
+            member._gossip_watermark = 0
             member._validity = validity
+            member._source = Source(name, validity)
         return member
 
+    def lookup(self, name: str) -> Optional[Member]:
+        """Return the cluster member with the given name, or ``None`` if it
+        does not exist.
+
+        Args:
+            name: The unique name of the cluster member.
+
+        """
+        return self._members.get(name)
+
     def _update(self, member: Member, source: Optional[Member],
                 clock: int, status: Optional[Status],
-                metadata: Optional[Mapping[str, bytes]]) -> None:
+                metadata: Optional[Mapping[str, bytes]],
+                tombstone: Optional[bool]) -> None:
+        if member.removed:
+            return
         next_clock = self._next_clock
+        prev_clock = member.clock
+        prev_status = member.status
+        prev_metadata = member.metadata
         member._set_clock(clock, next_clock)
         if status is not None:
             member._set_status(status)
         if metadata is not None:
             member._set_metadata(metadata)
-        if member._save(source, next_clock):
-            self._refresh_statuses(member)
+        if tombstone is not None:
+            member._set_tombstone(tombstone)
+        changed = member._save(source, next_clock)
+        if changed:
+            self._refresh_statuses(member, prev_status)
             self.listener.notify(member)
+        if changed or member.clock != prev_clock:
+            self._add_change(member, prev_clock, prev_metadata)
         if member.clock >= next_clock:
             self._next_clock = member.clock + 1
 
+    def _add_change(self, member: Member, prev_clock: int,
+                    prev_metadata: Mapping[str, bytes]) -> None:
+        changes = self._changes
+        changes.pop(member._change_seq, None)
+        if member.clock == prev_clock:
+            # the change has the same clock as the previous change, so no
+            # target may be assumed to know it by that clock
+            member._prev_change_seq = 0
+            member._prev_clock = 0
+            index = member._index
+            for target in self._non_local:
+                target._known_clocks.pop(index, None)
+        else:
+            member._prev_change_seq = member._change_seq
+            member._prev_clock = prev_clock \
+                if prev_metadata is not Member.METADATA_UNKNOWN else 0
+        self._change_seq = change_seq = self._change_seq + 1
+        member._change_seq = change_seq
+        changes[change_seq] = member
+
     def update(self, member: Member, *,
                new_status: Optional[Status] = None,
                new_metadata: Optional[Mapping[str, bytes]] = None) -> None:
@@ -310,11 +508,14 @@ class Members(Set[Member]):
             new_metadata: New metadata dictionary for the member, if any.
 
         """
-        self._update(member, None, self._next_clock, new_status, new_metadata)
+        self._update(member, None, self._next_clock, new_status, new_metadata,
+                     None)
 
     def apply(self, member: Member, source: Member, clock: int, *,
-              status: Status, metadata: Optional[Mapping[str, bytes]]) \
-            -> None:
+              status: Status, metadata: Optional[Mapping[str, bytes]],
+              base_clock: Optional[int] = None,
+              removed: Collection[str] = (),
+              tombstone: bool = False) -> None:
         """Apply a disseminated update from *source* to *member*.
 
         Args:
@@ -323,14 +524,68 @@ class Members(Set[Member]):
             clock: The sequence clock of the update.
             status: The status to apply to *member*.
             metadata: The metadata to apply to *member*, if known.
+            base_clock: If given, *metadata* contains only the keys that
+                changed after this sequence clock, which must not be newer
+                than the known :attr:`~Member.metadata` of *member*.
+            removed: The metadata keys that were removed after *base_clock*.
+            tombstone: Whether *member* is a :term:`tombstone`.
+
+        """
+        changed: Collection[str] = ()
+        if metadata is not None and base_clock is not None:
+            assert member.metadata is not Member.METADATA_UNKNOWN
+            assert member.clock >= base_clock
+            changed = metadata.keys()
+            metadata = {key: val for key, val in member.metadata.items()
+                        if key not in removed} | metadata
+        else:
+            base_clock = None
+        prev_clock = member.clock
+        prev_metadata = member.metadata
+        self._update(member, source, clock, status, metadata, tombstone)
+        if not member.local and (member.clock != prev_clock
+                                 or member.metadata is not prev_metadata):
+            member._update_history(base_clock, changed, removed)
+
+    def reap(self) -> None:
+        """Checks the non-local cluster members that are :term:`offline`, if
+        the :class:`offline_ttl <swimprotocol.config.BaseConfig>` is
+        configured.
+
+        Members that have been offline for longer than *offline_ttl* become a
+        :term:`tombstone`, which is disseminated like any other change.
+        Tombstones that are older than the
+        :class:`tombstone_retention <swimprotocol.config.BaseConfig>` are
+        removed, and :attr:`.listener` is notified. The configured *peers*
+        are never removed.
 
         """
-        self._update(member, source, clock, status, metadata)
+        offline_ttl = self._offline_ttl
+        if offline_ttl is None:
+            return
+        now = time.time()
+        tombstone_before = now - offline_ttl
+        remove_before = now - self._tombstone_retention
+        peers = self._peers
+        for member in list(self._statuses[Status.OFFLINE]):
+            if member.name in peers:
+                continue
+            tombstone_time = member._tombstone_time
+            if tombstone_time is not None:
+                if tombstone_time <= remove_before:
+                    self._remove(member)
+            elif member.status_time <= tombstone_before:
+                self._update(member, None, self._next_clock, None, None, True)
 
     def get_gossip(self, target: Member) -> Generator[Member, None, None]:
         """Iterates through cluster members looking for :term:`gossip` that
         should be sent to *target*.
 
+        Members are indexed by the order of their most recent change, and
+        *target* tracks the point in that order before which it has
+        acknowledged every change, so only the members changed after that
+        point are considered.
+
         See Also:
             :ref:`Dissemination`
 
@@ -338,13 +593,105 @@ class Members(Set[Member]):
             target: The recipient of the cluster gossip.
 
         """
-        local = self._local
-        if target._needs_gossip(local):
-            yield local
-        for member in self._non_local:
+        watermark = target._gossip_watermark
+        changes = self._changes
+        needed: list[Member] = []
+        oldest_needed: Optional[int] = None
+        for change_seq in reversed(changes):
+            if change_seq <= watermark:
+                break
+            member = changes[change_seq]
             if member.metadata is not Member.METADATA_UNKNOWN and \
-                    target._needs_gossip(member):
-                yield member
+                    self._needs_gossip(target, member):
+                needed.append(member)
+                oldest_needed = change_seq
+        if oldest_needed is None:
+            new_watermark = self._change_seq
+        else:
+            new_watermark = oldest_needed - 1
+        if new_watermark != watermark:
+            # target only knows the previous change of a member if the
+            # watermark passed it before the member changed again
+            known_clocks = target._known_clocks
+            for member in needed:
+                if watermark < member._prev_change_seq <= new_watermark:
+                    known_clocks.setdefault(member._index, 0)
+            target._gossip_watermark = new_watermark
+            self._prune_known_clocks(target)
+        yield from needed
+
+    def _get_known_clock(self, target: Member,
+                         member: Member) -> Optional[int]:
+        known_clock = target._known_clocks.get(member._index)
+        if known_clock is not None:
+            return known_clock
+        watermark = target._gossip_watermark
+        if member._change_seq <= watermark:
+            return member.clock
+        elif 0 < member._prev_change_seq <= watermark:
+            return member._prev_clock
+        return None
+
+    def _needs_gossip(self, target: Member, member: Member) -> bool:
+        known_clock = self._get_known_clock(target, member)
+        return known_clock is None or member.clock > known_clock
+
+    def _prune_known_clocks(self, target: Member) -> None:
+        # changes at or below the watermark are known by target, and removed
+        # members are no longer needed
+        known_clocks = target._known_clocks
+        if known_clocks:
+            indexes = self._indexes
+            watermark = target._gossip_watermark
+            target._known_clocks = {
+                index: clock for index, clock in known_clocks.items()
+                if (member := indexes.get(index)) is not None
+                and member._change_seq > watermark}
+
+    def _lower_watermark(self, target: Member, watermark: int) -> None:
+        # keep what target is known to have acknowledged above the watermark
+        known_clocks = target._known_clocks
+        changes = self._changes
+        for change_seq in reversed(changes):
+            if change_seq <= watermark:
+                break
+            member = changes[change_seq]
+            if member._index not in known_clocks:
+                known_clock = self._get_known_clock(target, member)
+                if known_clock is not None:
+                    known_clocks[member._index] = known_clock
+        target._gossip_watermark = watermark
+
+    def get_known_clock(self, target: Member, member: Member) -> int:
+        """Return the sequence clock of *member* most recently acknowledged by
+        *target*, or ``0`` if *target* has not acknowledged any updates about
+        *member*.
+
+        Args:
+            target: The recipient of the cluster gossip.
+            member: The cluster member that was updated.
+
+        """
+        return self._get_known_clock(target, member) or 0
+
+    def add_rtt(self, member: Member, rtt: float) -> None:
+        """Adds a new round-trip time measurement to the smoothed
+        :attr:`~Member.rtt` and :attr:`~Member.rtt_deviation` of the cluster
+        member.
+
+        Args:
+            member: The cluster member that was measured.
+            rtt: The round-trip time, in seconds.
+
+        """
+        smoothed = member._rtt
+        if smoothed is None:
+            member._rtt = rtt
+            member._rtt_deviation = rtt / 2.0
+        else:
+            member._rtt_deviation += _rtt_beta * (
+                abs(smoothed - rtt) - member._rtt_deviation)
+            member._rtt = smoothed + _rtt_alpha * (rtt - smoothed)
 
     def ack_gossip(self, member: Member, source: Member, clock: int) -> None:
         """Marks the *source* cluster member as having received updates about
@@ -358,4 +705,8 @@ class Members(Set[Member]):
 
         """
         assert clock <= self._next_clock
-        source._known_clocks[member] = clock
+        if member._change_seq <= source._gossip_watermark:
+            if clock >= member.clock:
+                return
+            self._lower_watermark(source, member._change_seq - 1)
+        source._known_clocks[member._index] = clock
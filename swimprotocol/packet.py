@@ -1,13 +1,14 @@
 
 from __future__ import annotations
 
-from collections.abc import Mapping
-from dataclasses import dataclass
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
 from typing import Optional
 
 from .status import Status
 
-__all__ = ['Source', 'Packet', 'Ping', 'PingReq', 'Ack', 'Gossip', 'GossipAck']
+__all__ = ['Source', 'GossipRecord', 'Packet', 'Ping', 'PingReq', 'Ack',
+           'Gossip', 'GossipAck']
 
 
 @dataclass(frozen=True)
@@ -24,6 +25,33 @@ class Source:
     validity: bytes
 
 
+@dataclass(frozen=True)
+class GossipRecord:
+    """The state of a cluster member, as included in the *gossip* of a
+    :class:`Packet`.
+
+    Args:
+        name: The name of the cluster member whose state has changed.
+        clock: The sequence clock value associated with the change.
+        status: The current perceived status of the cluster member.
+        metadata: The current metadata associated with the cluster member.
+        base_clock: If given, *metadata* contains only the keys that changed
+            after this sequence clock.
+        removed: The metadata keys that were removed after *base_clock*.
+        tombstone: The cluster member has been offline long enough that it
+            will be removed from the cluster.
+
+    """
+
+    name: str
+    clock: int
+    status: Status
+    metadata: Optional[Mapping[str, bytes]]
+    base_clock: Optional[int] = None
+    removed: Sequence[str] = ()
+    tombstone: bool = False
+
+
 @dataclass(frozen=True)
 class Packet:
     """Base class for a :term:`packet` sent between cluster members.
@@ -32,21 +60,36 @@ class Packet:
     directly, e.g. :class:`~swimprotocol.udp.pack.UdpPack`, or adapt their
     contents into another protocol.
 
+    Any packet may carry :term:`gossip`, which is acknowledged by a later
+    packet sent back to *source*.
+
     Args:
         source: The name of the local cluster member that created the packet.
+        gossip: The changes to one or more cluster members.
+        gossip_acks: The sequence clock of each :class:`GossipRecord`
+            received from the recipient, keyed by the name of the cluster
+            member.
 
     """
 
     source: Source
+    gossip: Sequence[GossipRecord] = field(default=(), kw_only=True)
+    gossip_acks: Mapping[str, int] = field(default_factory=dict,
+                                           kw_only=True)
 
 
 @dataclass(frozen=True)
 class Ping(Packet):
     """Packets used for the SWIM protocol :term:`ping` operation, which do not
-    explicitly contain any other information other than the *source*.
+    explicitly contain any other information other than the *source* and
+    *seq*.
+
+    Args:
+        seq: Identifies the probe, to be copied into the :class:`Ack`.
 
     """
-    pass
+
+    seq: int = 0
 
 
 @dataclass(frozen=True)
@@ -56,10 +99,13 @@ class PingReq(Packet):
 
     Args:
         target: The name of the target cluster member.
+        seq: Identifies the probe, to be copied into the :class:`Ack`
+            forwarded from *target*.
 
     """
 
     target: str
+    seq: int = 0
 
 
 @dataclass(frozen=True)
@@ -67,40 +113,32 @@ class Ack(Packet):
     """Packets used for the SWIM protocol :term:`ack` response, which indicates
     that *source* is online.
 
+    Args:
+        seq: The *seq* of the :class:`Ping` or :class:`PingReq` packet being
+            acknowledged.
+
     """
-    pass
+
+    seq: int = 0
 
 
 @dataclass(frozen=True)
 class Gossip(Packet):
     """Packets used for SWIM protocol :term:`gossip`, which alert other members
-    when a cluster member has changed status or metadata. This information is
+    when cluster members have changed status or metadata. This information is
     intended to travel around the cluster until all members are aware of the
     change.
 
-    Args:
-        name: The name of the cluster member whose state has changed.
-        clock: The sequence clock value associated with the change.
-        status: The current perceived status of the cluster member.
-        metadata: The current metadata associated with the cluster member.
+    Unlike other packets, these are sent only to disseminate *gossip*.
 
     """
-
-    name: str
-    clock: int
-    status: Status
-    metadata: Optional[Mapping[str, bytes]]
+    pass
 
 
 @dataclass(frozen=True)
 class GossipAck(Packet):
-    """Packets used to acknowledge receipt of a :class:`Gossip` packet.
-
-    Args:
-        name: The name of the cluster member from the :class:`Gossip` packet.
-        clock: The sequence clock from the :class:`Gossip` packet.
+    """Packets used to acknowledge receipt of *gossip*, when no other packet
+    is sent in response.
 
     """
-
-    name: str
-    clock: int
+    pass
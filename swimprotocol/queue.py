@@ -0,0 +1,242 @@
+
+from __future__ import annotations
+
+from asyncio import Event, QueueEmpty
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import replace
+from enum import Enum
+from itertools import count
+from typing import Final, Generic, TypeVar
+
+from .packet import Packet, Gossip, GossipAck
+
+__all__ = ['QueueT', 'DropPolicy', 'Priority', 'merge_packets',
+           'PacketQueue']
+
+#: The type of the items in a :class:`PacketQueue`.
+QueueT = TypeVar('QueueT')
+
+
+class DropPolicy(Enum):
+    """Determines what happens when an item is added to a full
+    :class:`PacketQueue` priority class.
+
+    """
+
+    #: The oldest item in the priority class is dropped to make room.
+    DROP_OLDEST = 'drop-oldest'
+
+    #: The new item is dropped.
+    DROP_NEWEST = 'drop-newest'
+
+    #: :class:`~swimprotocol.packet.Gossip` and
+    #: :class:`~swimprotocol.packet.GossipAck` packets are merged with a
+    #: queued packet of the same type for the same cluster member, using
+    #: :func:`merge_packets`, even if the queue is not full. Otherwise, the
+    #: oldest item is dropped.
+    COALESCE = 'coalesce'
+
+
+class Priority(Enum):
+    """The priority classes of a :class:`PacketQueue`."""
+
+    #: :class:`~swimprotocol.packet.Ping`,
+    #: :class:`~swimprotocol.packet.PingReq`, and
+    #: :class:`~swimprotocol.packet.Ack` packets, which are time-sensitive
+    #: for failure detection.
+    PROBE = 0
+
+    #: :class:`~swimprotocol.packet.Gossip` and
+    #: :class:`~swimprotocol.packet.GossipAck` packets.
+    GOSSIP = 1
+
+    @classmethod
+    def of(cls, packet: Packet) -> Priority:
+        """Return the priority class of the packet.
+
+        Args:
+            packet: The SWIM protocol packet.
+
+        """
+        if isinstance(packet, (Gossip, GossipAck)):
+            return cls.GOSSIP
+        return cls.PROBE
+
+
+def merge_packets(old: Packet, new: Packet) -> Packet:
+    """Merge the :term:`gossip` of two packets of the same type, returning a
+    copy of *new*. Where both packets contain a
+    :class:`~swimprotocol.packet.GossipRecord` for the same cluster member,
+    the record with the higher sequence clock is kept, and where both packets
+    acknowledge the same cluster member, the higher sequence clock is kept.
+
+    Args:
+        old: The queued packet.
+        new: The packet being added.
+
+    """
+    records = {record.name: record for record in old.gossip}
+    for record in new.gossip:
+        old_record = records.get(record.name)
+        if old_record is None or record.clock >= old_record.clock:
+            records[record.name] = record
+    gossip_acks = dict(old.gossip_acks)
+    for name, clock in new.gossip_acks.items():
+        gossip_acks[name] = max(clock, gossip_acks.get(name, clock))
+    return replace(new, gossip=tuple(records.values()),
+                   gossip_acks=gossip_acks)
+
+
+class _PriorityClass(Generic[QueueT]):
+
+    def __init__(self, maxsize: int, policy: DropPolicy) -> None:
+        super().__init__()
+        if maxsize < 1:
+            raise ValueError(maxsize)
+        self.maxsize: Final = maxsize
+        self.policy: Final = policy
+        self.items: OrderedDict[Hashable, QueueT] = OrderedDict()
+        self.dropped = 0
+        self.coalesced = 0
+
+
+class PacketQueue(Generic[QueueT]):
+    """A bounded queue of items containing packets, where items are taken
+    from the :attr:`~Priority.PROBE` priority class before the
+    :attr:`~Priority.GOSSIP` priority class, and in the order they were added
+    within each priority class. When a priority class is full, its
+    :class:`DropPolicy` decides which item is dropped.
+
+    Args:
+        get_packet: Returns the packet contained in an item.
+        coalesce_key: Returns a key identifying items that may be coalesced.
+        coalesce: Returns a new item that replaces two coalesced items, the
+            queued item and the new item.
+        probe_size: The maximum size of the :attr:`~Priority.PROBE` class.
+        probe_policy: The drop policy of the :attr:`~Priority.PROBE` class.
+        gossip_size: The maximum size of the :attr:`~Priority.GOSSIP` class.
+        gossip_policy: The drop policy of the :attr:`~Priority.GOSSIP` class.
+
+    """
+
+    def __init__(self, get_packet: Callable[[QueueT], Packet],
+                 coalesce_key: Callable[[QueueT], Hashable],
+                 coalesce: Callable[[QueueT, QueueT], QueueT], *,
+                 probe_size: int = 1024,
+                 probe_policy: DropPolicy = DropPolicy.DROP_OLDEST,
+                 gossip_size: int = 1024,
+                 gossip_policy: DropPolicy = DropPolicy.COALESCE) -> None:
+        super().__init__()
+        self._get_packet = get_packet
+        self._coalesce_key = coalesce_key
+        self._coalesce = coalesce
+        self._classes: dict[Priority, _PriorityClass[QueueT]] = {
+            Priority.PROBE: _PriorityClass(probe_size, probe_policy),
+            Priority.GOSSIP: _PriorityClass(gossip_size, gossip_policy)}
+        self._unique = count()
+        self._ready = Event()
+
+    def qsize(self) -> int:
+        """The total number of items in the queue."""
+        return sum(len(priority_class.items)
+                   for priority_class in self._classes.values())
+
+    def empty(self) -> bool:
+        """True if the queue contains no items."""
+        return not self._ready.is_set()
+
+    def depth(self, priority: Priority) -> int:
+        """The number of items in the priority class.
+
+        Args:
+            priority: The priority class.
+
+        """
+        return len(self._classes[priority].items)
+
+    def dropped(self, priority: Priority) -> int:
+        """The number of items dropped from the priority class because it was
+        full.
+
+        Args:
+            priority: The priority class.
+
+        """
+        return self._classes[priority].dropped
+
+    def coalesced(self, priority: Priority) -> int:
+        """The number of items in the priority class that were coalesced into
+        a queued item.
+
+        Args:
+            priority: The priority class.
+
+        """
+        return self._classes[priority].coalesced
+
+    def put_nowait(self, item: QueueT) -> bool:
+        """Add an item to the queue, returning False if the item was dropped.
+
+        Args:
+            item: The item to add.
+
+        """
+        packet = self._get_packet(item)
+        priority_class = self._classes[Priority.of(packet)]
+        items = priority_class.items
+        key: Hashable
+        if priority_class.policy is DropPolicy.COALESCE \
+                and isinstance(packet, (Gossip, GossipAck)):
+            key = self._coalesce_key(item)
+            queued = items.get(key)
+            if queued is not None:
+                items[key] = self._coalesce(queued, item)
+                priority_class.coalesced += 1
+                return True
+        else:
+            key = next(self._unique)
+        if len(items) >= priority_class.maxsize:
+            priority_class.dropped += 1
+            if priority_class.policy is DropPolicy.DROP_NEWEST:
+                return False
+            items.popitem(last=False)
+        items[key] = item
+        self._ready.set()
+        return True
+
+    async def put(self, item: QueueT) -> bool:
+        """Add an item to the queue, returning False if the item was dropped.
+        This method never waits, it is provided for compatibility with
+        :class:`asyncio.Queue`.
+
+        Args:
+            item: The item to add.
+
+        """
+        return self.put_nowait(item)
+
+    def get_nowait(self) -> QueueT:
+        """Remove and return the next item from the queue.
+
+        Raises:
+            asyncio.QueueEmpty: The queue was empty.
+
+        """
+        classes = self._classes.values()
+        for priority_class in classes:
+            items = priority_class.items
+            if items:
+                _, item = items.popitem(last=False)
+                if not any(other.items for other in classes):
+                    self._ready.clear()
+                return item
+        raise QueueEmpty()
+
+    async def get(self) -> QueueT:
+        """Wait until an item is available, then remove and return it."""
+        ready = self._ready
+        while True:
+            await ready.wait()
+            if ready.is_set():
+                return self.get_nowait()
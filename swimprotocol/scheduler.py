@@ -0,0 +1,151 @@
+
+from __future__ import annotations
+
+import asyncio
+from asyncio import TimerHandle
+from collections.abc import Callable
+from heapq import heapify, heappop, heappush
+from itertools import count
+from typing import Any, Final, Optional
+
+__all__ = ['Timer', 'Scheduler']
+
+
+class Timer:
+    """A callback scheduled to run by a :class:`Scheduler`."""
+
+    __slots__ = ('when', 'cancelled', '_callback', '_args', '_scheduler')
+
+    def __init__(self, scheduler: Scheduler, when: float,
+                 callback: Callable[..., Any], args: tuple[Any, ...]) -> None:
+        super().__init__()
+        #: The event loop time when the callback is scheduled to run.
+        self.when: Final = when
+        #: True if the timer was cancelled.
+        self.cancelled = False
+        self._callback: Optional[Callable[..., Any]] = callback
+        self._args = args
+        self._scheduler: Optional[Scheduler] = scheduler
+
+    def cancel(self) -> None:
+        """Cancel the timer, if it has not already run or been cancelled."""
+        if self._callback is not None:
+            self.cancelled = True
+            self._callback = None
+            self._args = ()
+            scheduler = self._scheduler
+            self._scheduler = None
+            if scheduler is not None:
+                scheduler._cancelled()
+
+    def _run(self) -> None:
+        callback, args = self._callback, self._args
+        self._callback = None
+        self._args = ()
+        self._scheduler = None
+        if callback is not None:
+            callback(*args)
+
+
+class Scheduler:
+    """Runs callbacks at given times, like :meth:`~asyncio.loop.call_later`,
+    with a single event loop timer for all of them.
+
+    Timers are kept in a heap ordered by when they should run, and only the
+    earliest has a :class:`~asyncio.TimerHandle`. Cancelling a timer only
+    marks it, and cancelled timers are discarded when they reach the top of
+    the heap or when they outnumber the timers still pending.
+
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._heap: list[tuple[float, int, Timer]] = []
+        self._seq = count()
+        self._num_cancelled = 0
+        self._handle: Optional[TimerHandle] = None
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._num_cancelled
+
+    def call_later(self, delay: float, callback: Callable[..., Any],
+                   *args: Any) -> Timer:
+        """Schedule *callback* to be called after *delay* seconds.
+
+        Args:
+            delay: The number of seconds to wait.
+            callback: The function to call.
+            args: The positional arguments to *callback*.
+
+        """
+        loop = asyncio.get_running_loop()
+        return self.call_at(loop.time() + delay, callback, *args)
+
+    def call_at(self, when: float, callback: Callable[..., Any],
+                *args: Any) -> Timer:
+        """Schedule *callback* to be called at the event loop time *when*.
+
+        Args:
+            when: The event loop time, see :meth:`~asyncio.loop.time`.
+            callback: The function to call.
+            args: The positional arguments to *callback*.
+
+        """
+        timer = Timer(self, when, callback, args)
+        heap = self._heap
+        heappush(heap, (when, next(self._seq), timer))
+        if heap[0][2] is timer:
+            self._set_handle(when)
+        return timer
+
+    def close(self) -> None:
+        """Cancel all timers."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        for _, _, timer in self._heap:
+            timer._scheduler = None
+            timer.cancel()
+        self._heap.clear()
+        self._num_cancelled = 0
+
+    def _cancelled(self) -> None:
+        self._num_cancelled = num_cancelled = self._num_cancelled + 1
+        heap = self._heap
+        if num_cancelled > 64 and num_cancelled > len(heap) // 2:
+            heap[:] = [entry for entry in heap if not entry[2].cancelled]
+            heapify(heap)
+            self._num_cancelled = 0
+
+    def _set_handle(self, when: float) -> None:
+        handle = self._handle
+        if handle is not None:
+            if handle.when() <= when:
+                return
+            handle.cancel()
+        loop = asyncio.get_running_loop()
+        self._handle = loop.call_at(when, self._run)
+
+    def _run(self) -> None:
+        assert self._handle is not None
+        loop = asyncio.get_running_loop()
+        # the event loop may run the handle slightly early
+        end = max(loop.time(), self._handle.when())
+        self._handle = None
+        heap = self._heap
+        while heap and heap[0][0] <= end:
+            _, _, timer = heappop(heap)
+            if timer.cancelled:
+                self._num_cancelled -= 1
+                continue
+            try:
+                timer._run()
+            except Exception as exc:
+                loop.call_exception_handler({
+                    'message': 'Exception in scheduled callback',
+                    'exception': exc})
+        while heap and heap[0][2].cancelled:
+            heappop(heap)
+            self._num_cancelled -= 1
+        if heap:
+            self._set_handle(heap[0][0])
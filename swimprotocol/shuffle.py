@@ -3,9 +3,9 @@ from __future__ import annotations
 
 import random
 from abc import abstractmethod, ABCMeta
-from collections.abc import Iterable, Iterator, MutableSet, Set
+from collections.abc import Iterable, Iterator, MutableSet, Sequence, Set
 from typing import TypeVar
-from weakref import ref, WeakKeyDictionary, WeakValueDictionary
+from weakref import ref
 
 __all__ = ['ShuffleT', 'ShuffleT_co', 'Shuffle', 'WeakShuffle']
 
@@ -16,7 +16,7 @@ ShuffleT_co = TypeVar('ShuffleT_co', covariant=True)
 class Shuffle(Set[ShuffleT_co], metaclass=ABCMeta):
     """A set of objects that can be accessed in a "shuffled" manner, similar to
     a deck of cards. All operations including :meth:`.choice` are *O(1)* time
-    complexity.
+    complexity, except :meth:`.sample`.
 
     """
 
@@ -34,6 +34,38 @@ class Shuffle(Set[ShuffleT_co], metaclass=ABCMeta):
         """
         ...
 
+    @abstractmethod
+    def deal(self) -> ShuffleT_co:
+        """Return the next object from the set in a random order, where every
+        object is returned once before any object is returned again. This
+        object is not removed from the set.
+
+        Objects added to the set part-way through are returned at a random
+        point among the objects not yet returned.
+
+        Raises:
+            KeyError: The set was empty.
+
+        """
+        ...
+
+    @abstractmethod
+    def sample(self, count: int, exclude: Set[object] = frozenset()) \
+            -> Sequence[ShuffleT_co]:
+        """Choose up to *count* unique objects from the set at random, never
+        choosing any of the objects in *exclude*. The objects are not removed
+        from the set.
+
+        See Also:
+            :func:`random.sample`
+
+        Args:
+            count: The maximum number of objects to choose.
+            exclude: Objects that must not be chosen.
+
+        """
+        ...
+
 
 class WeakShuffle(Shuffle[ShuffleT], MutableSet[ShuffleT]):
     """An implementation of :class:`Shuffle` that holds only weak references
@@ -46,38 +78,47 @@ class WeakShuffle(Shuffle[ShuffleT], MutableSet[ShuffleT]):
 
     def __init__(self, /, init: Iterable[ShuffleT] = ()) -> None:
         super().__init__()
-        self._weak_vals: WeakKeyDictionary[ShuffleT, ref[ShuffleT]] = \
-            WeakKeyDictionary()
-        self._weak_vals_rev: WeakValueDictionary[ref[ShuffleT], ShuffleT] = \
-            WeakValueDictionary()
         self._indexes: dict[ref[ShuffleT], int] = {}
         self._values: list[ref[ShuffleT]] = []
+        self._dealt = 0
         for val in init:
             self.add(val)
 
-    def _finalize(self, weak_val: ref[ShuffleT]) -> None:
+    def _remove(self, weak_val: ref[ShuffleT]) -> None:
         index = self._indexes.pop(weak_val, None)
         if index is not None:
             values = self._values
+            if index < self._dealt:
+                # keep the dealt objects ahead of the ones not yet dealt
+                self._dealt = dealt = self._dealt - 1
+                self._move(dealt, index)
+                index = dealt
             end_index = len(values) - 1
-            if index < end_index:
-                values[index] = values[end_index]
-            del self._values[end_index]
+            self._move(end_index, index)
+            del values[end_index]
+
+    def _move(self, index: int, to: int) -> None:
+        if index != to:
+            self._values[to] = weak_val = self._values[index]
+            self._indexes[weak_val] = to
+
+    def _swap(self, index: int, other: int) -> None:
+        if index != other:
+            values = self._values
+            indexes = self._indexes
+            val, other_val = values[index], values[other]
+            values[index], values[other] = other_val, val
+            indexes[val], indexes[other_val] = other, index
 
     def add(self, val: ShuffleT) -> None:
-        if val not in self._weak_vals:
-            weak_val = ref(val, self._finalize)
-            self._weak_vals[val] = weak_val
-            self._weak_vals_rev[weak_val] = val
-            self._indexes[weak_val] = len(self._values)
+        weak_val = ref(val, self._remove)
+        indexes = self._indexes
+        if weak_val not in indexes:
+            indexes[weak_val] = len(self._values)
             self._values.append(weak_val)
 
     def discard(self, val: ShuffleT) -> None:
-        weak_val = self._weak_vals.get(val)
-        if weak_val is not None:
-            del self._weak_vals[val]
-            del self._weak_vals_rev[weak_val]
-            self._finalize(weak_val)
+        self._remove(ref(val))
 
     def choice(self) -> ShuffleT:
         """Choose an object from the set at random and return it. This object
@@ -98,11 +139,87 @@ class WeakShuffle(Shuffle[ShuffleT], MutableSet[ShuffleT]):
         assert val is not None
         return val
 
+    def deal(self) -> ShuffleT:
+        """Return the next object from the set in a random order, where every
+        object is returned once before any object is returned again. This
+        object is not removed from the set.
+
+        Each call swaps a random object not yet dealt into place, an
+        incremental `Fisher-Yates shuffle
+        <https://en.wikipedia.org/wiki/Fisher%E2%80%93Yates_shuffle>`_, so
+        objects added part-way through are dealt at a random point in the
+        rest of the round.
+
+        Raises:
+            KeyError: The set was empty.
+
+        """
+        values = self._values
+        end = len(values)
+        if not end:
+            raise KeyError('deal from an empty set')
+        dealt = self._dealt
+        if dealt >= end:
+            dealt = 0
+        self._swap(dealt, random.randrange(dealt, end))  # noqa: S311
+        self._dealt = dealt + 1
+        val = values[dealt]()
+        assert val is not None
+        return val
+
+    def sample(self, count: int, exclude: Set[object] = frozenset()) \
+            -> Sequence[ShuffleT]:
+        """Choose up to *count* unique objects from the set at random, never
+        choosing any of the objects in *exclude*. The objects are not removed
+        from the set.
+
+        This is a partial `Fisher-Yates shuffle
+        <https://en.wikipedia.org/wiki/Fisher%E2%80%93Yates_shuffle>`_ that
+        records its swaps rather than reordering the set, removing excluded
+        objects from consideration when they are drawn, so it takes
+        *O(count + len(exclude))* time.
+
+        See Also:
+            :func:`random.sample`
+
+        Args:
+            count: The maximum number of objects to choose.
+            exclude: Objects that must not be chosen.
+
+        """
+        values = self._values
+        indexes = self._indexes
+        excluded: set[int] = set()
+        for val in exclude:
+            index = indexes.get(ref(val))  # type: ignore
+            if index is not None:
+                excluded.add(index)
+        swaps: dict[int, int] = {}
+        results: list[ShuffleT] = []
+        start, end = 0, len(values)
+        while start < end and len(results) < count:
+            pos = random.randrange(start, end)  # noqa: S311
+            index = swaps.get(pos, pos)
+            if index in excluded:
+                end -= 1
+                swaps[pos] = swaps.get(end, end)
+            else:
+                swaps[pos] = swaps.get(start, start)
+                start += 1
+                val = values[index]()
+                assert val is not None
+                results.append(val)
+        return results
+
     def __contains__(self, val: object) -> bool:
-        return val in self._weak_vals
+        try:
+            return ref(val) in self._indexes
+        except TypeError:
+            return False
 
     def __iter__(self) -> Iterator[ShuffleT]:
-        return self._weak_vals.keys()
+        vals = [weak_val() for weak_val in self._values]
+        return iter([val for val in vals if val is not None])
 
     def __len__(self) -> int:
-        return len(self._weak_vals)
+        return len(self._values)
@@ -5,11 +5,16 @@ import hashlib
 import hmac
 import secrets
 import uuid
-from typing import Final, NamedTuple, Union
+import warnings
+from abc import abstractmethod, ABCMeta
+from functools import partial
+from itertools import count
+from typing import Any, Final, NamedTuple, Optional, Protocol, Union
 
 from .__about__ import __version__
 
-__all__ = ['Signature', 'Signatures']
+__all__ = ['Signature', 'MacState', 'MacAlgorithm', 'HmacAlgorithm',
+           'Blake2Algorithm', 'get_algorithm', 'Signatures']
 
 
 class Signature(NamedTuple):
@@ -25,6 +30,124 @@ class Signature(NamedTuple):
     digest: bytes
 
 
+class MacState(Protocol):
+    """The interface of a keyed message authentication code object, such as
+    :class:`hmac.HMAC` or a keyed :func:`hashlib.blake2b`.
+
+    """
+
+    @property
+    def digest_size(self) -> int:
+        ...
+
+    def update(self, data: bytes, /) -> None:
+        ...
+
+    def copy(self) -> MacState:
+        ...
+
+    def digest(self) -> bytes:
+        ...
+
+
+class MacAlgorithm(metaclass=ABCMeta):
+    """Base class for the message authentication code algorithms used by
+    :class:`Signatures`.
+
+    """
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """The name of the algorithm, as given to :func:`get_algorithm`."""
+        ...
+
+    @abstractmethod
+    def new(self, key: bytes) -> MacState:
+        """Return a new MAC object keyed with *key*.
+
+        Args:
+            key: The shared secret.
+
+        """
+        ...
+
+
+class HmacAlgorithm(MacAlgorithm):
+    """Uses :mod:`hmac` with the given :mod:`hashlib` hash.
+
+    Args:
+        hash_name: The :mod:`hashlib` hash name to use.
+
+    """
+
+    def __init__(self, hash_name: str) -> None:
+        super().__init__()
+        self.hash_name: Final = hash_name
+
+    @property
+    def name(self) -> str:
+        return f'hmac-{self.hash_name}'
+
+    def new(self, key: bytes) -> MacState:
+        return hmac.new(key, digestmod=self.hash_name)
+
+
+class Blake2Algorithm(MacAlgorithm):
+    """Uses the keyed mode of :func:`hashlib.blake2b` or
+    :func:`hashlib.blake2s`, which is faster than :mod:`hmac` because it does
+    not need to hash twice. Keys longer than the maximum key size of the hash
+    are hashed first.
+
+    Args:
+        hash_name: Either ``'blake2b'`` or ``'blake2s'``.
+
+    """
+
+    def __init__(self, hash_name: str) -> None:
+        super().__init__()
+        if hash_name == 'blake2b':
+            self._hash = hashlib.blake2b
+        elif hash_name == 'blake2s':
+            self._hash = hashlib.blake2s
+        else:
+            raise ValueError(hash_name)
+        self.hash_name: Final = hash_name
+
+    @property
+    def name(self) -> str:
+        return self.hash_name
+
+    def new(self, key: bytes) -> MacState:
+        hash_type = self._hash
+        if len(key) > hash_type.MAX_KEY_SIZE:
+            key = hash_type(key, digest_size=hash_type.MAX_KEY_SIZE).digest()
+        return hash_type(key=key)
+
+
+def get_algorithm(name: str) -> MacAlgorithm:
+    """Return a :class:`MacAlgorithm` by name, e.g. ``'blake2b'``,
+    ``'blake2s'``, or ``'hmac-'`` followed by any :mod:`hashlib` hash name,
+    such as ``'hmac-sha256'``.
+
+    Args:
+        name: The algorithm name.
+
+    Raises:
+        ValueError: The algorithm name was not recognized.
+
+    """
+    if name in ('blake2b', 'blake2s'):
+        return Blake2Algorithm(name)
+    elif name.startswith('hmac-'):
+        hash_name = name[5:]
+        if hash_name not in hashlib.algorithms_available:
+            raise ValueError(name)
+        return HmacAlgorithm(hash_name)
+    else:
+        raise ValueError(name)
+
+
 class Signatures:
     """Provides a hash signature for inclusion alongside
     :class:`~swimprotocol.packet.Packet` objects when implementing a
@@ -37,40 +160,95 @@ class Signatures:
 
     Args:
         secret: A shared secret among all cluster members.
-        hash_name: The :mod:`hashlib` hash name to use.
+        algorithm: The message authentication code algorithm, or its name for
+            :func:`get_algorithm`. The default is ``'hmac-sha256'``.
+        hash_name: Deprecated, use *algorithm* instead. The :mod:`hashlib`
+            hash name to use with :class:`HmacAlgorithm`.
         salt_len: The length of the salt to use when hashing.
         check_version: True if the :attr:`swimprotocol.__version__` should be
             included in the signature and verification.
+        version: The version string used instead of
+            :attr:`swimprotocol.__version__`, e.g. to verify packets from a
+            previous release.
+
+    Raises:
+        ValueError: Both *algorithm* and *hash_name* were given.
 
     """
 
     def __init__(self, secret: Union[None, str, bytes], *,
-                 hash_name: str = 'sha256',
+                 algorithm: Union[None, str, MacAlgorithm] = None,
+                 hash_name: Optional[str] = None,
                  salt_len: int = 16,
-                 check_version: bool = True) -> None:
+                 check_version: bool = True,
+                 version: Optional[str] = None) -> None:
         super().__init__()
         if secret is None:
             secret = b'%x' % uuid.getnode()
         elif isinstance(secret, str):
             secret = secret.encode('utf-8')
+        if hash_name is not None:
+            if algorithm is not None:
+                raise ValueError('Use only one of algorithm or hash_name')
+            warnings.warn('hash_name is deprecated, use algorithm instead',
+                          DeprecationWarning, stacklevel=2)
+            algorithm = HmacAlgorithm(hash_name)
+        elif algorithm is None:
+            algorithm = 'hmac-sha256'
+        if isinstance(algorithm, str):
+            algorithm = get_algorithm(algorithm)
         self.secret: Final = secret
-        self.hash_name: Final = hash_name
+        self.algorithm: Final = algorithm
+        #: Deprecated, the :mod:`hashlib` hash name used by *algorithm*.
+        self.hash_name: Final[str] = getattr(
+            algorithm, 'hash_name', algorithm.name)
         self.salt_len: Final = salt_len
-        self.digest_size: Final = hashlib.new(hash_name).digest_size
-        self.version = __version__.encode('ascii') if check_version else b''
+        self.check_version: Final = check_version
+        if version is None:
+            version = __version__
+        self.version = version.encode('ascii') if check_version else b''
+        self._mac = mac = algorithm.new(secret)
+        mac.update(self.version)
+        self.digest_size: Final = mac.digest_size
+        self._salt_prefix = secrets.token_bytes(max(salt_len - 8, 0))
+        # advancing the count is atomic, since packets may be signed in
+        # several threads
+        self._salt_counter = count(secrets.randbits(64))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # the keyed MAC object cannot be pickled, so it is re-created
+        return (partial(Signatures, algorithm=self.algorithm.name,
+                        salt_len=self.salt_len,
+                        check_version=self.check_version,
+                        version=str(self.version, 'ascii') or None),
+                (self.secret, ))
+
+    def _new_salt(self) -> bytes:
+        salt_len = self.salt_len
+        if salt_len < 8:
+            return secrets.token_bytes(salt_len)
+        counter = next(self._salt_counter) % 2 ** 64
+        return self._salt_prefix + counter.to_bytes(8, 'big')
+
+    def _digest(self, salt: bytes, data: bytes) -> bytes:
+        digest = self._mac.copy()
+        digest.update(salt)
+        digest.update(data)
+        return digest.digest()
 
     def sign(self, data: bytes) -> Signature:
-        """Sign the data using a new random salt, returning the salt and the
+        """Sign the data using a new salt, returning the salt and the
         resulting digest as a tuple.
 
+        Each salt is unique, a random prefix chosen at startup followed by an
+        incrementing counter.
+
         Args:
             data: The bytes to be signed.
 
         """
-        salt = secrets.token_bytes(16)
-        salted_data = b'%s%s%s' % (self.version, salt, data)
-        digest = hmac.digest(self.secret, salted_data, self.hash_name)
-        return Signature(salt, digest)
+        salt = self._new_salt()
+        return Signature(salt, self._digest(salt, data))
 
     def verify(self, data: bytes, sig: tuple[bytes, bytes]) -> bool:
         """Verify that a signature is valid for the given salt and data.
@@ -82,6 +260,4 @@ class Signatures:
 
         """
         salt, sig_digest = sig
-        salted_data = b'%s%s%s' % (self.version, salt, data)
-        digest = hmac.digest(self.secret, salted_data, self.hash_name)
-        return hmac.compare_digest(sig_digest, digest)
+        return hmac.compare_digest(sig_digest, self._digest(salt, data))
@@ -129,6 +129,9 @@ async def _write_member(member: Member, base_path: Path) -> None:
     if member.local:
         return
     member_path = base_path / member.name
+    if member.removed:
+        _remove_member(member_path, base_path, member.name)
+        return
     member_path.mkdir(exist_ok=True)
     for sub_path, status in _statuses:
         _update_status(member_path, base_path / sub_path, member.name,
@@ -152,6 +155,15 @@ async def _write_member(member: Member, base_path: Path) -> None:
         await hook.communicate()
 
 
+def _remove_member(member_path: Path, base_path: Path, name: str) -> None:
+    for sub_path, _ in _statuses:
+        _update_status(member_path, base_path / sub_path, name, False)
+    if member_path.is_dir():
+        for sub_path in member_path.iterdir():
+            os.unlink(sub_path)
+        os.rmdir(member_path)
+
+
 def _cleanup(base_path: Path, members: Members) -> None:
     os.unlink(base_path / '.local')
     for member in members.non_local:
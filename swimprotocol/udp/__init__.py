@@ -2,14 +2,21 @@
 from __future__ import annotations
 
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import socket
+from asyncio import DatagramTransport
 from contextlib import closing, AsyncExitStack
 from typing import Any, Final, Optional
 
+from .batch import set_buffer_sizes, BatchTransport, create_batch_endpoint
 from .config import UdpConfig
+from .offload import Offload
 from .pack import UdpPack
+from .pool import TcpPool
 from .protocol import UdpProtocol, TcpProtocol
+from .recv import UdpRecv
+from .resolve import Resolver
 from .send import UdpSend
+from .shard import ShardedRecv
 from ..transport import Transport
 from ..worker import Worker
 
@@ -34,8 +41,24 @@ class UdpTransport(Transport[UdpConfig]):
     def __init__(self, config: UdpConfig, worker: Worker) -> None:
         super().__init__(config, worker)
         self.address_parser: Final = config.address_parser
-        self.udp_pack: Final = UdpPack(config.signatures)
+        self.udp_pack: Final = UdpPack(
+            config.signatures, legacy_signatures=config.legacy_signatures,
+            codec=config.get_codec(),
+            compress_threshold=config.compress_threshold,
+            compress_dict=config.compress_dict)
+        self.offload: Final = Offload(config.offload_threshold)
+        self.udp_recv: Final = UdpRecv(
+            self.udp_pack, self.offload, worker.recv_queue,
+            ring_size=config.recv_ring_size,
+            consumers=config.recv_consumers)
+        self.resolver: Final = Resolver(
+            config.address_parser, ttl=config.resolve_ttl)
+        self.tcp_pool: Final = TcpPool(
+            idle_timeout=config.tcp_idle_timeout,
+            max_connections=config.tcp_max_connections,
+            max_buffer_size=config.tcp_max_buffer_size)
         self._local_address = self.address_parser.parse(config.local_name)
+        self._udp_transport: Optional[DatagramTransport] = None
         self._stack = AsyncExitStack()
 
     @property
@@ -61,23 +84,57 @@ class UdpTransport(Transport[UdpConfig]):
         bind_port: Optional[int] = self.config.bind_port
         return bind_port or self._local_address.port
 
+    @property
+    def recv_dropped(self) -> Optional[int]:
+        """The number of UDP packets dropped by the kernel because the socket
+        receive buffer was full, if available. This requires the *batch*
+        option and Linux.
+
+        """
+        udp_transport = self._udp_transport
+        if isinstance(udp_transport, BatchTransport):
+            return udp_transport.recv_dropped
+        return None
+
     async def __aenter__(self) -> None:
         loop = asyncio.get_running_loop()
         stack = self._stack
-        thread_pool = stack.enter_context(ThreadPoolExecutor())
-        recv_queue = self.worker.recv_queue
+        offload = stack.enter_context(self.offload)
+        tcp_pool = stack.enter_context(self.tcp_pool)
         send_queue = self.worker.send_queue
+        udp_recv = self.udp_recv
+        await stack.enter_async_context(udp_recv)
         tcp_server = await loop.create_server(
-            lambda: TcpProtocol(thread_pool, self.udp_pack, recv_queue),
+            lambda: TcpProtocol(udp_recv),
             self.bind_host, self.bind_port, reuse_port=True)
-        udp_transport, _ = await loop.create_datagram_endpoint(
-            lambda: UdpProtocol(thread_pool, self.udp_pack, recv_queue),
-            reuse_port=True, local_addr=(self.bind_host, self.bind_port))
+        udp_transport: DatagramTransport
+        if self.config.batch:
+            udp_transport, _ = await create_batch_endpoint(
+                lambda: UdpProtocol(udp_recv),
+                reuse_port=True, local_addr=(self.bind_host, self.bind_port))
+        else:
+            udp_transport, _ = await loop.create_datagram_endpoint(
+                lambda: UdpProtocol(udp_recv),
+                reuse_port=True, local_addr=(self.bind_host, self.bind_port))
+        set_buffer_sizes(udp_transport.get_extra_info('socket'),
+                         self.config.recv_buffer_size,
+                         self.config.send_buffer_size)
+        self._udp_transport = udp_transport
+        sockname = udp_transport.get_extra_info('sockname')
+        if sockname is not None:
+            self.resolver.family = socket.AF_INET6 if len(sockname) == 4 \
+                else socket.AF_INET
         await stack.enter_async_context(UdpSend(
-            self.config, self.udp_pack, thread_pool, send_queue,
-            udp_transport))
+            self.config, self.udp_pack, offload, send_queue,
+            udp_transport, tcp_pool, self.resolver,
+            senders=self.config.send_senders))
         stack.enter_context(closing(udp_transport))
         await stack.enter_async_context(tcp_server)
+        if self.config.recv_processes > 0:
+            stack.enter_context(ShardedRecv(
+                self.udp_pack, self.worker.recv_queue,
+                (self.bind_host, self.bind_port),
+                processes=self.config.recv_processes))
 
     def __aexit__(self, *exc_details: Any) -> Any:
         return self._stack.__aexit__(*exc_details)
@@ -0,0 +1,218 @@
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import struct
+import sys
+from asyncio import DatagramProtocol, DatagramTransport
+from collections import deque
+from collections.abc import Callable
+from typing import Any, Final, Optional
+
+__all__ = ['SO_RXQ_OVFL', 'set_buffer_sizes', 'BatchTransport',
+           'create_batch_endpoint']
+
+#: The Linux socket option that enables the count of datagrams dropped by
+#: the kernel because the receive buffer was full, or ``None`` if it is not
+#: supported on this platform.
+SO_RXQ_OVFL: Optional[int] = getattr(socket, 'SO_RXQ_OVFL', 40) \
+    if sys.platform == 'linux' else None
+
+_drops = struct.Struct('=I')
+
+
+def set_buffer_sizes(sock: Any, recv_buffer_size: Optional[int],
+                     send_buffer_size: Optional[int]) -> None:
+    """Set the ``SO_RCVBUF`` and ``SO_SNDBUF`` socket options, if given. The
+    kernel may adjust or limit the actual sizes.
+
+    Args:
+        sock: The socket object.
+        recv_buffer_size: The receive buffer size, in bytes.
+        send_buffer_size: The send buffer size, in bytes.
+
+    """
+    if recv_buffer_size is not None:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF,
+                        recv_buffer_size)
+    if send_buffer_size is not None:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF,
+                        send_buffer_size)
+
+
+class BatchTransport(DatagramTransport):
+    """Implements :class:`~asyncio.DatagramTransport` directly on a
+    non-blocking UDP socket, as an alternative to
+    :meth:`~asyncio.loop.create_datagram_endpoint` for busy clusters.
+
+    Each time the socket is readable, all waiting datagrams are received --
+    up to *max_batch* -- rather than one per event loop iteration. Datagrams
+    passed to :meth:`.sendto` are queued and flushed together once per event
+    loop iteration, or when the socket is writable again if the send buffer
+    was full.
+
+    On Linux, the number of datagrams dropped by the kernel because the
+    receive buffer was full is available as :attr:`.recv_dropped`.
+
+    Args:
+        sock: The bound, non-blocking UDP socket.
+        protocol: The protocol receiving datagrams.
+        max_batch: The maximum number of datagrams received at once.
+        max_size: The maximum size of a received datagram.
+
+    """
+
+    def __init__(self, sock: socket.socket, protocol: DatagramProtocol, *,
+                 max_batch: int = 256, max_size: int = 65535) -> None:
+        super().__init__()
+        self._loop = asyncio.get_running_loop()
+        self._sock = sock
+        self._protocol = protocol
+        self.max_batch: Final = max_batch
+        self.max_size: Final = max_size
+        self._send_queue: deque[tuple[bytes, Any]] = deque()
+        self._send_buffer_size = 0
+        self._flush_scheduled = False
+        self._writing = False
+        self._closing = False
+        self._recv_dropped: Optional[int] = None
+        self._ancbufsize = 0
+        if SO_RXQ_OVFL is not None:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+            except OSError:
+                pass
+            else:
+                self._recv_dropped = 0
+                self._ancbufsize = socket.CMSG_SPACE(_drops.size)
+        self._loop.add_reader(sock.fileno(), self._read_ready)
+        self._loop.call_soon(protocol.connection_made, self)
+
+    @property
+    def recv_dropped(self) -> Optional[int]:
+        """The number of datagrams dropped by the kernel because the receive
+        buffer was full, as of the last datagram received, or ``None`` if not
+        supported.
+
+        """
+        return self._recv_dropped
+
+    def get_extra_info(self, name: str, default: Any = None) -> Any:
+        if name == 'socket':
+            return self._sock
+        elif name == 'sockname':
+            return self._sock.getsockname()
+        return default
+
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def close(self) -> None:
+        if self._closing:
+            return
+        self._closing = True
+        sock = self._sock
+        self._loop.remove_reader(sock.fileno())
+        if self._writing:
+            self._loop.remove_writer(sock.fileno())
+        self._send_queue.clear()
+        self._send_buffer_size = 0
+        self._loop.call_soon(self._connection_lost)
+
+    def abort(self) -> None:
+        self.close()
+
+    def _connection_lost(self) -> None:
+        try:
+            self._protocol.connection_lost(None)
+        finally:
+            self._sock.close()
+
+    def get_write_buffer_size(self) -> int:
+        return self._send_buffer_size
+
+    def _read_ready(self) -> None:
+        sock = self._sock
+        protocol = self._protocol
+        max_size = self.max_size
+        ancbufsize = self._ancbufsize
+        for _ in range(self.max_batch):
+            try:
+                data, ancdata, _, addr = sock.recvmsg(max_size, ancbufsize)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as exc:
+                protocol.error_received(exc)
+                return
+            for level, kind, cmsg_data in ancdata:
+                if level == socket.SOL_SOCKET and kind == SO_RXQ_OVFL:
+                    self._recv_dropped, = _drops.unpack_from(cmsg_data)
+            protocol.datagram_received(data, addr)
+            if self._closing:
+                return
+
+    def sendto(self, data: Any, addr: Any = None) -> None:
+        if self._closing:
+            return
+        self._send_queue.append((data, addr))
+        self._send_buffer_size += len(data)
+        if not self._flush_scheduled and not self._writing:
+            self._flush_scheduled = True
+            self._loop.call_soon(self._flush)
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        sock = self._sock
+        send_queue = self._send_queue
+        while send_queue:
+            data, addr = send_queue[0]
+            try:
+                sock.sendto(data, addr)
+            except (BlockingIOError, InterruptedError):
+                if not self._writing:
+                    self._writing = True
+                    self._loop.add_writer(sock.fileno(), self._write_ready)
+                return
+            except OSError as exc:
+                self._protocol.error_received(exc)
+            send_queue.popleft()
+            self._send_buffer_size -= len(data)
+
+    def _write_ready(self) -> None:
+        self._writing = False
+        self._loop.remove_writer(self._sock.fileno())
+        self._flush()
+
+
+async def create_batch_endpoint(
+        protocol_factory: Callable[[], DatagramProtocol],
+        local_addr: tuple[str, int], *,
+        reuse_port: bool = False) -> tuple[BatchTransport, DatagramProtocol]:
+    """Create a UDP socket bound to *local_addr* and a
+    :class:`BatchTransport` using it, similar to
+    :meth:`~asyncio.loop.create_datagram_endpoint`.
+
+    Args:
+        protocol_factory: Returns the protocol receiving datagrams.
+        local_addr: The local host and port to bind.
+        reuse_port: Whether to set the ``SO_REUSEPORT`` socket option.
+
+    """
+    loop = asyncio.get_running_loop()
+    host, port = local_addr
+    infos = await loop.getaddrinfo(host, port, type=socket.SOCK_DGRAM)
+    if not infos:
+        raise OSError(f'Could not resolve: {host}')
+    family, sock_type, proto, _, address = infos[0]
+    sock = socket.socket(family, sock_type, proto)
+    try:
+        if reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.setblocking(False)
+        sock.bind(address)
+    except BaseException:
+        sock.close()
+        raise
+    protocol = protocol_factory()
+    return BatchTransport(sock, protocol), protocol
@@ -0,0 +1,467 @@
+
+from __future__ import annotations
+
+import io
+import pickle  # nosec
+from abc import abstractmethod, ABCMeta
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any, ClassVar, Final, NamedTuple, Optional
+
+from ..packet import Packet, Source, GossipRecord, Ping, PingReq, Ack, \
+    Gossip, GossipAck
+from ..status import Status
+
+__all__ = ['CodecError', 'Codec', 'PickleCodec', 'BinaryCodec', 'LegacyCodec',
+           'get_codec']
+
+
+class CodecError(ValueError):
+    """Raised when a payload could not be decoded into a
+    :class:`~swimprotocol.packet.Packet`.
+
+    """
+    pass
+
+
+class Codec(metaclass=ABCMeta):
+    """Base class for serializing :class:`~swimprotocol.packet.Packet` objects
+    into payloads. The first byte of every payload identifies the codec that
+    created it, so that a receiver may decode payloads from any known codec
+    regardless of which one it uses to encode.
+
+    """
+
+    #: The first byte of every payload created by this codec.
+    codec_id: ClassVar[int]
+
+    @abstractmethod
+    def encode(self, packet: Packet) -> bytes:
+        """Serialize the *packet* into a payload.
+
+        Args:
+            packet: The SWIM protocol packet to serialize.
+
+        """
+        ...
+
+    @abstractmethod
+    def decode(self, data: memoryview) -> Packet:
+        """Deserialize a payload created by :meth:`.encode`.
+
+        Args:
+            data: The serialized payload.
+
+        Raises:
+            CodecError: The payload was malformed.
+
+        """
+        ...
+
+
+class PickleCodec(Codec):
+    """Uses :mod:`pickle` to serialize packets. Pickled payloads always begin
+    with the ``PROTO`` opcode, which is used as the :attr:`.codec_id`.
+
+    Args:
+        protocol: The :mod:`pickle` protocol version number.
+
+    """
+
+    codec_id = pickle.PROTO[0]
+
+    def __init__(self, protocol: int = pickle.HIGHEST_PROTOCOL) -> None:
+        super().__init__()
+        if protocol < 2:
+            raise ValueError(f'Pickle protocol {protocol} is not supported')
+        self.protocol: Final = protocol
+
+    def encode(self, packet: Packet) -> bytes:
+        return pickle.dumps(packet, self.protocol)
+
+    def decode(self, data: memoryview) -> Packet:
+        try:
+            packet = pickle.loads(data)  # noqa: S301
+        except Exception as exc:
+            raise CodecError('Invalid pickled packet') from exc
+        if not isinstance(packet, Packet):
+            raise CodecError('Pickled object is not a packet')
+        return packet
+
+
+# aggregate statuses may not be assigned to a cluster member
+_statuses = {status.value: status
+             for status in (Status.ONLINE, Status.OFFLINE, Status.SUSPECT)}
+
+
+class _Reader:
+
+    def __init__(self, data: bytes) -> None:
+        super().__init__()
+        self.data = data
+        self.pos = 0
+
+    def read_byte(self) -> int:
+        pos = self.pos
+        try:
+            val = self.data[pos]
+        except IndexError as exc:
+            raise CodecError('Unexpected end of payload') from exc
+        self.pos = pos + 1
+        return val
+
+    def read_uint(self) -> int:
+        byte = self.read_byte()
+        if byte < 0x80:
+            return byte
+        result = byte & 0x7f
+        shift = 7
+        while True:
+            byte = self.read_byte()
+            result |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+            if shift > 63:
+                raise CodecError('Integer overflow')
+
+    def read_optional_uint(self) -> Optional[int]:
+        val = self.read_uint()
+        return val - 1 if val else None
+
+    def _read_span(self) -> tuple[int, int]:
+        length = self.read_uint()
+        start = self.pos
+        end = start + length
+        if end > len(self.data):
+            raise CodecError('Unexpected end of payload')
+        self.pos = end
+        return start, end
+
+    def read_bytes(self) -> bytes:
+        start, end = self._read_span()
+        return self.data[start:end]
+
+    def read_str(self) -> str:
+        start, end = self._read_span()
+        try:
+            return str(self.data[start:end], 'utf-8')
+        except UnicodeDecodeError as exc:
+            raise CodecError('Invalid string') from exc
+
+    def read_strs(self) -> Sequence[str]:
+        return tuple(self.read_str() for _ in range(self.read_uint()))
+
+    def read_source(self) -> Source:
+        return Source(self.read_str(), self.read_bytes())
+
+    def read_bool(self) -> bool:
+        val = self.read_byte()
+        if val > 1:
+            raise CodecError('Invalid boolean')
+        return val == 1
+
+    def read_status(self) -> Status:
+        try:
+            return _statuses[self.read_byte()]
+        except KeyError as exc:
+            raise CodecError('Invalid status') from exc
+
+    def read_metadata(self) -> Optional[Mapping[str, bytes]]:
+        count = self.read_uint()
+        if count == 0:
+            return None
+        return {self.read_str(): self.read_bytes() for _ in range(count - 1)}
+
+    def read_records(self) -> Sequence[GossipRecord]:
+        return tuple(GossipRecord(self.read_str(), self.read_uint(),
+                                  self.read_status(), self.read_metadata(),
+                                  self.read_optional_uint(),
+                                  self.read_strs(), self.read_bool())
+                     for _ in range(self.read_uint()))
+
+    def read_clocks(self) -> Mapping[str, int]:
+        return {self.read_str(): self.read_uint()
+                for _ in range(self.read_uint())}
+
+
+class _EncodedCache:
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__()
+        self.maxsize = maxsize
+        self._cache: dict[int, tuple[object, bytes]] = {}
+
+    def get(self, val: object) -> Optional[bytes]:
+        cached = self._cache.get(id(val))
+        if cached is not None and cached[0] is val:
+            return cached[1]
+        return None
+
+    def put(self, val: object, encoded: bytes) -> None:
+        cache = self._cache
+        if len(cache) >= self.maxsize:
+            cache.clear()
+        cache[id(val)] = (val, encoded)
+
+
+class _Writer:
+
+    def __init__(self, buf: bytearray, cache: _EncodedCache) -> None:
+        super().__init__()
+        self.buf = buf
+        self.cache = cache
+
+    def _write_cached(self, val: Any,
+                      write: Callable[[_Writer, Any], None]) -> None:
+        buf = self.buf
+        encoded = self.cache.get(val)
+        if encoded is None:
+            start = len(buf)
+            write(self, val)
+            self.cache.put(val, bytes(buf[start:]))
+        else:
+            buf += encoded
+
+    def write_uint(self, val: int) -> None:
+        if val < 0:
+            raise ValueError(val)
+        buf = self.buf
+        while val > 0x7f:
+            buf.append((val & 0x7f) | 0x80)
+            val >>= 7
+        buf.append(val)
+
+    def write_optional_uint(self, val: Optional[int]) -> None:
+        self.write_uint(0 if val is None else val + 1)
+
+    def write_bytes(self, val: bytes) -> None:
+        self.write_uint(len(val))
+        self.buf += val
+
+    def write_str(self, val: str) -> None:
+        self.write_bytes(val.encode('utf-8'))
+
+    def write_strs(self, val: Sequence[str]) -> None:
+        self.write_uint(len(val))
+        for item in val:
+            self.write_str(item)
+
+    def _write_source(self, val: Source) -> None:
+        self.write_str(val.name)
+        self.write_bytes(val.validity)
+
+    def write_source(self, val: Source) -> None:
+        self._write_cached(val, _Writer._write_source)
+
+    def write_bool(self, val: bool) -> None:
+        self.buf.append(1 if val else 0)
+
+    def write_status(self, val: Status) -> None:
+        self.buf.append(val.value)
+
+    def write_metadata(self, val: Optional[Mapping[str, bytes]]) -> None:
+        if val is None:
+            self.buf.append(0)
+            return
+        self.write_uint(len(val) + 1)
+        for key, value in val.items():
+            self.write_str(key)
+            self.write_bytes(value)
+
+    def _write_record(self, record: GossipRecord) -> None:
+        self.write_str(record.name)
+        self.write_uint(record.clock)
+        self.write_status(record.status)
+        self.write_metadata(record.metadata)
+        self.write_optional_uint(record.base_clock)
+        self.write_strs(record.removed)
+        self.write_bool(record.tombstone)
+
+    def write_records(self, val: Sequence[GossipRecord]) -> None:
+        self.write_uint(len(val))
+        for record in val:
+            self._write_cached(record, _Writer._write_record)
+
+    def write_clocks(self, val: Mapping[str, int]) -> None:
+        self.write_uint(len(val))
+        for name, clock in val.items():
+            self.write_str(name)
+            self.write_uint(clock)
+
+
+class _Kind(NamedTuple):
+    write: Callable[[_Writer, Any], None]
+    read: Callable[[_Reader], Any]
+
+
+_uint = _Kind(_Writer.write_uint, _Reader.read_uint)
+_str = _Kind(_Writer.write_str, _Reader.read_str)
+_source = _Kind(_Writer.write_source, _Reader.read_source)
+_status = _Kind(_Writer.write_status, _Reader.read_status)
+_metadata = _Kind(_Writer.write_metadata, _Reader.read_metadata)
+_records = _Kind(_Writer.write_records, _Reader.read_records)
+_clocks = _Kind(_Writer.write_clocks, _Reader.read_clocks)
+
+
+class _Schema(NamedTuple):
+    type_id: int
+    packet_type: type[Packet]
+    fields: Sequence[tuple[str, _Kind]]
+
+
+_schemas = [
+    _Schema(1, Ping, [('source', _source),
+                      ('seq', _uint)]),
+    _Schema(2, PingReq, [('source', _source),
+                         ('target', _str),
+                         ('seq', _uint)]),
+    _Schema(3, Ack, [('source', _source),
+                     ('seq', _uint)]),
+    _Schema(4, Gossip, [('source', _source)]),
+    _Schema(5, GossipAck, [('source', _source)])]
+
+_common_fields = [('gossip', _records),
+                  ('gossip_acks', _clocks)]
+
+
+class BinaryCodec(Codec):
+    """Serializes packets with a compact, schema-driven binary format.
+
+    After the :attr:`.codec_id` byte, the payload contains a byte identifying
+    the packet type followed by each field of the packet in order, ending with
+    the fields common to all packets. Integers
+    are encoded as unsigned `varints
+    <https://en.wikipedia.org/wiki/LEB128>`_, strings and byte-strings are
+    prefixed with their varint length, and each
+    :class:`~swimprotocol.status.Status` or boolean is a single byte.
+
+    The encoding of each :class:`~swimprotocol.packet.Source` and
+    :class:`~swimprotocol.packet.GossipRecord` object is cached, so that the
+    same object sent to many cluster members is only serialized once.
+
+    Args:
+        cache_size: The maximum number of cached encodings.
+
+    """
+
+    codec_id = 0x01
+
+    def __init__(self, cache_size: int = 1024) -> None:
+        super().__init__()
+        self._cache = _EncodedCache(cache_size)
+        self._by_type = {schema.packet_type: schema for schema in _schemas}
+        self._by_id = {schema.type_id: schema for schema in _schemas}
+
+    def encode(self, packet: Packet) -> bytes:
+        schema = self._by_type[type(packet)]
+        buf = bytearray((self.codec_id, schema.type_id))
+        writer = _Writer(buf, self._cache)
+        for name, kind in schema.fields:
+            kind.write(writer, getattr(packet, name))
+        for name, kind in _common_fields:
+            kind.write(writer, getattr(packet, name))
+        return buf
+
+    def decode(self, data: memoryview) -> Packet:
+        reader = _Reader(bytes(data))
+        if reader.read_byte() != self.codec_id:
+            raise CodecError('Invalid codec')
+        schema = self._by_id.get(reader.read_byte())
+        if schema is None:
+            raise CodecError('Invalid packet type')
+        kwargs = {name: kind.read(reader) for name, kind in schema.fields}
+        for name, kind in _common_fields:
+            kwargs[name] = kind.read(reader)
+        if reader.pos != len(reader.data):
+            raise CodecError('Unexpected trailing data')
+        return schema.packet_type(**kwargs)
+
+
+class _LegacyUnpickler(pickle.Unpickler):
+
+    _packet_types: ClassVar[Mapping[str, type[Any]]] = {
+        packet_type.__name__: packet_type
+        for packet_type in (Source, Ping, PingReq, Ack, Gossip, GossipAck)}
+
+    def find_class(self, module: str, name: str) -> Any:
+        if module == 'swimprotocol.packet' and name in self._packet_types:
+            return self._packet_types[name]
+        elif module == 'swimprotocol.status' and name == 'Status':
+            return Status
+        raise pickle.UnpicklingError(f'{module}.{name} is not allowed')
+
+
+class LegacyCodec(Codec):
+    """Decodes the :mod:`pickle` payloads of releases before 0.7.0, where
+    each :class:`~swimprotocol.packet.Gossip` or
+    :class:`~swimprotocol.packet.GossipAck` packet carried a single change
+    in a different format. Those payloads are identified by their signature,
+    and :class:`~swimprotocol.udp.pack.UdpPack` adds the :attr:`.codec_id`
+    byte to select this codec.
+
+    Packets are never encoded in this format. This codec only exists so that
+    a cluster may be upgraded one member at a time.
+
+    """
+
+    codec_id = 0x00
+
+    def encode(self, packet: Packet) -> bytes:
+        raise NotImplementedError('Legacy packets are decoded only')
+
+    def decode(self, data: memoryview) -> Packet:
+        if not data or data[0] != self.codec_id:
+            raise CodecError('Invalid codec')
+        try:
+            legacy = _LegacyUnpickler(io.BytesIO(data[1:])).load()
+            return self._convert(legacy, vars(legacy))
+        except CodecError:
+            raise
+        except Exception as exc:
+            raise CodecError('Invalid legacy packet') from exc
+
+    @classmethod
+    def _convert(cls, legacy: object, state: Mapping[str, Any]) -> Packet:
+        source_state = vars(state['source'])
+        source = Source(str(source_state['name']),
+                        bytes(source_state['validity']))
+        if isinstance(legacy, Ping):
+            return Ping(source=source)
+        elif isinstance(legacy, PingReq):
+            return PingReq(source=source, target=str(state['target']))
+        elif isinstance(legacy, Ack):
+            return Ack(source=source)
+        elif isinstance(legacy, Gossip):
+            status = state['status']
+            if status not in _statuses.values():
+                raise CodecError('Invalid status')
+            metadata = state['metadata']
+            if metadata is not None:
+                metadata = {str(key): bytes(val)
+                            for key, val in metadata.items()}
+            return Gossip(source=source, gossip=(GossipRecord(
+                name=str(state['name']), clock=int(state['clock']),
+                status=status, metadata=metadata),))
+        elif isinstance(legacy, GossipAck):
+            return GossipAck(source=source, gossip_acks={
+                str(state['name']): int(state['clock'])})
+        raise CodecError('Pickled object is not a packet')
+
+
+_codecs: Mapping[str, Callable[[], Codec]] = {
+    'binary': BinaryCodec,
+    'pickle': PickleCodec}
+
+
+def get_codec(name: str) -> Codec:
+    """Return a new :class:`Codec` by name, either ``'binary'`` or
+    ``'pickle'``.
+
+    Args:
+        name: The codec name.
+
+    Raises:
+        KeyError: The codec name was not recognized.
+
+    """
+    return _codecs[name]()
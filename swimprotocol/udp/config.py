@@ -7,8 +7,11 @@ from collections.abc import Sequence
 from contextlib import closing, suppress
 from typing import Final, Any, Optional
 
+from .codec import get_codec, Codec
+from .resolve import get_hosts
 from ..address import Address, AddressParser
 from ..config import BaseConfig, ConfigError, TransientConfigError
+from ..sign import Signatures
 
 __all__ = ['UdpConfig']
 
@@ -29,6 +32,38 @@ class UdpConfig(BaseConfig):
         discovery: Resolve the local address as a DNS **A**/**AAAA** record
             containing peers. The local IP address will also be auto-discovered
             by attempting to :meth:`~socket.socket.connect` to the hostname.
+        mtu_size: The maximum size of a UDP packet, larger packets are sent
+            by TCP instead.
+        codec: The name of the codec used to serialize packets, see
+            :func:`~swimprotocol.udp.codec.get_codec`. Packets serialized by
+            any codec are always accepted.
+        legacy_version: The version of the cluster members that are not yet
+            upgraded from a release before 0.7.0, e.g. ``'0.6.3'``. Their
+            packets are accepted until this option is removed, see
+            :class:`~swimprotocol.udp.pack.UdpPack`.
+        offload_threshold: Packets of at least this many bytes are packed or
+            unpacked in a thread pool, rather than on the event loop.
+        tcp_idle_timeout: Seconds before an unused TCP connection, opened to
+            send oversized packets, is closed.
+        tcp_max_connections: The maximum number of TCP connections opened to
+            send oversized packets.
+        tcp_max_buffer_size: The maximum bytes waiting to be written to each
+            TCP connection, before more packets sent on it are dropped.
+        batch: Use :class:`~swimprotocol.udp.batch.BatchTransport` to receive
+            and send UDP packets in batches, which requires an event loop that
+            supports :meth:`~asyncio.loop.add_reader`.
+        recv_buffer_size: The ``SO_RCVBUF`` size of the UDP socket.
+        send_buffer_size: The ``SO_SNDBUF`` size of the UDP socket.
+        recv_ring_size: The maximum number of received packets waiting to be
+            unpacked, before the oldest are dropped.
+        recv_consumers: The number of received packets unpacked
+            concurrently.
+        send_senders: The number of packets packed and sent concurrently.
+        resolve_ttl: Seconds to cache the resolved address of each cluster
+            member.
+        recv_processes: The number of additional processes started to receive
+            and verify UDP packets, see
+            :class:`~swimprotocol.udp.shard.ShardedRecv`.
         kwargs: Additional keyword arguments passed to the
             :class:`~swimprotocol.config.BaseConfig` constructor.
 
@@ -40,6 +75,20 @@ class UdpConfig(BaseConfig):
                  default_port: Optional[int] = None,
                  discovery: bool = False,
                  mtu_size: int = 1500,
+                 codec: str = 'binary',
+                 legacy_version: Optional[str] = None,
+                 offload_threshold: int = 4096,
+                 tcp_idle_timeout: float = 60.0,
+                 tcp_max_connections: int = 64,
+                 tcp_max_buffer_size: int = 4 * 1024 * 1024,
+                 batch: bool = False,
+                 recv_buffer_size: Optional[int] = None,
+                 send_buffer_size: Optional[int] = None,
+                 recv_ring_size: int = 1024,
+                 recv_consumers: int = 1,
+                 send_senders: int = 1,
+                 resolve_ttl: float = 60.0,
+                 recv_processes: int = 0,
                  **kwargs: Any) -> None:
         address_parser = AddressParser(
             default_host=default_host,
@@ -51,6 +100,42 @@ class UdpConfig(BaseConfig):
         self.bind_port: Final = bind_port
         self.address_parser: Final = address_parser
         self.mtu_size: Final = mtu_size
+        self.codec: Final = codec
+        self.legacy_version: Final = legacy_version
+        self.offload_threshold: Final = offload_threshold
+        self.tcp_idle_timeout: Final = tcp_idle_timeout
+        self.tcp_max_connections: Final = tcp_max_connections
+        self.tcp_max_buffer_size: Final = tcp_max_buffer_size
+        self.batch: Final = batch
+        self.recv_buffer_size: Final = recv_buffer_size
+        self.send_buffer_size: Final = send_buffer_size
+        self.recv_ring_size: Final = recv_ring_size
+        self.recv_consumers: Final = recv_consumers
+        self.send_senders: Final = send_senders
+        self.resolve_ttl: Final = resolve_ttl
+        self.recv_processes: Final = recv_processes
+        try:
+            get_codec(codec)
+        except KeyError as exc:
+            raise ConfigError(f'Unknown codec: {codec!r}') from exc
+
+    @property
+    def legacy_signatures(self) -> Optional[Signatures]:
+        """Verifies packets from cluster members on *legacy_version*, if
+        given.
+
+        """
+        legacy_version = self.legacy_version
+        if legacy_version is None:
+            return None
+        return Signatures(self.signatures.secret, version=legacy_version)
+
+    def get_codec(self) -> Codec:
+        """Return a new :class:`~swimprotocol.udp.codec.Codec` for
+        serializing packets.
+
+        """
+        return get_codec(self.codec)
 
     @classmethod
     def add_arguments(cls, parser: ArgumentParser, *,
@@ -72,6 +157,26 @@ class UdpConfig(BaseConfig):
         group.add_argument(f'{prefix}udp-discovery', action='store_true',
                            dest='swim_udp_discovery',
                            help='Find cluster with DNS discovery.')
+        group.add_argument(f'{prefix}udp-codec', metavar='NAME',
+                           dest='swim_udp_codec', default='binary',
+                           choices=['binary', 'pickle'],
+                           help='The codec used to serialize packets.')
+        group.add_argument(f'{prefix}udp-legacy-version', metavar='VERSION',
+                           dest='swim_udp_legacy_version',
+                           help='Accept packets from this older version.')
+        group.add_argument(f'{prefix}udp-batch', action='store_true',
+                           dest='swim_udp_batch',
+                           help='Receive and send UDP packets in batches.')
+        group.add_argument(f'{prefix}udp-rcvbuf', metavar='BYTES', type=int,
+                           dest='swim_udp_rcvbuf',
+                           help='The UDP socket receive buffer size.')
+        group.add_argument(f'{prefix}udp-sndbuf', metavar='BYTES', type=int,
+                           dest='swim_udp_sndbuf',
+                           help='The UDP socket send buffer size.')
+        group.add_argument(f'{prefix}udp-recv-processes', metavar='NUM',
+                           type=int, default=0,
+                           dest='swim_udp_recv_processes',
+                           help='Receive UDP packets in more processes.')
 
     @classmethod
     def parse_args(cls, args: Namespace, *, env_prefix: str = 'SWIM') \
@@ -82,7 +187,13 @@ class UdpConfig(BaseConfig):
             'bind_port': args.swim_udp_bind_port,
             'default_host': args.swim_udp_host,
             'default_port': args.swim_udp_port,
-            'discovery': args.swim_udp_discovery}
+            'discovery': args.swim_udp_discovery,
+            'codec': args.swim_udp_codec,
+            'legacy_version': args.swim_udp_legacy_version,
+            'batch': args.swim_udp_batch,
+            'recv_buffer_size': args.swim_udp_rcvbuf,
+            'send_buffer_size': args.swim_udp_sndbuf,
+            'recv_processes': args.swim_udp_recv_processes}
 
     @classmethod
     def _discover(cls, address_parser: AddressParser,
@@ -109,13 +220,15 @@ class UdpConfig(BaseConfig):
     @classmethod
     def _resolve_name(cls, hostname: str) -> set[str]:
         try:
-            _, _, ipaddrlist = socket.gethostbyname_ex(hostname)
+            infos = socket.getaddrinfo(hostname, None, socket.AF_INET,
+                                       socket.SOCK_DGRAM)
         except OSError as exc:
             raise TransientConfigError(f'Could not resolve name: {hostname}',
                                        wait_hint=10.0) from exc
+        ipaddrlist = get_hosts(infos)
         if not ipaddrlist:
             raise TransientConfigError(f'Name resolved empty: {hostname}')
-        return set(ipaddrlist)
+        return ipaddrlist
 
     @classmethod
     def _find_local_ip(cls, hostname: str, port: int) -> Optional[str]:
@@ -0,0 +1,74 @@
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager
+from typing import Any, Callable, Optional, TypeVar
+
+__all__ = ['OffloadT', 'Offload']
+
+#: The type of the offloaded function result.
+OffloadT = TypeVar('OffloadT')
+
+
+class Offload(AbstractContextManager['Offload']):
+    """Runs CPU-heavy functions, such as packing and unpacking packets, in a
+    thread pool -- but only when the data is large enough that it would be
+    worth the overhead of scheduling it there. Smaller data is processed
+    inline on the event loop.
+
+    The thread pool is created when the context is entered, and shut down
+    when it exits.
+
+    Args:
+        threshold: Data of at least this many bytes is processed in the
+            thread pool.
+
+    """
+
+    def __init__(self, threshold: int) -> None:
+        super().__init__()
+        self.threshold = threshold
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._inline_count = 0
+        self._offload_count = 0
+
+    @property
+    def inline_count(self) -> int:
+        """The number of functions run inline on the event loop."""
+        return self._inline_count
+
+    @property
+    def offload_count(self) -> int:
+        """The number of functions run in the thread pool."""
+        return self._offload_count
+
+    def __enter__(self) -> Offload:
+        self._thread_pool = ThreadPoolExecutor()
+        return self
+
+    def __exit__(self, *exc_details: Any) -> None:
+        thread_pool = self._thread_pool
+        self._thread_pool = None
+        if thread_pool is not None:
+            thread_pool.shutdown()
+
+    async def run(self, size: int, func: Callable[..., OffloadT],
+                  *args: Any) -> OffloadT:
+        """Run the function with the given arguments and return the result.
+
+        Args:
+            size: The size of the data, in bytes.
+            func: The function to run.
+            args: The function arguments.
+
+        """
+        thread_pool = self._thread_pool
+        if thread_pool is None or size < self.threshold:
+            self._inline_count += 1
+            return func(*args)
+        else:
+            self._offload_count += 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(thread_pool, func, *args)
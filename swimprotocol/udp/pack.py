@@ -1,105 +1,268 @@
 
 from __future__ import annotations
 
-import pickle  # nosec
 import struct
+import zlib
+from collections.abc import Sequence
 from typing import Final, Optional
 
+from .codec import CodecError, Codec, PickleCodec, BinaryCodec, LegacyCodec
 from ..packet import Packet
 from ..sign import Signatures
 
 __all__ = ['UdpPack']
 
 _prefix = struct.Struct('!BBI')
+_compressed = 0x80
 
 
 class UdpPack:
     """Packs and unpacks SWIM protocol :class:`~swimprotocol.packet.Packet`
-    objects from raw UDP packets or TCP connections. The :mod:`pickle` module
-    is used for serialization, so :class:`~swimprotocol.sign.Signatures` is
-    used to sign the payloads.
+    objects from raw UDP packets or TCP connections. A
+    :class:`~swimprotocol.udp.codec.Codec` is used for serialization, and
+    :class:`~swimprotocol.sign.Signatures` is used to sign the payloads.
+
+    Payloads from any of the *decoders* are accepted, identified by their
+    first byte, so that a cluster may switch codecs without downtime.
+
+    Releases before 0.7.0 serialize packets with :mod:`pickle` in a
+    different format, and include their own version in the signature. If
+    *legacy_signatures* is given, packets from those releases are accepted
+    and decoded by :class:`~swimprotocol.udp.codec.LegacyCodec`, so that a
+    cluster may be upgraded one member at a time. It should be removed once
+    every member is upgraded, since members on older releases do not accept
+    the packets sent by newer ones.
 
     Args:
         signatures: Generates and verifies cluster packet signatures.
-        pickle_protocol: The :mod:`pickle` protocol version number.
-        prefix_xor: A 4-byte string used to XOR the packet prefix, as a sanity
+        legacy_signatures: Verifies packets from releases before 0.7.0.
+        codec: The codec used to serialize packets.
+        decoders: The codecs that may be used to deserialize packets, in
+            addition to *codec*.
+        prefix_xor: A 6-byte string used to XOR the packet prefix, as a sanity
             check to detect malformed or incomplete UDP packets.
+        compress_threshold: Payloads of at least this many bytes are
+            compressed with :mod:`zlib`, if it makes them smaller. Compression
+            is disabled by default.
+        compress_dict: A preset dictionary for :mod:`zlib` compression, which
+            must be the same for all cluster members.
+        compress_level: The :mod:`zlib` compression level.
+        max_payload: The maximum size of a payload, before or after it is
+            decompressed.
 
     """
 
     def __init__(self, signatures: Signatures, *,
-                 pickle_protocol: int = pickle.HIGHEST_PROTOCOL,
-                 prefix_xor: bytes = b'SWIM?!') -> None:
+                 legacy_signatures: Optional[Signatures] = None,
+                 codec: Optional[Codec] = None,
+                 decoders: Sequence[Codec] = (),
+                 prefix_xor: bytes = b'SWIM?!',
+                 compress_threshold: Optional[int] = None,
+                 compress_dict: Optional[bytes] = None,
+                 compress_level: int = zlib.Z_DEFAULT_COMPRESSION,
+                 max_payload: int = 16 * 1024 * 1024) -> None:
         super().__init__()
         if len(prefix_xor) != _prefix.size:
             raise ValueError(f'{prefix_xor!r} must be {_prefix.size} bytes')
+        if signatures.salt_len >= _compressed:
+            raise ValueError(f'Salt must be less than {_compressed} bytes')
+        if codec is None:
+            codec = BinaryCodec()
+        elif isinstance(codec, LegacyCodec):
+            raise ValueError('Legacy packets are decoded only')
+        if not decoders:
+            decoders = [BinaryCodec(), PickleCodec()]
         self.signatures: Final = signatures
-        self.pickle_protocol: Final = pickle_protocol
+        self.legacy_signatures: Final = legacy_signatures
+        self.codec: Final = codec
         self.prefix_xor: Final = prefix_xor
+        self._decoders = {decoder.codec_id: decoder for decoder in decoders
+                          if not isinstance(decoder, LegacyCodec)}
+        self._decoders[codec.codec_id] = codec
+        if legacy_signatures is not None:
+            self._decoders[LegacyCodec.codec_id] = LegacyCodec()
+        self._digest_sizes = frozenset(
+            sigs.digest_size for sigs in (signatures, legacy_signatures)
+            if sigs is not None)
+        self.compress_threshold: Final = compress_threshold
+        self.compress_dict: Final = compress_dict
+        self.max_payload: Final = max_payload
+        if compress_dict is not None:
+            self._compressobj = zlib.compressobj(
+                compress_level, zdict=compress_dict)
+        else:
+            self._compressobj = zlib.compressobj(compress_level)
+
+    def _compress(self, payload: bytes) -> Optional[bytes]:
+        threshold = self.compress_threshold
+        if threshold is None or len(payload) < threshold:
+            return None
+        compressobj = self._compressobj.copy()
+        compressed = compressobj.compress(payload) + compressobj.flush()
+        if len(compressed) >= len(payload):
+            return None
+        return compressed
+
+    def _decompress(self, compressed: memoryview) -> Optional[bytes]:
+        compress_dict = self.compress_dict
+        if compress_dict is not None:
+            decompressobj = zlib.decompressobj(zdict=compress_dict)
+        else:
+            decompressobj = zlib.decompressobj()
+        try:
+            payload = decompressobj.decompress(compressed, self.max_payload)
+        except zlib.error:
+            return None
+        if not decompressobj.eof or decompressobj.unconsumed_tail:
+            return None
+        return payload
 
     def _xor_prefix(self, prefix: bytes) -> bytes:
         zipped = zip(prefix, self.prefix_xor, strict=True)
         return bytes([left ^ right for left, right in zipped])
 
     def pack(self, packet: Packet) -> bytes:
-        """Uses :mod:`pickle` to serialize *packet*, generates a digital
-        signature of the pickled data, and returns a byte-string that can be
-        sent as a raw UDP packet.
+        """Uses the *codec* to serialize *packet*, generates a digital
+        signature of the payload, and returns a byte-string that can be sent
+        as a raw UDP packet.
 
-        The resulting byte-string starts with a 4-byte :mod:`struct` prefix
+        The resulting byte-string starts with a 6-byte :mod:`struct` prefix
         (XOR'ed with *prefix_xor*) with the `struct format
         <https://docs.python.org/3/library/struct.html#format-strings>`_
-        ``!BBH``. The first byte is the length of the salt, the second byte is
-        the length of the signature, and the final two bytes are the length of
-        the pickled payload. After the prefix, the salt, digest, and pickled
-        payload byte-strings are concatenated.
+        ``!BBI``. The first byte is the length of the salt, the second byte is
+        the length of the signature, and the final four bytes are the length
+        of the payload. After the prefix, the salt, digest, and payload
+        byte-strings are concatenated.
+
+        If the payload was compressed, the high bit of the first byte is set.
+        The signature is generated from the compressed payload.
 
         Args:
             packet: The SWIM protocol packet to serialize.
 
         """
-        pickled = pickle.dumps(packet, self.pickle_protocol)
-        salt, digest = self.signatures.sign(pickled)
+        payload = self.codec.encode(packet)
+        flags = 0
+        compressed = self._compress(payload)
+        if compressed is not None:
+            payload = compressed
+            flags |= _compressed
+        salt, digest = self.signatures.sign(payload)
         salt_start = _prefix.size
         digest_start = salt_start + len(salt)
         data_start = digest_start + len(digest)
-        prefix = _prefix.pack(len(salt), len(digest), len(pickled))
-        packed = bytearray(data_start + len(pickled))
+        prefix = _prefix.pack(len(salt) | flags, len(digest), len(payload))
+        packed = bytearray(data_start + len(payload))
         packed[0:salt_start] = self._xor_prefix(prefix)
         packed[salt_start:digest_start] = salt
         packed[digest_start:data_start] = digest
-        packed[data_start:] = pickled
+        packed[data_start:] = payload
         return packed
 
-    def unpack(self, data: bytes) -> Optional[Packet]:
-        """Deserializes a byte-string that was created using :meth:`.pack` into
-        a SWIM protocol packet. If any assumptions about the serialized data
+    def frame_size(self, data: bytes) -> Optional[int]:
+        """Return the total size of the packet at the start of *data*, as
+        created by :meth:`.pack`, using only its prefix. This allows many
+        packets to be sent back-to-back on a single stream.
+
+        Args:
+            data: The start of a serialized byte-string.
+
+        Returns:
+            The size of the packet, or ``None`` if *data* is too short to
+            contain the prefix.
+
+        Raises:
+            ValueError: The prefix is malformed or the packet is too large.
+
+        """
+        if len(data) < _prefix.size:
+            return None
+        prefix = self._xor_prefix(memoryview(data)[0:_prefix.size])
+        salt_len, digest_len, data_len = _prefix.unpack(prefix)
+        salt_len &= ~_compressed
+        if digest_len not in self._digest_sizes \
+                or data_len > self.max_payload:
+            raise ValueError('Invalid packet prefix')
+        return _prefix.size + salt_len + digest_len + data_len
+
+    def verify(self, data: bytes) -> Optional[memoryview]:
+        """Verify the signature of a byte-string that was created using
+        :meth:`.pack`, returning its payload -- decompressed, if necessary --
+        for :meth:`.decode`. If any assumptions about the serialized data
         are not met, including an invalid signature, ``None`` is returned to
         indicate that *data* was malformed or incomplete.
 
+        A payload verified by *legacy_signatures* is returned with the
+        :attr:`~swimprotocol.udp.codec.LegacyCodec.codec_id` byte added to
+        the start.
+
         Args:
             data: The serialized byte-string of the SWIM protocol packet.
 
         """
         data_view = memoryview(data)
         salt_start = _prefix.size
-        prefix = self._xor_prefix(data_view[0:salt_start])
-        try:
-            salt_len, digest_len, data_len = _prefix.unpack(prefix)
-        except struct.error:
+        if len(data_view) < salt_start:
             return None
+        prefix = self._xor_prefix(data_view[0:salt_start])
+        salt_len, digest_len, data_len = _prefix.unpack(prefix)
+        flags = salt_len & _compressed
+        salt_len &= ~_compressed
         digest_start = salt_start + salt_len
         data_start = digest_start + digest_len
         data_end = data_start + data_len
         salt = data_view[salt_start:digest_start]
         digest = data_view[digest_start:data_start]
-        pickled = data_view[data_start:data_end]
+        payload = data_view[data_start:data_end]
+        if len(digest) not in self._digest_sizes \
+                or len(payload) != data_len or not payload:
+            return None
         signatures = self.signatures
-        if len(digest) != signatures.digest_size or len(pickled) != data_len:
+        if len(digest) != signatures.digest_size \
+                or not signatures.verify(payload, (salt, digest)):
+            legacy_signatures = self.legacy_signatures
+            if legacy_signatures is None or flags & _compressed \
+                    or len(digest) != legacy_signatures.digest_size \
+                    or not legacy_signatures.verify(payload, (salt, digest)):
+                return None
+            # the version byte selects LegacyCodec for the legacy payload
+            return memoryview(bytes((LegacyCodec.codec_id, )) + payload)
+        if flags & _compressed:
+            decompressed = self._decompress(payload)
+            if not decompressed:
+                return None
+            payload = memoryview(decompressed)
+        return payload
+
+    def decode(self, payload: bytes) -> Optional[Packet]:
+        """Deserialize a payload returned by :meth:`.verify` into a SWIM
+        protocol packet, using the decoder identified by its first byte, or
+        return ``None`` if it was malformed.
+
+        Args:
+            payload: The verified payload.
+
+        """
+        payload_view = memoryview(payload)
+        if not payload_view:
             return None
-        if signatures.verify(pickled, (salt, digest)):
-            packet = pickle.loads(pickled)  # noqa: S301
-            assert isinstance(packet, Packet)
-            return packet
-        else:
+        decoder = self._decoders.get(payload_view[0])
+        if decoder is None:
+            return None
+        try:
+            return decoder.decode(payload_view)
+        except CodecError:
+            return None
+
+    def unpack(self, data: bytes) -> Optional[Packet]:
+        """Deserializes a byte-string that was created using :meth:`.pack` into
+        a SWIM protocol packet, using :meth:`.verify` and :meth:`.decode`.
+
+        Args:
+            data: The serialized byte-string of the SWIM protocol packet.
+
+        """
+        payload = self.verify(data)
+        if payload is None:
             return None
+        return self.decode(payload)
@@ -0,0 +1,180 @@
+
+from __future__ import annotations
+
+import asyncio
+from asyncio import BaseTransport, Protocol, TimerHandle, Transport
+from collections import OrderedDict
+from contextlib import AbstractContextManager
+from typing import Any, Final, Optional
+
+from ..address import Address
+from ..tasks import TaskOwner
+
+__all__ = ['TcpPool']
+
+
+class _PooledConnection(Protocol):
+
+    def __init__(self, pool: TcpPool, address: Address) -> None:
+        super().__init__()
+        self.pool: Final = pool
+        self.address: Final = address
+        self._pending: list[bytes] = []
+        self._pending_size = 0
+        self._transport: Optional[Transport] = None
+        self._idle_handle: Optional[TimerHandle] = None
+        self._closed = False
+
+    async def connect(self) -> None:
+        loop = asyncio.get_running_loop()
+        address = self.address
+        try:
+            await loop.create_connection(
+                lambda: self, address.host, address.port)
+        except OSError:
+            self._closed = True
+            self._clear_pending()
+            self.pool._discard(self)
+
+    def connection_made(self, transport: BaseTransport) -> None:
+        assert isinstance(transport, Transport)
+        self._transport = transport
+        pending = self._pending
+        self._clear_pending()
+        if self._closed:
+            transport.close()
+        else:
+            for data in pending:
+                transport.write(data)
+            self._reset_idle()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._closed = True
+        self._transport = None
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+        self.pool._discard(self)
+
+    def _clear_pending(self) -> None:
+        self._pending = []
+        self._pending_size = 0
+
+    def _reset_idle(self) -> None:
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+        loop = asyncio.get_running_loop()
+        self._idle_handle = loop.call_later(
+            self.pool.idle_timeout, self.close)
+
+    def write(self, data: bytes) -> None:
+        transport = self._transport
+        if self._closed:
+            pass
+        elif transport is None:
+            if self.pool._overflows(self._pending_size, data):
+                return
+            self._pending.append(data)
+            self._pending_size += len(data)
+        elif not transport.is_closing():
+            if self.pool._overflows(transport.get_write_buffer_size(), data):
+                return
+            transport.write(data)
+            self._reset_idle()
+
+    def close(self) -> None:
+        self._closed = True
+        self._clear_pending()
+        if self._transport is not None:
+            self._transport.close()
+
+
+class TcpPool(TaskOwner, AbstractContextManager['TcpPool']):
+    """Keeps a persistent TCP connection open to each cluster member that is
+    sent oversized packets, so that many packets may be written to the same
+    connection one after another. Packets are delimited by their prefix, see
+    :meth:`~swimprotocol.udp.pack.UdpPack.frame_size`.
+
+    Connections are closed after they have been idle for *idle_timeout*
+    seconds. When *max_connections* are open, the least-recently used
+    connection is closed before another is opened. All connections are closed
+    when the context exits.
+
+    Data waiting to be written to a connection, because it is still opening
+    or the cluster member is slow to receive, is limited to *max_buffer_size*
+    bytes. Packets that would exceed it are dropped, like a lost UDP packet,
+    though a larger packet is still written when nothing else is waiting.
+
+    Args:
+        idle_timeout: Seconds before an unused connection is closed.
+        max_connections: The maximum number of open connections.
+        max_buffer_size: The maximum bytes waiting to be written to each
+            connection.
+
+    """
+
+    def __init__(self, *, idle_timeout: float,
+                 max_connections: int,
+                 max_buffer_size: int = 4 * 1024 * 1024) -> None:
+        super().__init__()
+        if max_connections < 1:
+            raise ValueError(max_connections)
+        self.idle_timeout: Final = idle_timeout
+        self.max_connections: Final = max_connections
+        self.max_buffer_size: Final = max_buffer_size
+        self._connections: OrderedDict[Address, _PooledConnection] = \
+            OrderedDict()
+        self._dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    @property
+    def dropped(self) -> int:
+        """The number of packets dropped because too much data was waiting
+        to be written to a connection.
+
+        """
+        return self._dropped
+
+    def _overflows(self, buffer_size: int, data: bytes) -> bool:
+        if buffer_size > 0 and buffer_size + len(data) > self.max_buffer_size:
+            self._dropped += 1
+            return True
+        return False
+
+    def __exit__(self, *exc_details: Any) -> None:
+        connections = list(self._connections.values())
+        self._connections.clear()
+        for connection in connections:
+            connection.close()
+
+    def _discard(self, connection: _PooledConnection) -> None:
+        connections = self._connections
+        if connections.get(connection.address) is connection:
+            del connections[connection.address]
+
+    def _get(self, address: Address) -> _PooledConnection:
+        connections = self._connections
+        connection = connections.get(address)
+        if connection is not None:
+            connections.move_to_end(address)
+            return connection
+        while len(connections) >= self.max_connections:
+            _, oldest = connections.popitem(last=False)
+            oldest.close()
+        connections[address] = connection = _PooledConnection(self, address)
+        self.run_subtask(connection.connect())
+        return connection
+
+    def send(self, address: Address, data: bytes) -> None:
+        """Write *data* to the pooled connection to *address*. If the
+        connection is not yet open, it is opened in the background and *data*
+        is written once it succeeds. If the connection fails, or too much data
+        is waiting to be written to it, the data is dropped.
+
+        Args:
+            address: The address of the cluster member.
+            data: The serialized packet.
+
+        """
+        self._get(address).write(data)
@@ -1,37 +1,30 @@
 
-
 from __future__ import annotations
 
-import asyncio
-from asyncio import Queue, Protocol, DatagramProtocol
-from concurrent.futures import ThreadPoolExecutor
+from asyncio import BaseTransport, Protocol, DatagramProtocol
 from typing import Final, Optional
 
-from .pack import UdpPack
-from ..packet import Packet
-from ..tasks import TaskOwner
+from .recv import UdpRecv
 
 __all__ = ['BaseProtocol', 'UdpProtocol', 'TcpProtocol']
 
 
-class BaseProtocol(TaskOwner):
+class BaseProtocol:
     """Base class of :class:`UdpProtocol` and :class:`TcpProtocol`. Each will
     call :meth:`.handle_packet` upon receipt of a full packet.
 
     Args:
-        thread_pool: A thread pool for CPU-heavy operations.
+        udp_recv: Unpacks the raw packets received.
 
     """
 
-    def __init__(self, thread_pool: ThreadPoolExecutor, udp_pack: UdpPack,
-                 recv_queue: Queue[Packet]) -> None:
+    def __init__(self, udp_recv: UdpRecv) -> None:
         super().__init__()
-        self.thread_pool: Final = thread_pool
-        self.udp_pack: Final = udp_pack
-        self.recv_queue: Final = recv_queue
+        self.udp_recv: Final = udp_recv
 
-    async def handle_packet(self, data: bytes) -> None:
-        """Parse the *data* into a packet and push it onto the worker
+    def handle_packet(self, data: bytes) -> None:
+        """Push the *data* onto the :class:`~swimprotocol.udp.recv.UdpRecv`
+        ring buffer, to be parsed into a packet and put on the worker
         :attr:`~swimprotocol.worker.Worker.recv_queue`.
 
         Args:
@@ -39,12 +32,7 @@ class BaseProtocol(TaskOwner):
                 :class:`~swimprotocol.udp.pack.UdpPack`.
 
         """
-        loop = asyncio.get_running_loop()
-        packet = await loop.run_in_executor(
-            self.thread_pool, self.udp_pack.unpack, data)
-        if packet is None:
-            return
-        await self.recv_queue.put(packet)
+        self.udp_recv.push(data)
 
 
 class UdpProtocol(BaseProtocol, DatagramProtocol):
@@ -56,29 +44,46 @@ class UdpProtocol(BaseProtocol, DatagramProtocol):
     """
 
     def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
-        self.run_subtask(self.handle_packet(data))
+        self.handle_packet(data)
 
 
 class TcpProtocol(BaseProtocol, Protocol):
     """Implements :class:`~asyncio.Protocol` to receive SWIM protocol packets
     by TCP.
 
-    All data received is accumulated until the connection is closed, with the
-    result treated as a complete packet and sent to :meth:`.handle_packet`.
+    A connection may carry any number of packets, one after another. Data
+    received is accumulated until it contains a complete packet, as determined
+    by :meth:`~swimprotocol.udp.pack.UdpPack.frame_size`, which is then sent
+    to :meth:`.handle_packet`. The connection is closed if a malformed packet
+    prefix is received.
 
     """
 
-    def __init__(self, thread_pool: ThreadPoolExecutor, udp_pack: UdpPack,
-                 recv_queue: Queue[Packet]) -> None:
-        super().__init__(thread_pool, udp_pack, recv_queue)
+    def __init__(self, udp_recv: UdpRecv) -> None:
+        super().__init__(udp_recv)
         self._buf = bytearray()
+        self._transport: Optional[BaseTransport] = None
+
+    def connection_made(self, transport: BaseTransport) -> None:
+        self._transport = transport
 
     def data_received(self, data: bytes) -> None:
-        self._buf += data
+        buf = self._buf
+        buf += data
+        frame_size_func = self.udp_recv.udp_pack.frame_size
+        while buf:
+            try:
+                frame_size = frame_size_func(buf)
+            except ValueError:
+                buf.clear()
+                if self._transport is not None:
+                    self._transport.close()
+                return
+            if frame_size is None or len(buf) < frame_size:
+                return
+            self.handle_packet(bytes(buf[0:frame_size]))
+            del buf[0:frame_size]
 
     def connection_lost(self, exc: Optional[Exception]) -> None:
-        data = self._buf
         self._buf = bytearray()
-        if exc is not None:
-            return
-        self.run_subtask(self.handle_packet(data))
+        self._transport = None
@@ -0,0 +1,122 @@
+
+from __future__ import annotations
+
+import asyncio
+from asyncio import Event
+from collections import deque
+from typing import Final, NoReturn
+
+from .offload import Offload
+from .pack import UdpPack
+from ..packet import Packet
+from ..queue import PacketQueue
+from ..tasks import DaemonTask
+
+__all__ = ['UdpRecv']
+
+
+class UdpRecv(DaemonTask):
+    """Daemon task that unpacks the raw packets received by UDP or TCP and
+    puts them on *recv_queue*.
+
+    Raw packets are kept in a ring buffer of *ring_size* until one of the
+    *consumers* is ready for them. If the ring buffer is full, the oldest raw
+    packet is dropped. Each consumer takes all of the raw packets waiting, up
+    to *batch_size*, and unpacks them in the order they were received.
+
+    Args:
+        udp_pack: Packs and unpacks SWIM protocol packets.
+        offload: Runs CPU-heavy operations for large packets.
+        recv_queue: The queue of packets received.
+        ring_size: The maximum number of raw packets waiting to be unpacked.
+        consumers: The number of raw packets unpacked concurrently.
+        batch_size: The maximum number of raw packets taken at once by a
+            consumer.
+
+    """
+
+    def __init__(self, udp_pack: UdpPack, offload: Offload,
+                 recv_queue: PacketQueue[Packet], *,
+                 ring_size: int = 1024, consumers: int = 1,
+                 batch_size: int = 64) -> None:
+        super().__init__()
+        if ring_size < 1 or consumers < 1 or batch_size < 1:
+            raise ValueError('Invalid ring, consumer, or batch size')
+        self.udp_pack: Final = udp_pack
+        self.offload: Final = offload
+        self.recv_queue: Final = recv_queue
+        self.consumers: Final = consumers
+        self.batch_size: Final = batch_size
+        self._ring: deque[bytes] = deque(maxlen=ring_size)
+        self._ready = Event()
+        self._received = 0
+        self._dropped = 0
+        self._invalid = 0
+
+    @property
+    def depth(self) -> int:
+        """The number of raw packets waiting to be unpacked."""
+        return len(self._ring)
+
+    @property
+    def received(self) -> int:
+        """The number of raw packets received."""
+        return self._received
+
+    @property
+    def dropped(self) -> int:
+        """The number of raw packets dropped because the ring buffer was
+        full.
+
+        """
+        return self._dropped
+
+    @property
+    def invalid(self) -> int:
+        """The number of raw packets that could not be unpacked."""
+        return self._invalid
+
+    def push(self, data: bytes) -> None:
+        """Add a raw packet to be unpacked.
+
+        Args:
+            data: The bytes representing a packet to be parsed by
+                :class:`~swimprotocol.udp.pack.UdpPack`.
+
+        """
+        ring = self._ring
+        if len(ring) == ring.maxlen:
+            self._dropped += 1
+        ring.append(data)
+        self._received += 1
+        self._ready.set()
+
+    def _take(self) -> list[bytes]:
+        ring = self._ring
+        batch = [ring.popleft()
+                 for _ in range(min(len(ring), self.batch_size))]
+        if not ring:
+            self._ready.clear()
+        return batch
+
+    async def _consume(self) -> NoReturn:
+        ready = self._ready
+        offload = self.offload
+        unpack = self.udp_pack.unpack
+        recv_queue = self.recv_queue
+        while True:
+            await ready.wait()
+            packets: list[Packet] = []
+            for data in self._take():
+                packet = await offload.run(len(data), unpack, data)
+                if packet is None:
+                    self._invalid += 1
+                else:
+                    packets.append(packet)
+            for packet in packets:
+                await recv_queue.put(packet)
+
+    async def run(self) -> NoReturn:
+        await asyncio.gather(*[self._consume()
+                               for _ in range(self.consumers)])
+        raise RuntimeError()
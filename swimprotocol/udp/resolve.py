@@ -0,0 +1,161 @@
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import time
+from collections.abc import Sequence
+from typing import Any, Final, NamedTuple, Optional
+from weakref import WeakKeyDictionary
+
+from ..address import Address, AddressParser
+from ..members import Member
+from ..tasks import TaskOwner
+
+__all__ = ['ResolvedAddress', 'get_hosts', 'Resolver']
+
+_AddrInfo = tuple[Any, Any, int, str, tuple[Any, ...]]
+
+
+class ResolvedAddress(NamedTuple):
+    """The address of a cluster member, parsed from its name, and the socket
+    address resolved from it.
+
+    Args:
+        address: The address parsed from the cluster member name.
+        sockaddr: The resolved socket address, e.g. for
+            :meth:`~asyncio.DatagramTransport.sendto`.
+
+    """
+
+    address: Address
+    sockaddr: tuple[Any, ...]
+
+
+def get_hosts(infos: Sequence[_AddrInfo]) -> set[str]:
+    """Return the unique IP addresses from the results of
+    :func:`socket.getaddrinfo` or :meth:`~asyncio.loop.getaddrinfo`.
+
+    Args:
+        infos: The address info results.
+
+    """
+    return {str(info[4][0]) for info in infos}
+
+
+class _Entry(NamedTuple):
+    resolved: ResolvedAddress
+    expires: float
+
+
+class Resolver(TaskOwner):
+    """Parses and resolves the address of each cluster member once, caching
+    the result for *ttl* seconds.
+
+    Names with an IP address are resolved immediately. Otherwise, the first
+    resolution waits on :meth:`~asyncio.loop.getaddrinfo`, and later
+    resolutions return the cached socket address while an expired entry is
+    refreshed in the background. If resolution fails, the previous socket
+    address is kept, or the unresolved host and port are used, and
+    resolution is retried after *retry* seconds.
+
+    Args:
+        address_parser: Parses cluster member names into addresses.
+        ttl: Seconds to cache a resolved socket address.
+        retry: Seconds to wait before retrying a failed resolution.
+        family: The address family, e.g. :data:`socket.AF_INET`.
+
+    """
+
+    def __init__(self, address_parser: AddressParser, *,
+                 ttl: float = 60.0, retry: float = 5.0,
+                 family: int = socket.AF_UNSPEC) -> None:
+        super().__init__()
+        self.address_parser: Final = address_parser
+        self.ttl: Final = ttl
+        self.retry: Final = retry
+        self.family = family
+        self._cache: WeakKeyDictionary[Member, _Entry] = WeakKeyDictionary()
+        self._refreshing: WeakKeyDictionary[Member, bool] = \
+            WeakKeyDictionary()
+
+    def _getaddrinfo_numeric(self, address: Address) \
+            -> Optional[tuple[Any, ...]]:
+        try:
+            infos = socket.getaddrinfo(
+                address.host, address.port, self.family, socket.SOCK_DGRAM,
+                0, socket.AI_NUMERICHOST)
+        except OSError:
+            return None
+        return infos[0][4] if infos else None
+
+    async def _getaddrinfo(self, address: Address) \
+            -> Optional[tuple[Any, ...]]:
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(
+                address.host, address.port, family=self.family,
+                type=socket.SOCK_DGRAM)
+        except OSError:
+            return None
+        return infos[0][4] if infos else None
+
+    async def _resolve(self, member: Member, address: Address,
+                       previous: Optional[ResolvedAddress]) \
+            -> ResolvedAddress:
+        now = time.monotonic()
+        sockaddr = await self._getaddrinfo(address)
+        if sockaddr is not None:
+            resolved = ResolvedAddress(address, sockaddr)
+            self._cache[member] = _Entry(resolved, now + self.ttl)
+        else:
+            if previous is None:
+                previous = ResolvedAddress(
+                    address, (address.host, address.port))
+            resolved = previous
+            self._cache[member] = _Entry(resolved, now + self.retry)
+        return resolved
+
+    async def _refresh(self, member: Member,
+                       previous: ResolvedAddress) -> None:
+        try:
+            await self._resolve(member, previous.address, previous)
+        finally:
+            self._refreshing.pop(member, None)
+
+    def get_cached(self, member: Member) -> Optional[ResolvedAddress]:
+        """Return the cached address of the cluster member, even if it has
+        expired, or ``None`` if it has not been resolved.
+
+        Args:
+            member: The cluster member.
+
+        """
+        entry = self._cache.get(member)
+        return entry.resolved if entry is not None else None
+
+    async def resolve(self, member: Member) -> ResolvedAddress:
+        """Return the address of the cluster member, resolving it if
+        necessary.
+
+        Args:
+            member: The cluster member.
+
+        Raises:
+            ValueError: The cluster member name was not a valid address.
+
+        """
+        entry = self._cache.get(member)
+        if entry is not None:
+            if entry.expires <= time.monotonic() \
+                    and member not in self._refreshing:
+                self._refreshing[member] = True
+                self.run_subtask(self._refresh(member, entry.resolved))
+            return entry.resolved
+        address = self.address_parser.parse(member.name)
+        sockaddr = self._getaddrinfo_numeric(address)
+        if sockaddr is not None:
+            resolved = ResolvedAddress(address, sockaddr)
+            self._cache[member] = _Entry(resolved, float('inf'))
+            return resolved
+        return await self._resolve(member, address, None)
@@ -2,63 +2,134 @@
 from __future__ import annotations
 
 import asyncio
-from asyncio import Queue, Protocol, DatagramTransport
-from concurrent.futures import ThreadPoolExecutor
-from contextlib import closing
+import math
+from asyncio import DatagramTransport
+from collections.abc import Sequence
+from dataclasses import replace
+from itertools import islice
 from typing import NoReturn
 
 from .config import UdpConfig
+from .offload import Offload
 from .pack import UdpPack
-from ..address import Address
+from .pool import TcpPool
+from .resolve import Resolver
 from ..members import Member
-from ..packet import Packet
+from ..packet import Packet, Gossip, GossipAck
+from ..queue import PacketQueue
 from ..tasks import DaemonTask
 
 __all__ = ['UdpSend']
 
 
+def _split(packet: Packet, parts: int) -> Sequence[Packet]:
+    if isinstance(packet, Gossip):
+        gossip = packet.gossip
+        if len(gossip) <= 1:
+            return [packet]
+        size = math.ceil(len(gossip) / parts)
+        return [replace(packet, gossip=gossip[i:i + size])
+                for i in range(0, len(gossip), size)]
+    elif isinstance(packet, GossipAck):
+        gossip_acks = packet.gossip_acks
+        if len(gossip_acks) <= 1:
+            return [packet]
+        size = math.ceil(len(gossip_acks) / parts)
+        it = iter(gossip_acks.items())
+        return [replace(packet, gossip_acks=dict(islice(it, size)))
+                for _ in range(0, len(gossip_acks), size)]
+    elif packet.gossip:
+        gossip = packet.gossip
+        return [replace(packet, gossip=gossip[0:len(gossip) // parts])]
+    elif packet.gossip_acks:
+        gossip_acks = packet.gossip_acks
+        it = iter(gossip_acks.items())
+        return [replace(packet, gossip_acks=dict(
+            islice(it, len(gossip_acks) // parts)))]
+    else:
+        return [packet]
+
+
+def _estimate_size(packet: Packet) -> int:
+    size = 64
+    for record in packet.gossip:
+        size += len(record.name) + 16
+        metadata = record.metadata
+        if metadata is not None:
+            for key, val in metadata.items():
+                size += len(key) + len(val) + 4
+    return size
+
+
 class UdpSend(DaemonTask):
     """Daemon task that waits for packets on *send_queue* and sends them using
-    either by UDP or -- for oversized packets -- establishing a TCP connection.
+    either by UDP or -- for oversized packets -- a pooled TCP connection.
+    Packets are taken from *send_queue* by a fixed number of concurrent
+    *senders*.
+
+    Oversized :class:`~swimprotocol.packet.Gossip` and
+    :class:`~swimprotocol.packet.GossipAck` packets are first split into as
+    few packets as necessary to fit within the MTU size. Any other oversized
+    packet has its :term:`gossip` reduced until it fits, since the remaining
+    gossip will be sent again later.
 
     """
 
     def __init__(self, config: UdpConfig, udp_pack: UdpPack,
-                 thread_pool: ThreadPoolExecutor,
-                 send_queue: Queue[tuple[Member, Packet]],
-                 udp_transport: DatagramTransport) -> None:
+                 offload: Offload,
+                 send_queue: PacketQueue[tuple[Member, Packet]],
+                 udp_transport: DatagramTransport,
+                 tcp_pool: TcpPool, resolver: Resolver, *,
+                 senders: int = 1) -> None:
         super().__init__()
-        self._address_parser = config.address_parser
         self._mtu_size = config.mtu_size
         self._udp_pack = udp_pack
-        self._thread_pool = thread_pool
+        self._offload = offload
         self._send_queue = send_queue
         self._udp_transport = udp_transport
+        self._tcp_pool = tcp_pool
+        self._resolver = resolver
+        self._senders = senders
+        self._sent = 0
 
-    async def run(self) -> NoReturn:
+    @property
+    def sent(self) -> int:
+        """The number of packets sent."""
+        return self._sent
+
+    async def _sender(self) -> NoReturn:
+        loop = asyncio.get_running_loop()
         send_queue = self._send_queue
         while True:
             member, packet = await send_queue.get()
-            asyncio.create_task(self._do_send(member, packet))
+            try:
+                await self._do_send(member, packet)
+            except OSError:  # noqa: S110
+                pass
+            except Exception as exc:
+                loop.call_exception_handler({
+                    'message': 'Exception sending packet',
+                    'exception': exc})
+
+    async def run(self) -> NoReturn:
+        await asyncio.gather(*[self._sender()
+                               for _ in range(self._senders)])
+        raise RuntimeError()
 
     async def _do_send(self, member: Member, packet: Packet) -> None:
-        thread_pool = self._thread_pool
         udp_transport = self._udp_transport
-        loop = asyncio.get_running_loop()
-        packet_data = await loop.run_in_executor(
-            thread_pool, self._udp_pack.pack, packet)
-        address = self._address_parser.parse(member.name)
-        if len(packet_data) <= self._mtu_size:
-            udp_transport.sendto(packet_data, (address.host, address.port))
+        packet_data = await self._offload.run(
+            _estimate_size(packet), self._udp_pack.pack, packet)
+        mtu_size = self._mtu_size
+        if len(packet_data) > mtu_size:
+            parts = _split(packet, math.ceil(len(packet_data) / mtu_size))
+            if parts[0] is not packet:
+                for part in parts:
+                    await self._do_send(member, part)
+                return
+        address, sockaddr = await self._resolver.resolve(member)
+        if len(packet_data) <= mtu_size:
+            udp_transport.sendto(packet_data, sockaddr)
         else:
-            asyncio.create_task(self._tcp_send(packet_data, address))
-
-    async def _tcp_send(self, packet_data: bytes, address: Address) -> None:
-        loop = asyncio.get_running_loop()
-        try:
-            tcp_transport, _ = await loop.create_connection(
-                Protocol, address.host, address.port)
-            with closing(tcp_transport):
-                tcp_transport.write(packet_data)
-        except Exception:  # noqa: S110
-            pass
+            self._tcp_pool.send(address, packet_data)
+        self._sent += 1
@@ -0,0 +1,126 @@
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import socket
+from contextlib import AbstractContextManager, closing
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any, Final, Optional
+
+from .pack import UdpPack
+from ..packet import Packet
+from ..queue import PacketQueue
+from ..sign import Signatures
+
+__all__ = ['ShardedRecv']
+
+
+def _run_shard(conn: Connection, signatures: Signatures,
+               legacy_signatures: Optional[Signatures],
+               prefix_xor: bytes, compress_dict: Optional[bytes],
+               max_payload: int, local_addr: tuple[str, int],
+               max_size: int) -> None:  # pragma: no cover
+    udp_pack = UdpPack(signatures, legacy_signatures=legacy_signatures,
+                       prefix_xor=prefix_xor, compress_dict=compress_dict,
+                       max_payload=max_payload)
+    host, port = local_addr
+    family, sock_type, proto, _, address = socket.getaddrinfo(
+        host, port, type=socket.SOCK_DGRAM)[0]
+    sock = socket.socket(family, sock_type, proto)
+    with closing(sock), closing(conn):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind(address)
+        while True:
+            data = sock.recv(max_size)
+            payload = udp_pack.verify(data)
+            if payload is not None and udp_pack.decode(payload) is not None:
+                try:
+                    conn.send_bytes(payload)
+                except OSError:
+                    return
+
+
+class ShardedRecv(AbstractContextManager['ShardedRecv']):
+    """Starts *processes* receiver processes, each binding another UDP socket
+    to *local_addr* with ``SO_REUSEPORT`` so that the kernel spreads incoming
+    packets across them. Each receiver process verifies signatures,
+    decompresses, and checks that the payload can be decoded, forwarding
+    only valid payloads over a :func:`~multiprocessing.Pipe`. The main
+    process decodes each forwarded payload and puts the packet on
+    *recv_queue*.
+
+    Receiver processes are started with the ``spawn`` method when the
+    context is entered, and terminated when it exits.
+
+    Note:
+        ``SO_REUSEPORT`` load-balancing of UDP packets across processes is
+        only available on Linux.
+
+    Args:
+        udp_pack: Packs and unpacks SWIM protocol packets.
+        recv_queue: The queue of packets received.
+        local_addr: The local host and port to bind.
+        processes: The number of receiver processes.
+        max_size: The maximum size of a received packet.
+
+    """
+
+    def __init__(self, udp_pack: UdpPack, recv_queue: PacketQueue[Packet],
+                 local_addr: tuple[str, int], *, processes: int,
+                 max_size: int = 65535) -> None:
+        super().__init__()
+        self.udp_pack: Final = udp_pack
+        self.recv_queue: Final = recv_queue
+        self.local_addr: Final = local_addr
+        self.processes: Final = processes
+        self.max_size: Final = max_size
+        self._shards: list[tuple[BaseProcess, Connection]] = []
+        self._received = 0
+
+    @property
+    def received(self) -> int:
+        """The number of packets forwarded by receiver processes."""
+        return self._received
+
+    def __enter__(self) -> ShardedRecv:
+        loop = asyncio.get_running_loop()
+        ctx = multiprocessing.get_context('spawn')
+        udp_pack = self.udp_pack
+        for _ in range(self.processes):
+            parent_conn, child_conn = ctx.Pipe(duplex=False)
+            process = ctx.Process(target=_run_shard, daemon=True, args=(
+                child_conn, udp_pack.signatures,
+                udp_pack.legacy_signatures, udp_pack.prefix_xor,
+                udp_pack.compress_dict, udp_pack.max_payload,
+                self.local_addr, self.max_size))
+            process.start()
+            child_conn.close()
+            loop.add_reader(parent_conn.fileno(), self._read_ready,
+                            parent_conn)
+            self._shards.append((process, parent_conn))
+        return self
+
+    def __exit__(self, *exc_details: Any) -> None:
+        loop = asyncio.get_running_loop()
+        shards = self._shards
+        self._shards = []
+        for process, conn in shards:
+            loop.remove_reader(conn.fileno())
+            conn.close()
+            process.terminate()
+        for process, _ in shards:
+            process.join()
+
+    def _read_ready(self, conn: Connection) -> None:
+        decode = self.udp_pack.decode
+        recv_queue = self.recv_queue
+        try:
+            while conn.poll():
+                packet = decode(conn.recv_bytes())
+                if packet is not None:
+                    self._received += 1
+                    recv_queue.put_nowait(packet)
+        except (EOFError, OSError):
+            asyncio.get_running_loop().remove_reader(conn.fileno())
@@ -2,20 +2,85 @@
 from __future__ import annotations
 
 import asyncio
-from asyncio import Event, Queue, Task, TimeoutError
-from collections.abc import Mapping, Sequence
-from contextlib import suppress
+from asyncio import Future
+from collections.abc import Hashable, Iterator, Mapping, Sequence, Set
+from contextlib import contextmanager
+from itertools import count
 from typing import final, Final, Optional, NoReturn
-from weakref import WeakSet, WeakKeyDictionary
-
-from .config import BaseConfig
-from .members import Member, Members
-from .packet import Packet, Ping, PingReq, Ack, Gossip, GossipAck
+from weakref import WeakKeyDictionary
+
+from .config import BaseConfig, ProbeStrategy
+from .members import Member, MemberSnapshot, Members
+from .packet import Packet, Ping, PingReq, Ack, Gossip, GossipAck, \
+    GossipRecord
+from .queue import merge_packets, PacketQueue
+from .scheduler import Scheduler, Timer
 from .status import Status
 from .tasks import DaemonTask, TaskOwner
 
 __all__ = ['Worker']
 
+_gossip_cache_size = 8
+
+# deviations added to the smoothed round-trip time for timeouts, per RFC 6298
+_rtt_deviations = 4.0
+
+# the indirect path has two legs, each with its own delays and variation,
+# and is the last chance before suspicion, so it is given extra room
+_ping_req_factor = 2.0
+
+_SendItem = tuple[Member, Packet]
+
+
+def _recv_packet(packet: Packet) -> Packet:
+    return packet
+
+
+def _recv_key(packet: Packet) -> Hashable:
+    return type(packet), packet.source
+
+
+def _recv_coalesce(queued: Packet, packet: Packet) -> Packet:
+    return merge_packets(queued, packet)
+
+
+def _send_packet(item: _SendItem) -> Packet:
+    return item[1]
+
+
+def _send_key(item: _SendItem) -> Hashable:
+    return type(item[1]), item[0].name
+
+
+def _send_coalesce(queued: _SendItem, item: _SendItem) -> _SendItem:
+    return item[0], merge_packets(queued[1], item[1])
+
+
+def _rtt_timeout(member: Member) -> Optional[float]:
+    rtt = member.rtt
+    if rtt is None:
+        return None
+    return rtt + _rtt_deviations * member.rtt_deviation
+
+
+def _wait_timeout(waiter: Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class _Probe:
+
+    __slots__ = ('seq', 'indirect_seq', 'target', 'sent', 'acked', 'waiter')
+
+    def __init__(self, seq: int, target: Member, sent: float) -> None:
+        super().__init__()
+        self.seq: Final = seq
+        self.indirect_seq: Optional[int] = None
+        self.target: Final = target
+        self.sent: Final = sent
+        self.acked = False
+        self.waiter: Optional[Future[None]] = None
+
 
 class Worker(DaemonTask, TaskOwner):
     """Manages the failure detection and dissemination components of the SWIM
@@ -34,122 +99,334 @@ class Worker(DaemonTask, TaskOwner):
         super().__init__()
         self.config: Final = config
         self.members: Final = members
-        self._recv_queue: Queue[Packet] = Queue()
-        self._send_queue: Queue[tuple[Member, Packet]] = Queue()
-        self._waiting: WeakKeyDictionary[Member, WeakSet[Event]] = \
+        self._recv_queue: PacketQueue[Packet] = PacketQueue(
+            _recv_packet, _recv_key, _recv_coalesce,
+            probe_size=config.probe_queue_size,
+            probe_policy=config.probe_queue_policy,
+            gossip_size=config.gossip_queue_size,
+            gossip_policy=config.gossip_queue_policy)
+        self._send_queue: PacketQueue[_SendItem] = PacketQueue(
+            _send_packet, _send_key, _send_coalesce,
+            probe_size=config.probe_queue_size,
+            probe_policy=config.probe_queue_policy,
+            gossip_size=config.gossip_queue_size,
+            gossip_policy=config.gossip_queue_policy)
+        self._scheduler = Scheduler()
+        self._seq = count(1)
+        self._probes: dict[int, _Probe] = {}
+        self._forwarding: dict[int, tuple[Member, Member, int, Timer]] = {}
+        self._suspect: WeakKeyDictionary[Member, Timer] = \
             WeakKeyDictionary()
-        self._listening: WeakKeyDictionary[Member, WeakSet[Member]] = \
+        self._gossip_cache: WeakKeyDictionary[
+            Member, tuple[MemberSnapshot, dict[int, GossipRecord]]] = \
             WeakKeyDictionary()
-        self._suspect: WeakKeyDictionary[Member, Task[None]] = \
+        self._reconnect: WeakKeyDictionary[Member, tuple[float, Timer]] = \
             WeakKeyDictionary()
 
     @property
-    def recv_queue(self) -> Queue[Packet]:
-        """The queue of packets received."""
+    def recv_queue(self) -> PacketQueue[Packet]:
+        """The bounded, prioritized queue of packets received."""
         return self._recv_queue
 
     @property
-    def send_queue(self) -> Queue[tuple[Member, Packet]]:
-        """The queue of packets to be sent."""
+    def send_queue(self) -> PacketQueue[tuple[Member, Packet]]:
+        """The bounded, prioritized queue of packets to be sent."""
         return self._send_queue
 
     async def _send(self, target: Member, packet: Packet) -> None:
         await self._send_queue.put((target, packet))
 
-    def _add_waiting(self, member: Member, event: Event) -> None:
-        waiting = self._waiting.get(member)
-        if waiting is None:
-            self._waiting[member] = waiting = WeakSet()
-        waiting.add(event)
-
-    def _add_listening(self, member: Member, target: Member) -> None:
-        listening = self._listening.get(target)
-        if listening is None:
-            self._listening[target] = listening = WeakSet()
-        listening.add(member)
-
-    def _notify_waiting(self, member: Member) -> None:
-        waiting = self._waiting.get(member)
-        if waiting is not None:
-            for event in waiting:
-                event.set()
-
-    def _get_listening(self, member: Member) -> Sequence[Member]:
-        listening = self._listening.pop(member, None)
-        if listening is not None:
-            return list(listening)
-        else:
-            return []
+    @contextmanager
+    def _probe(self, target: Member) -> Iterator[_Probe]:
+        seq = next(self._seq)
+        now = asyncio.get_running_loop().time()
+        probes = self._probes
+        probes[seq] = probe = _Probe(seq, target, now)
+        try:
+            yield probe
+        finally:
+            del probes[seq]
+            if probe.indirect_seq is not None:
+                del probes[probe.indirect_seq]
+
+    def _indirect_seq(self, probe: _Probe) -> int:
+        # acks forwarded by a ping-req say nothing about the direct rtt
+        if probe.indirect_seq is None:
+            probe.indirect_seq = seq = next(self._seq)
+            self._probes[seq] = probe
+        return probe.indirect_seq
+
+    def _ping_timeout(self, target: Member) -> float:
+        config = self.config
+        timeout = _rtt_timeout(target)
+        if timeout is None:
+            return config.ping_timeout
+        return min(max(timeout, config.ping_min_timeout),
+                   config.ping_max_timeout)
+
+    def _ping_req_timeout(self, target: Member,
+                          indirects: Set[Member]) -> float:
+        config = self.config
+        target_timeout = _rtt_timeout(target)
+        if target_timeout is None:
+            return config.ping_req_timeout
+        indirect_timeout = 0.0
+        for indirect in indirects:
+            timeout = _rtt_timeout(indirect)
+            if timeout is None:
+                return config.ping_req_timeout
+            indirect_timeout = max(indirect_timeout, timeout)
+        timeout = _ping_req_factor * (target_timeout + indirect_timeout)
+        return min(max(timeout, config.ping_req_min_timeout),
+                   config.ping_req_max_timeout)
+
+    async def _wait(self, probe: _Probe, timeout: float) -> bool:
+        if not probe.acked:
+            probe.waiter = waiter = \
+                asyncio.get_running_loop().create_future()
+            timer = self._scheduler.call_later(timeout, _wait_timeout, waiter)
+            try:
+                await waiter
+            finally:
+                timer.cancel()
+                probe.waiter = None
+        return probe.acked
+
+    def _forward(self, requester: Member, target: Member,
+                 requester_seq: int) -> int:
+        config = self.config
+        seq = next(self._seq)
+        timeout = max(config.ping_req_timeout, config.ping_req_max_timeout)
+        timer = self._scheduler.call_later(
+            timeout, self._forwarding.pop, seq, None)
+        self._forwarding[seq] = (target, requester, requester_seq, timer)
+        return seq
+
+    def _handle_ack(self, source: Member, seq: int) \
+            -> Optional[tuple[Member, int]]:
+        probe = self._probes.get(seq)
+        if probe is not None and probe.target is source:
+            if seq == probe.seq and not probe.acked:
+                now = asyncio.get_running_loop().time()
+                self.members.add_rtt(source, now - probe.sent)
+            probe.acked = True
+            if probe.waiter is not None and not probe.waiter.done():
+                probe.waiter.set_result(None)
+            return None
+        forwarding = self._forwarding.get(seq)
+        if forwarding is not None and forwarding[0] is source:
+            del self._forwarding[seq]
+            forwarding[3].cancel()
+            return forwarding[1], forwarding[2]
+        return None
 
     async def _run_handler(self) -> NoReturn:
-        local = self.members.local
+        loop = asyncio.get_running_loop()
         while True:
             packet = await self.recv_queue.get()
-            source = self.members.get(packet.source.name,
-                                      packet.source.validity)
-            self._notify_waiting(source)
-            for target in self._get_listening(source):
-                await self._send(target, Ack(source=source.source))
-
-            if isinstance(packet, Ping):
-                await self._send(source, Ack(source=local.source))
-            elif isinstance(packet, PingReq):
-                target = self.members.get(packet.target)
-                await self._send(target, Ping(source=local.source))
-                self._add_listening(source, target)
-            elif isinstance(packet, Gossip):
-                member = self.members.get(packet.name)
-                ack = self._apply_gossip(local, source, member, packet)
-                await self._send(source, ack)
-            elif isinstance(packet, GossipAck):
-                member = self.members.get(packet.name)
-                self.members.ack_gossip(member, source, packet.clock)
-
-    def _build_gossip(self, local: Member, member: Member) -> Gossip:
+            try:
+                await self._handle_packet(packet)
+            except Exception as exc:
+                loop.call_exception_handler({
+                    'message': 'Exception handling received packet',
+                    'exception': exc})
+
+    async def _handle_packet(self, packet: Packet) -> None:
+        local = self.members.local
+        source = self.members.get(packet.source.name, packet.source.validity)
+        if source.status == Status.OFFLINE:
+            self._schedule_reconnect(source, immediate=True)
+        gossip_acks = self._apply_gossip(source, packet.gossip)
+        self._ack_gossip(source, packet.gossip_acks)
+
+        if isinstance(packet, Ping):
+            await self._send(source, Ack(
+                source=local.source, seq=packet.seq,
+                gossip=self._get_gossip(source),
+                gossip_acks=gossip_acks))
+            return
+        elif isinstance(packet, PingReq):
+            target = self.members.get(packet.target)
+            self._refresh_reconnect(target)
+            seq = self._forward(source, target, packet.seq)
+            await self._send(target, Ping(
+                source=local.source, seq=seq,
+                gossip=self._get_gossip(target)))
+        elif isinstance(packet, Ack):
+            forward = self._handle_ack(source, packet.seq)
+            if forward is not None:
+                requester, requester_seq = forward
+                await self._send(requester, Ack(
+                    source=source.source, seq=requester_seq))
+        if gossip_acks:
+            await self._send(source, GossipAck(
+                source=local.source, gossip_acks=gossip_acks))
+
+    def _build_gossip(self, member: Member, known_clock: int) -> GossipRecord:
         if member.metadata is Member.METADATA_UNKNOWN:
-            metadata: Optional[Mapping[str, bytes]] = None
-        else:
-            metadata = member.metadata
-        return Gossip(source=local.source, name=member.name,
-                      clock=member.clock, status=member.status,
-                      metadata=metadata)
-
-    def _apply_gossip(self, local: Member, source: Member, member: Member,
-                      gossip: Gossip) -> GossipAck:
-        self._handle_status(member, gossip.status)
-        self.members.apply(member, source, gossip.clock,
-                           status=gossip.status,
-                           metadata=gossip.metadata)
-        return GossipAck(source=local.source, name=gossip.name,
-                         clock=gossip.clock)
-
-    async def _wait(self, target: Member, timeout: float) -> bool:
-        event = Event()
-        self._add_waiting(target, event)
-        with suppress(TimeoutError):
-            await asyncio.wait_for(event.wait(), timeout)
-        return event.is_set()
+            return GossipRecord(name=member.name, clock=member.clock,
+                                status=member.status, metadata=None,
+                                tombstone=member.tombstone)
+        elif known_clock > 0:
+            since = member.metadata_since(known_clock)
+            if since is not None:
+                changed, removed = since
+                return GossipRecord(name=member.name, clock=member.clock,
+                                    status=member.status, metadata=changed,
+                                    base_clock=known_clock,
+                                    removed=tuple(sorted(removed)),
+                                    tombstone=member.tombstone)
+        return GossipRecord(name=member.name, clock=member.clock,
+                            status=member.status, metadata=member.metadata,
+                            tombstone=member.tombstone)
+
+    def _get_cached_gossip(self, target: Member,
+                           member: Member) -> GossipRecord:
+        # A new previous snapshot is created every time the member changes.
+        previous = member.previous
+        cached = self._gossip_cache.get(member)
+        if cached is None or cached[0] is not previous:
+            cached = (previous, {})
+            self._gossip_cache[member] = cached
+        records = cached[1]
+        known_clock = self.members.get_known_clock(target, member)
+        record = records.get(known_clock)
+        if record is None:
+            if len(records) >= _gossip_cache_size:
+                records.clear()
+            records[known_clock] = record = \
+                self._build_gossip(member, known_clock)
+        return record
+
+    def _get_gossip(self, target: Member) -> Sequence[GossipRecord]:
+        return [self._get_cached_gossip(target, member)
+                for member in self.members.get_gossip(target)]
+
+    def _apply_gossip(self, source: Member,
+                      gossip: Sequence[GossipRecord]) -> Mapping[str, int]:
+        gossip_acks: dict[str, int] = {}
+        for record in gossip:
+            if record.tombstone and self.members.lookup(record.name) is None:
+                # avoid re-creating a member that was already removed
+                gossip_acks[record.name] = record.clock
+                continue
+            member = self.members.get(record.name)
+            if record.metadata is not None and record.base_clock is not None:
+                # acknowledging an older clock requests a new delta
+                if member.metadata is Member.METADATA_UNKNOWN:
+                    gossip_acks[record.name] = 0
+                    continue
+                elif member.clock < record.base_clock:
+                    gossip_acks[record.name] = member.clock
+                    continue
+            self._handle_status(member, record.status)
+            self.members.apply(member, source, record.clock,
+                               status=record.status,
+                               metadata=record.metadata,
+                               base_clock=record.base_clock,
+                               removed=record.removed,
+                               tombstone=record.tombstone)
+            self._refresh_reconnect(member)
+            if member.local or member.removed \
+                    or member.clock >= record.clock:
+                gossip_acks[record.name] = record.clock
+            else:
+                # only acknowledge the clock that was actually applied
+                gossip_acks[record.name] = member.clock
+        return gossip_acks
+
+    def _ack_gossip(self, source: Member,
+                    gossip_acks: Mapping[str, int]) -> None:
+        for name, clock in gossip_acks.items():
+            member = self.members.lookup(name)
+            if member is not None:
+                self.members.ack_gossip(member, source, clock)
 
     def _handle_status(self, target: Member, status: Status) -> None:
         if status == Status.SUSPECT:
-            suspect_task = self._suspect.get(target)
-            if suspect_task is None:
-                self._suspect[target] = asyncio.create_task(
-                    self._suspect_wait(target))
+            if target not in self._suspect:
+                self._suspect[target] = self._scheduler.call_later(
+                    self.config.suspect_timeout, self._suspect_timeout,
+                    target)
         else:
-            suspect_task = self._suspect.pop(target, None)
-            if suspect_task is not None:
-                suspect_task.cancel()
+            suspect_timer = self._suspect.pop(target, None)
+            if suspect_timer is not None:
+                suspect_timer.cancel()
 
-    async def _suspect_wait(self, target: Member) -> None:
-        await asyncio.sleep(self.config.suspect_timeout)
+    def _suspect_timeout(self, target: Member) -> None:
+        if target.removed:
+            return
         self.members.update(target, new_status=Status.OFFLINE)
         _ = self._suspect.pop(target, None)
+        self._refresh_reconnect(target)
+
+    def _schedule_reconnect(self, target: Member, *,
+                            immediate: bool = False) -> None:
+        config = self.config
+        scheduled = self._reconnect.get(target)
+        if immediate:
+            if scheduled is not None and scheduled[1].when <= \
+                    asyncio.get_running_loop().time():
+                return
+            interval, delay = config.reconnect_interval, 0.0
+        elif scheduled is None:
+            interval = delay = config.reconnect_interval
+        else:
+            interval = delay = min(scheduled[0] * 2.0,
+                                   config.reconnect_max_interval)
+        if scheduled is not None:
+            scheduled[1].cancel()
+        self._reconnect[target] = (interval, self._scheduler.call_later(
+            delay, self._reconnect_timeout, target))
+
+    def _refresh_reconnect(self, target: Member) -> None:
+        if target.status != Status.OFFLINE:
+            scheduled = self._reconnect.pop(target, None)
+            if scheduled is not None:
+                scheduled[1].cancel()
+        elif target not in self._reconnect:
+            self._schedule_reconnect(target)
+
+    def _reconnect_timeout(self, target: Member) -> None:
+        if target.removed:
+            return
+        elif target.status != Status.OFFLINE:
+            _ = self._reconnect.pop(target, None)
+        else:
+            self.run_subtask(self.reconnect(target))
+
+    @final
+    async def reconnect(self, target: Member) -> None:
+        """Attempts to determine if the :term:`offline` *target* is
+        responding again, sending a single :term:`ping` with no
+        :term:`gossip`. If *target* does not respond with an :term:`ack`,
+        the next attempt is scheduled after twice the previous interval, up
+        to the :class:`reconnect_max_interval
+        <swimprotocol.config.BaseConfig>`.
+
+        See Also:
+            :ref:`Failure Detection`
+
+        Args:
+            target: The cluster member to check.
+
+        """
+        local = self.members.local
+        with self._probe(target) as probe:
+            await self._send(target, Ping(source=local.source, seq=probe.seq))
+            online = await self._wait(probe, self._ping_timeout(target))
+        if online:
+            self._handle_status(target, Status.ONLINE)
+            self.members.update(target, new_status=Status.ONLINE)
+            self._refresh_reconnect(target)
+        else:
+            self._schedule_reconnect(target)
 
     @final
     async def check(self, target: Member) -> None:
         """Attempts to determine if *target* is responding, setting it to
-        :term:`suspect` if it does not respond with an :term:`ack`.
+        :term:`suspect` if it does not respond with an :term:`ack`. Any
+        :term:`gossip` needed by the recipients is included in the packets.
 
         See Also:
             :ref:`Failure Detection`
@@ -159,25 +436,36 @@ class Worker(DaemonTask, TaskOwner):
 
         """
         local = self.members.local
-        await self._send(target, Ping(source=local.source))
-        online = await self._wait(target, self.config.ping_timeout)
-        if not online:
-            count = self.config.ping_req_count
-            indirects = self.members.find(
-                count, status=Status.AVAILABLE, exclude={target})
-            if indirects:
-                ping_req = PingReq(source=local.source, target=target.name)
-                await asyncio.wait([
-                    asyncio.create_task(self._send(indirect, ping_req))
-                    for indirect in indirects])
-                online = await self._wait(target, self.config.ping_req_timeout)
+        with self._probe(target) as probe:
+            await self._send(target, Ping(source=local.source, seq=probe.seq,
+                                          gossip=self._get_gossip(target)))
+            online = await self._wait(probe, self._ping_timeout(target))
+            if not online:
+                indirects = self.members.find(
+                    self.config.ping_req_count, status=Status.AVAILABLE,
+                    exclude={target})
+                if indirects:
+                    seq = self._indirect_seq(probe)
+                    await asyncio.wait([
+                        asyncio.create_task(self._send(indirect, PingReq(
+                            source=local.source, target=target.name,
+                            seq=seq, gossip=self._get_gossip(indirect))))
+                        for indirect in indirects])
+                    online = await self._wait(probe, self._ping_req_timeout(
+                        target, indirects))
         new_status = Status.ONLINE if online else Status.SUSPECT
         self._handle_status(target, new_status)
         self.members.update(target, new_status=new_status)
+        self._refresh_reconnect(target)
 
     @final
     async def disseminate(self, target: Member) -> None:
-        """Sends any :term:`gossip` that might be needed by *target*.
+        """Sends any :term:`gossip` that might be needed by *target*, as a
+        single :class:`~swimprotocol.packet.Gossip` packet. The transport may
+        split the packet as necessary.
+
+        Because gossip is also included in the packets sent by :meth:`.check`,
+        this is only necessary to speed up dissemination.
 
         See Also:
             :ref:`Dissemination`
@@ -187,9 +475,10 @@ class Worker(DaemonTask, TaskOwner):
 
         """
         local = self.members.local
-        for member in self.members.get_gossip(target):
-            packet = self._build_gossip(local, member)
-            await self._send(target, packet)
+        gossip = self._get_gossip(target)
+        if gossip:
+            await self._send(target, Gossip(source=local.source,
+                                            gossip=gossip))
 
     async def run_failure_detection(self) -> NoReturn:
         """Indefinitely send failure detection packets to other cluster
@@ -198,15 +487,23 @@ class Worker(DaemonTask, TaskOwner):
         .. note::
 
            Override this method to control when and how :meth:`.check` is
-           called. By default, one random cluster member is chosen every
-           :class:`ping_interval <swimprotocol.config.Config>` seconds.
+           called. By default, one :term:`online` or :term:`suspect` cluster
+           member is chosen every
+           :class:`ping_interval <swimprotocol.config.Config>` seconds,
+           according to the
+           :class:`probe_strategy <swimprotocol.config.Config>`.
+           :term:`Offline <offline>` members are checked separately, by
+           :meth:`.reconnect`.
 
         """
+        available = self.members.get_status(Status.AVAILABLE)
+        if self.config.probe_strategy is ProbeStrategy.ROUND_ROBIN:
+            choose = available.deal
+        else:
+            choose = available.choice
         while True:
-            targets = self.members.find(1)
-            assert targets
-            for target in targets:
-                self.run_subtask(self.check(target))
+            if available:
+                self.run_subtask(self.check(choose()))
             await asyncio.sleep(self.config.ping_interval)
 
     async def run_dissemination(self) -> NoReturn:
@@ -225,6 +522,30 @@ class Worker(DaemonTask, TaskOwner):
                 self.run_subtask(self.disseminate(target))
             await asyncio.sleep(self.config.sync_interval)
 
+    def _reap(self) -> None:
+        try:
+            self.members.reap()
+        finally:
+            self._forget_removed()
+            self._scheduler.call_later(self.config.ping_interval, self._reap)
+
+    def _forget_removed(self) -> None:
+        # members are equal by name, so the entries of a removed member would
+        # be found by a new member with the same name
+        suspect = self._suspect
+        for member, timer in list(suspect.items()):
+            if member.removed:
+                timer.cancel()
+                del suspect[member]
+        reconnect = self._reconnect
+        for member, (_, timer) in list(reconnect.items()):
+            if member.removed:
+                timer.cancel()
+                del reconnect[member]
+        gossip_cache = self._gossip_cache
+        for member in [member for member in gossip_cache if member.removed]:
+            del gossip_cache[member]
+
     @final
     async def run(self) -> NoReturn:
         """Indefinitely handle received SWIM protocol packets and, at
@@ -233,8 +554,14 @@ class Worker(DaemonTask, TaskOwner):
         :meth:`.run_dissemination`.
 
         """
-        await asyncio.gather(
-            self._run_handler(),
-            self.run_failure_detection(),
-            self.run_dissemination())
+        for member in self.members.get_status(Status.OFFLINE):
+            self._schedule_reconnect(member, immediate=True)
+        self._scheduler.call_later(self.config.ping_interval, self._reap)
+        try:
+            await asyncio.gather(
+                self._run_handler(),
+                self.run_failure_detection(),
+                self.run_dissemination())
+        finally:
+            self._scheduler.close()
         raise RuntimeError()
@@ -0,0 +1,197 @@
+
+from __future__ import annotations
+
+from unittest import TestCase
+
+from swimprotocol.config import BaseConfig
+from swimprotocol.members import Members
+from swimprotocol.status import Status
+
+
+class TestMembers(TestCase):
+
+    def _config(self) -> BaseConfig:
+        return BaseConfig(secret=None, local_name='local',
+                          peers=['peer1', 'peer2'],
+                          local_metadata={'one': b'1', 'two': b'2'})
+
+    def test_metadata_since(self) -> None:
+        members = Members(self._config())
+        local = members.local
+        clock = local.clock
+        self.assertEqual(({'one': b'1', 'two': b'2'}, set()),
+                         local.metadata_since(0))
+        self.assertEqual(({}, set()), local.metadata_since(clock))
+        members.update(local, new_metadata={'one': b'1', 'three': b'3'})
+        self.assertEqual(({'three': b'3'}, {'two'}),
+                         local.metadata_since(clock))
+        self.assertEqual(({'one': b'1', 'three': b'3'}, {'two'}),
+                         local.metadata_since(0))
+
+    def test_add_rtt(self) -> None:
+        members = Members(self._config())
+        peer = members.get('peer1')
+        self.assertIsNone(peer.rtt)
+        members.add_rtt(peer, 0.2)
+        self.assertAlmostEqual(0.2, peer.rtt or 0.0)
+        self.assertAlmostEqual(0.1, peer.rtt_deviation)
+        for _ in range(100):
+            members.add_rtt(peer, 0.1)
+        self.assertAlmostEqual(0.1, peer.rtt or 0.0, places=4)
+        self.assertAlmostEqual(0.0, peer.rtt_deviation, places=4)
+
+    def test_previous(self) -> None:
+        members = Members(self._config())
+        local = members.local
+        previous = local.previous
+        members.update(local, new_metadata={'one': b'1', 'two': b'2'})
+        self.assertIs(previous, local.previous)
+        members.update(local, new_metadata={'one': b'1'})
+        self.assertEqual({'one': b'1', 'two': b'2'}, local.previous.metadata)
+        self.assertEqual({'one': b'1'}, local.metadata)
+
+    def test_statuses(self) -> None:
+        members = Members(self._config())
+        peer1 = members.get('peer1')
+        peer2 = members.get('peer2')
+        self.assertEqual({peer1, peer2}, set(members.get_status(Status.ALL)))
+        self.assertEqual({peer1, peer2},
+                         set(members.get_status(Status.OFFLINE)))
+        self.assertEqual(set(), set(members.get_status(Status.AVAILABLE)))
+        members.apply(peer1, peer1, 10, status=Status.ONLINE, metadata={})
+        self.assertEqual({peer1}, set(members.get_status(Status.ONLINE)))
+        self.assertEqual({peer1}, set(members.get_status(Status.AVAILABLE)))
+        self.assertEqual({peer2}, set(members.get_status(Status.OFFLINE)))
+        members.update(peer1, new_status=Status.OFFLINE)
+        self.assertEqual({peer1}, set(members.get_status(Status.SUSPECT)))
+        self.assertEqual({peer1}, set(members.get_status(Status.AVAILABLE)))
+        self.assertEqual({peer1, peer2},
+                         set(members.get_status(Status.UNAVAILABLE)))
+        self.assertEqual(set(), set(members.get_status(Status.ONLINE)))
+        self.assertEqual({peer1, peer2}, set(members.get_status(Status.ALL)))
+
+    def test_reap(self) -> None:
+        config = BaseConfig(secret=None, local_name='local',
+                            peers=['peer1'], offline_ttl=0.0,
+                            tombstone_retention=0.0)
+        members = Members(config)
+        peer1 = members.get('peer1')
+        peer2 = members.get('peer2')
+        peer3 = members.get('peer3')
+        members.apply(peer2, peer2, 5, status=Status.OFFLINE, metadata={})
+        members.apply(peer3, peer3, 10, status=Status.ONLINE, metadata={})
+        members.reap()
+        self.assertFalse(peer1.tombstone)
+        self.assertTrue(peer2.tombstone)
+        self.assertFalse(peer3.tombstone)
+        self.assertIn(peer2, list(members.get_gossip(peer3)))
+        members.reap()
+        self.assertTrue(peer2.removed)
+        self.assertEqual({peer1, peer3}, set(members.non_local))
+        self.assertEqual({peer1}, set(members.get_status(Status.OFFLINE)))
+        self.assertIsNone(members.lookup('peer2'))
+        self.assertNotIn(peer2, list(members.get_gossip(peer3)))
+        self.assertFalse(members.get('peer2').tombstone)
+
+    def test_tombstone_cleared(self) -> None:
+        members = Members(self._config())
+        peer1 = members.get('peer1')
+        members.apply(peer1, peer1, 10, status=Status.OFFLINE, metadata={},
+                      tombstone=True)
+        self.assertTrue(peer1.tombstone)
+        members.apply(peer1, peer1, 11, status=Status.ONLINE, metadata={},
+                      tombstone=True)
+        self.assertFalse(peer1.tombstone)
+
+    def test_get_gossip_metadata_without_clock(self) -> None:
+        members = Members(self._config())
+        local = members.local
+        peer1 = members.get('peer1')
+        peer2 = members.get('peer2')
+        for i in range(10):
+            members.update(local, new_metadata={'one': b'%d' % i})
+        members.update(peer2, new_status=Status.ONLINE)
+        self.assertGreater(peer2.clock, 3)
+        members.ack_gossip(local, peer1, local.clock)
+        self.assertEqual([], list(members.get_gossip(peer1)))
+        members.apply(peer2, peer2, 3, status=Status.ONLINE,
+                      metadata={'two': b'2'})
+        self.assertEqual({'two': b'2'}, peer2.metadata)
+        self.assertIn(peer2, list(members.get_gossip(peer1)))
+
+    def test_get_gossip_changed_again(self) -> None:
+        for clock in (5, 6):
+            members = Members(self._config())
+            local = members.local
+            peer1 = members.get('peer1')
+            peer3 = members.get('peer3')
+            members.apply(peer3, peer3, 5, status=Status.ONLINE,
+                          metadata={'one': b'1'})
+            self.assertEqual([peer3, local],
+                             list(members.get_gossip(peer1)))
+            members.apply(peer3, peer3, clock, status=Status.ONLINE,
+                          metadata={'one': b'2'})
+            members.ack_gossip(local, peer1, local.clock)
+            self.assertEqual([peer3], list(members.get_gossip(peer1)))
+            self.assertEqual(0, members.get_known_clock(peer1, peer3))
+            self.assertEqual([peer3], list(members.get_gossip(peer1)))
+            members.ack_gossip(peer3, peer1, clock)
+            self.assertEqual([], list(members.get_gossip(peer1)))
+            members.apply(peer3, peer3, 7, status=Status.ONLINE,
+                          metadata={'one': b'3'})
+            self.assertEqual([peer3], list(members.get_gossip(peer1)))
+            self.assertEqual(clock, members.get_known_clock(peer1, peer3))
+
+    def test_get_gossip(self) -> None:
+        members = Members(self._config())
+        local = members.local
+        peer1 = members.get('peer1')
+        self.assertEqual([local], list(members.get_gossip(peer1)))
+        self.assertEqual(0, members.get_known_clock(peer1, local))
+        members.ack_gossip(local, peer1, local.clock)
+        self.assertEqual(local.clock,
+                         members.get_known_clock(peer1, local))
+        self.assertEqual([], list(members.get_gossip(peer1)))
+        members.ack_gossip(local, peer1, 0)
+        self.assertEqual([local], list(members.get_gossip(peer1)))
+        members.ack_gossip(local, peer1, local.clock)
+        self.assertEqual([], list(members.get_gossip(peer1)))
+        members.update(local, new_metadata={'one': b'2'})
+        self.assertEqual([local], list(members.get_gossip(peer1)))
+        members.ack_gossip(local, peer1, local.clock)
+        members.get('peer1', b'new validity')
+        self.assertEqual([local], list(members.get_gossip(peer1)))
+
+    def test_get_gossip_order(self) -> None:
+        members = Members(self._config())
+        local = members.local
+        peer1 = members.get('peer1')
+        peer2 = members.get('peer2')
+        members.apply(peer2, peer2, 10, status=Status.ONLINE, metadata={})
+        members.ack_gossip(local, peer1, local.clock)
+        self.assertEqual([peer2], list(members.get_gossip(peer1)))
+        members.ack_gossip(peer2, peer1, peer2.clock)
+        self.assertEqual([], list(members.get_gossip(peer1)))
+        members.update(local, new_metadata={})
+        members.apply(peer2, peer2, 11, status=Status.ONLINE,
+                      metadata={'one': b'1'})
+        self.assertEqual([peer2, local], list(members.get_gossip(peer1)))
+
+    def test_known_clocks(self) -> None:
+        members = Members(self._config())
+        local = members.local
+        peer1 = members.get('peer1')
+        peer2 = members.get('peer2')
+        members.apply(peer2, peer2, 10, status=Status.ONLINE, metadata={})
+        members.ack_gossip(local, peer1, local.clock)
+        members.ack_gossip(peer2, peer1, peer2.clock)
+        self.assertEqual([], list(members.get_gossip(peer1)))
+        self.assertEqual({}, peer1._known_clocks)
+        self.assertEqual(10, members.get_known_clock(peer1, peer2))
+        members.ack_gossip(local, peer1, 0)
+        self.assertEqual([local], list(members.get_gossip(peer1)))
+        self.assertEqual(0, members.get_known_clock(peer1, local))
+        self.assertEqual(10, members.get_known_clock(peer1, peer2))
+        members.apply(peer2, peer2, 11, status=Status.ONLINE,
+                      metadata={'one': b'1'})
+        self.assertEqual(10, members.get_known_clock(peer1, peer2))
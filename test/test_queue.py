@@ -0,0 +1,80 @@
+
+from __future__ import annotations
+
+from asyncio import QueueEmpty
+from unittest import TestCase
+
+from swimprotocol.packet import Source, GossipRecord, Packet, Ping, Ack, \
+    Gossip, GossipAck
+from swimprotocol.queue import DropPolicy, Priority, merge_packets, \
+    PacketQueue
+from swimprotocol.status import Status
+
+_source = Source('127.0.0.1:2001', b'validity')
+_other = Source('127.0.0.1:2002', b'validity')
+
+
+def _record(name: str, clock: int) -> GossipRecord:
+    return GossipRecord(name=name, clock=clock, status=Status.ONLINE,
+                        metadata={})
+
+
+class TestPacketQueue(TestCase):
+
+    def _queue(self, **kwargs: DropPolicy) -> PacketQueue[Packet]:
+        return PacketQueue(lambda packet: packet,
+                           lambda packet: (type(packet), packet.source),
+                           merge_packets, probe_size=2, gossip_size=2,
+                           **kwargs)
+
+    def test_priority(self) -> None:
+        queue = self._queue()
+        gossip = Gossip(source=_source, gossip=(_record('one', 1),))
+        ping = Ping(source=_source)
+        ack = Ack(source=_source)
+        for packet in (gossip, ping, ack):
+            self.assertTrue(queue.put_nowait(packet))
+        self.assertEqual(3, queue.qsize())
+        self.assertEqual(2, queue.depth(Priority.PROBE))
+        self.assertEqual(1, queue.depth(Priority.GOSSIP))
+        self.assertEqual([ping, ack, gossip],
+                         [queue.get_nowait() for _ in range(3)])
+        self.assertTrue(queue.empty())
+        with self.assertRaises(QueueEmpty):
+            queue.get_nowait()
+
+    def test_drop_oldest(self) -> None:
+        queue = self._queue(probe_policy=DropPolicy.DROP_OLDEST)
+        packets = [Ping(source=_source), Ack(source=_source),
+                   Ping(source=_other)]
+        for packet in packets:
+            self.assertTrue(queue.put_nowait(packet))
+        self.assertEqual(1, queue.dropped(Priority.PROBE))
+        self.assertEqual(packets[1:], [queue.get_nowait() for _ in range(2)])
+
+    def test_drop_newest(self) -> None:
+        queue = self._queue(probe_policy=DropPolicy.DROP_NEWEST)
+        packets = [Ping(source=_source), Ack(source=_source),
+                   Ping(source=_other)]
+        self.assertEqual([True, True, False],
+                         [queue.put_nowait(packet) for packet in packets])
+        self.assertEqual(1, queue.dropped(Priority.PROBE))
+        self.assertEqual(packets[:2], [queue.get_nowait() for _ in range(2)])
+
+    def test_coalesce(self) -> None:
+        queue = self._queue(gossip_policy=DropPolicy.COALESCE)
+        queue.put_nowait(Gossip(source=_source, gossip=(
+            _record('one', 2), _record('two', 1))))
+        queue.put_nowait(GossipAck(source=_source, gossip_acks={'one': 5}))
+        queue.put_nowait(Gossip(source=_source, gossip=(
+            _record('one', 1), _record('three', 1))))
+        queue.put_nowait(GossipAck(source=_source, gossip_acks={'one': 3,
+                                                                'two': 1}))
+        self.assertEqual(2, queue.depth(Priority.GOSSIP))
+        self.assertEqual(2, queue.coalesced(Priority.GOSSIP))
+        self.assertEqual(0, queue.dropped(Priority.GOSSIP))
+        self.assertEqual(Gossip(source=_source, gossip=(
+            _record('one', 2), _record('two', 1), _record('three', 1))),
+            queue.get_nowait())
+        self.assertEqual(GossipAck(source=_source, gossip_acks={
+            'one': 5, 'two': 1}), queue.get_nowait())
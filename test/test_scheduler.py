@@ -0,0 +1,55 @@
+
+from __future__ import annotations
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from swimprotocol.scheduler import Scheduler
+
+
+class TestScheduler(IsolatedAsyncioTestCase):
+
+    async def test_call_later(self) -> None:
+        scheduler = Scheduler()
+        called: list[int] = []
+        scheduler.call_later(0.02, called.append, 2)
+        scheduler.call_later(0.01, called.append, 1)
+        scheduler.call_later(0.03, called.append, 3)
+        self.assertEqual(3, len(scheduler))
+        await asyncio.sleep(0.05)
+        self.assertEqual([1, 2, 3], called)
+        self.assertEqual(0, len(scheduler))
+
+    async def test_cancel(self) -> None:
+        scheduler = Scheduler()
+        called: list[int] = []
+        timer = scheduler.call_later(0.01, called.append, 1)
+        scheduler.call_later(0.02, called.append, 2)
+        timer.cancel()
+        timer.cancel()
+        self.assertTrue(timer.cancelled)
+        self.assertEqual(1, len(scheduler))
+        await asyncio.sleep(0.03)
+        self.assertEqual([2], called)
+
+    async def test_cancel_many(self) -> None:
+        scheduler = Scheduler()
+        called: list[int] = []
+        timers = [scheduler.call_later(0.01, called.append, i)
+                  for i in range(200)]
+        for timer in timers[:150]:
+            timer.cancel()
+        self.assertEqual(50, len(scheduler))
+        self.assertLess(len(scheduler._heap), 200)
+        await asyncio.sleep(0.02)
+        self.assertEqual(list(range(150, 200)), called)
+
+    async def test_close(self) -> None:
+        scheduler = Scheduler()
+        called: list[int] = []
+        timer = scheduler.call_later(0.01, called.append, 1)
+        scheduler.close()
+        self.assertTrue(timer.cancelled)
+        self.assertEqual(0, len(scheduler))
+        await asyncio.sleep(0.02)
+        self.assertEqual([], called)
@@ -71,3 +71,61 @@ class TestWeakShuffle(TestCase):
         self.assertEqual(0, len(shuffle))
         self.assertEqual(set(), set(shuffle))
         self.assertRaises(KeyError, shuffle.choice)
+
+    def test_discard_first(self) -> None:
+        vals = [_T(), _T(), _T()]
+        shuffle = WeakShuffle(vals)
+        shuffle.discard(vals[0])
+        shuffle.discard(vals[2])
+        self.assertEqual(1, len(shuffle))
+        for _ in range(100):
+            self.assertIs(vals[1], shuffle.choice())
+
+    def test_sample(self) -> None:
+        vals = [_T() for _ in range(10)]
+        shuffle = WeakShuffle(vals)
+        self.assertEqual([], shuffle.sample(0))
+        for _ in range(100):
+            sample = shuffle.sample(3)
+            self.assertEqual(3, len(sample))
+            self.assertEqual(3, len(set(sample)))
+            self.assertTrue(set(sample) <= set(vals))
+        self.assertEqual(set(vals), set(shuffle.sample(20)))
+        self.assertEqual(10, len(shuffle))
+
+    def test_sample_exclude(self) -> None:
+        vals = [_T() for _ in range(10)]
+        shuffle = WeakShuffle(vals)
+        exclude = frozenset(vals[2:9]) | {_T()}
+        for _ in range(100):
+            sample = shuffle.sample(2, exclude)
+            self.assertEqual(2, len(set(sample)))
+            self.assertFalse(exclude & set(sample))
+        self.assertEqual({vals[0], vals[1], vals[9]},
+                         set(shuffle.sample(5, exclude)))
+        self.assertEqual([], shuffle.sample(5, frozenset(vals)))
+        shuffle.discard(vals[0])
+        self.assertEqual({vals[1], vals[9]},
+                         set(shuffle.sample(5, exclude)))
+
+    def test_deal(self) -> None:
+        vals = [_T() for _ in range(10)]
+        shuffle = WeakShuffle(vals)
+        for _ in range(10):
+            self.assertEqual(set(vals), {shuffle.deal() for _ in range(10)})
+        self.assertEqual(10, len(shuffle))
+
+    def test_deal_changed(self) -> None:
+        vals = [_T() for _ in range(10)]
+        shuffle = WeakShuffle(vals)
+        dealt = [shuffle.deal() for _ in range(5)]
+        shuffle.discard(dealt[1])
+        shuffle.discard(next(val for val in vals if val not in dealt))
+        shuffle.add(new := _T())
+        remaining = set(shuffle) - set(dealt)
+        self.assertEqual(5, len(remaining))
+        self.assertIn(new, remaining)
+        self.assertEqual(remaining, {shuffle.deal() for _ in range(5)})
+        self.assertEqual(set(shuffle), {shuffle.deal() for _ in range(9)})
+        shuffle.clear()
+        self.assertRaises(KeyError, shuffle.deal)
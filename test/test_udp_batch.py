@@ -0,0 +1,52 @@
+
+from __future__ import annotations
+
+import asyncio
+from asyncio import DatagramProtocol
+from typing import Optional
+from unittest import IsolatedAsyncioTestCase
+
+from swimprotocol.udp.batch import create_batch_endpoint
+
+
+class _Protocol(DatagramProtocol):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.received: asyncio.Queue[bytes] = asyncio.Queue()
+        self.lost = asyncio.get_running_loop().create_future()
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        self.received.put_nowait(data)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.lost.set_result(exc)
+
+
+class TestBatchTransport(IsolatedAsyncioTestCase):
+
+    async def test_sendto(self) -> None:
+        recv_transport, recv_protocol = await create_batch_endpoint(
+            _Protocol, ('127.0.0.1', 0))
+        send_transport, send_protocol = await create_batch_endpoint(
+            _Protocol, ('127.0.0.1', 0))
+        assert isinstance(recv_protocol, _Protocol)
+        assert isinstance(send_protocol, _Protocol)
+        addr = recv_transport.get_extra_info('sockname')
+        datagrams = [bytes([i]) * (100 + i) for i in range(10)]
+        try:
+            for data in datagrams:
+                send_transport.sendto(data, addr)
+            self.assertEqual(sum(len(data) for data in datagrams),
+                             send_transport.get_write_buffer_size())
+            received = [await asyncio.wait_for(
+                recv_protocol.received.get(), 1.0)
+                for _ in range(len(datagrams))]
+            self.assertEqual(datagrams, received)
+            self.assertEqual(0, send_transport.get_write_buffer_size())
+        finally:
+            recv_transport.close()
+            send_transport.close()
+        self.assertTrue(recv_transport.is_closing())
+        self.assertIsNone(await recv_protocol.lost)
+        self.assertIsNone(await send_protocol.lost)
@@ -0,0 +1,33 @@
+
+from __future__ import annotations
+
+import threading
+from unittest import IsolatedAsyncioTestCase
+
+from swimprotocol.udp.offload import Offload
+
+
+def _thread_name(data: bytes) -> tuple[int, str]:
+    return len(data), threading.current_thread().name
+
+
+class TestOffload(IsolatedAsyncioTestCase):
+
+    async def test_run(self) -> None:
+        main_thread = threading.current_thread().name
+        small, large = b'x' * 99, b'x' * 100
+        with Offload(100) as offload:
+            self.assertEqual((99, main_thread), await offload.run(
+                len(small), _thread_name, small))
+            self.assertEqual(1, offload.inline_count)
+            self.assertEqual(0, offload.offload_count)
+            size, thread_name = await offload.run(
+                len(large), _thread_name, large)
+            self.assertEqual(100, size)
+            self.assertNotEqual(main_thread, thread_name)
+            self.assertEqual(1, offload.inline_count)
+            self.assertEqual(1, offload.offload_count)
+        self.assertEqual((100, main_thread), await offload.run(
+            len(large), _thread_name, large))
+        self.assertEqual(2, offload.inline_count)
+        self.assertEqual(1, offload.offload_count)
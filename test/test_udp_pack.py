@@ -0,0 +1,225 @@
+
+from __future__ import annotations
+
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from unittest import TestCase
+
+from swimprotocol.packet import Source, GossipRecord, Packet, Ping, PingReq, \
+    Ack, Gossip, GossipAck
+from swimprotocol.sign import Signatures
+from swimprotocol.status import Status
+from swimprotocol.udp.codec import CodecError, PickleCodec, BinaryCodec, \
+    LegacyCodec
+from swimprotocol.udp.pack import UdpPack
+
+_source = Source('127.0.0.1:2001', b'validity')
+
+_records = (
+    GossipRecord(name='127.0.0.1:2003', clock=300, status=Status.SUSPECT,
+                 metadata={'one': b'1', 'two': b''}),
+    GossipRecord(name='127.0.0.1:2004', clock=0, status=Status.OFFLINE,
+                 metadata=None, tombstone=True),
+    GossipRecord(name='127.0.0.1:2005', clock=20, status=Status.ONLINE,
+                 metadata={'one': b'2'}, base_clock=0, removed=('two',)))
+
+_packets: list[Packet] = [
+    Ping(source=_source),
+    Ping(source=_source, seq=2 ** 33, gossip=_records),
+    PingReq(source=_source, target='127.0.0.1:2002', seq=5),
+    Ack(source=_source, seq=5, gossip=_records[1:],
+        gossip_acks={'127.0.0.1:2003': 300}),
+    Gossip(source=_source, gossip=_records),
+    Gossip(source=_source),
+    GossipAck(source=_source, gossip_acks={'127.0.0.1:2003': 2 ** 40,
+                                           '127.0.0.1:2004': 0})]
+
+
+
+def _legacy(packet_type: type[Any], **state: Any) -> Any:
+    # the packets of releases before 0.7.0 pickle to the same classes
+    legacy = object.__new__(packet_type)
+    legacy.__dict__.update(state)
+    return legacy
+
+
+_legacy_source = _legacy(Source, name=_source.name,
+                         validity=_source.validity)
+
+_legacy_packets: list[tuple[Any, Packet]] = [
+    (_legacy(Ping, source=_legacy_source), Ping(source=_source)),
+    (_legacy(Ack, source=_legacy_source), Ack(source=_source)),
+    (_legacy(PingReq, source=_legacy_source, target='127.0.0.1:2002'),
+     PingReq(source=_source, target='127.0.0.1:2002')),
+    (_legacy(Gossip, source=_legacy_source, name='127.0.0.1:2003',
+             clock=300, status=Status.SUSPECT, metadata={'one': b'1'}),
+     Gossip(source=_source, gossip=(GossipRecord(
+         name='127.0.0.1:2003', clock=300, status=Status.SUSPECT,
+         metadata={'one': b'1'}), ))),
+    (_legacy(GossipAck, source=_legacy_source, name='127.0.0.1:2003',
+             clock=300),
+     GossipAck(source=_source, gossip_acks={'127.0.0.1:2003': 300}))]
+
+
+class TestUdpPack(TestCase):
+
+    def test_binary(self) -> None:
+        udp_pack = UdpPack(Signatures('secret'), codec=BinaryCodec())
+        for packet in _packets:
+            packed = udp_pack.pack(packet)
+            self.assertEqual(packet, udp_pack.unpack(packed))
+
+    def test_pickle(self) -> None:
+        udp_pack = UdpPack(Signatures('secret'), codec=PickleCodec())
+        for packet in _packets:
+            packed = udp_pack.pack(packet)
+            self.assertEqual(packet, udp_pack.unpack(packed))
+
+    def test_mixed_codecs(self) -> None:
+        binary_pack = UdpPack(Signatures('secret'), codec=BinaryCodec())
+        pickle_pack = UdpPack(Signatures('secret'), codec=PickleCodec())
+        for packet in _packets:
+            self.assertEqual(packet, binary_pack.unpack(
+                pickle_pack.pack(packet)))
+            self.assertEqual(packet, pickle_pack.unpack(
+                binary_pack.pack(packet)))
+
+    def test_binary_cached(self) -> None:
+        codec = BinaryCodec(cache_size=2)
+        uncached = [BinaryCodec().encode(packet) for packet in _packets]
+        for _ in range(3):
+            encoded = [codec.encode(packet) for packet in _packets]
+            self.assertEqual(uncached, encoded)
+            for packet, data in zip(_packets, encoded):
+                self.assertEqual(packet, codec.decode(memoryview(data)))
+
+    def test_binary_smaller(self) -> None:
+        binary_pack = UdpPack(Signatures('secret'), codec=BinaryCodec())
+        pickle_pack = UdpPack(Signatures('secret'), codec=PickleCodec())
+        for packet in _packets:
+            self.assertLess(len(binary_pack.pack(packet)),
+                            len(pickle_pack.pack(packet)))
+
+    def test_compressed(self) -> None:
+        udp_pack = UdpPack(Signatures('secret'), compress_threshold=0,
+                           compress_dict=b'127.0.0.1:200')
+        plain_pack = UdpPack(Signatures('secret'))
+        for packet in _packets:
+            packed = udp_pack.pack(packet)
+            self.assertEqual(packet, udp_pack.unpack(packed))
+        packet = Gossip(source=_source, gossip=(
+            GossipRecord(name='127.0.0.1:2003', clock=1,
+                         status=Status.ONLINE, metadata={'a': b'a' * 1000}),))
+        packed = udp_pack.pack(packet)
+        self.assertLess(len(packed), len(plain_pack.pack(packet)))
+        self.assertEqual(packet, udp_pack.unpack(packed))
+        self.assertIsNone(plain_pack.unpack(packed))
+
+    def test_algorithms(self) -> None:
+        for algorithm in ('hmac-sha256', 'hmac-sha512', 'blake2b', 'blake2s'):
+            udp_pack = UdpPack(Signatures('secret', algorithm=algorithm))
+            for packet in _packets:
+                packed = udp_pack.pack(packet)
+                self.assertEqual(packet, udp_pack.unpack(packed))
+        blake2b_pack = UdpPack(Signatures('secret', algorithm='blake2b'))
+        blake2s_pack = UdpPack(Signatures('secret', algorithm='blake2s'))
+        packed = blake2b_pack.pack(Ping(source=_source))
+        self.assertIsNone(blake2s_pack.unpack(packed))
+
+    def test_frame_size(self) -> None:
+        udp_pack = UdpPack(Signatures('secret'), compress_threshold=0)
+        stream = b''.join(udp_pack.pack(packet) for packet in _packets)
+        self.assertIsNone(udp_pack.frame_size(stream[0:5]))
+        unpacked = []
+        while stream:
+            frame_size = udp_pack.frame_size(stream)
+            assert frame_size is not None
+            unpacked.append(udp_pack.unpack(stream[0:frame_size]))
+            stream = stream[frame_size:]
+        self.assertEqual(_packets, unpacked)
+        with self.assertRaises(ValueError):
+            udp_pack.frame_size(b'garbage')
+
+    def test_verify_decode(self) -> None:
+        udp_pack = UdpPack(Signatures('secret'), compress_threshold=0)
+        for packet in _packets:
+            payload = udp_pack.verify(udp_pack.pack(packet))
+            assert payload is not None
+            self.assertEqual(packet, udp_pack.decode(bytes(payload)))
+        self.assertIsNone(udp_pack.decode(b''))
+        self.assertIsNone(udp_pack.decode(b'\xff'))
+
+    def test_pickled_signatures(self) -> None:
+        signatures = Signatures('secret', algorithm='blake2s', salt_len=8)
+        unpickled = pickle.loads(pickle.dumps(signatures))  # noqa: S301
+        self.assertEqual(8, unpickled.salt_len)
+        self.assertEqual('blake2s', unpickled.algorithm.name)
+        packed = UdpPack(signatures).pack(Ping(source=_source))
+        self.assertEqual(Ping(source=_source),
+                         UdpPack(unpickled).unpack(packed))
+
+    def test_unique_salts(self) -> None:
+        signatures = Signatures('secret')
+        with ThreadPoolExecutor(4) as executor:
+            salts = list(executor.map(
+                lambda _: signatures.sign(b'data').salt, range(4000)))
+        self.assertEqual(len(salts), len(set(salts)))
+
+    def test_invalid_signature(self) -> None:
+        udp_pack = UdpPack(Signatures('secret'))
+        other_pack = UdpPack(Signatures('other'))
+        packed = other_pack.pack(Ping(source=_source))
+        self.assertIsNone(udp_pack.unpack(packed))
+
+    def test_malformed(self) -> None:
+        udp_pack = UdpPack(Signatures('secret'))
+        packed = udp_pack.pack(Ping(source=_source))
+        self.assertIsNone(udp_pack.unpack(packed[:-1]))
+        self.assertIsNone(udp_pack.unpack(packed[0:3]))
+        self.assertIsNone(udp_pack.unpack(b''))
+
+    def test_binary_aggregate_status(self) -> None:
+        codec = BinaryCodec()
+        for status in (Status.AVAILABLE, Status.UNAVAILABLE, Status.ALL):
+            record = GossipRecord(name='127.0.0.1:2003', clock=1,
+                                  status=status, metadata=None)
+            data = codec.encode(Gossip(source=_source, gossip=(record, )))
+            with self.assertRaises(CodecError):
+                codec.decode(memoryview(data))
+
+    def test_signatures_hash_name(self) -> None:
+        with self.assertWarns(DeprecationWarning):
+            signatures = Signatures('secret', hash_name='sha512')
+        self.assertEqual('sha512', signatures.hash_name)
+        self.assertEqual('hmac-sha512', signatures.algorithm.name)
+        other = Signatures('secret', algorithm='hmac-sha512')
+        self.assertEqual('sha512', other.hash_name)
+        packed = UdpPack(signatures).pack(Ping(source=_source))
+        self.assertEqual(Ping(source=_source), UdpPack(other).unpack(packed))
+        with self.assertRaises(ValueError):
+            Signatures('secret', algorithm='blake2b', hash_name='sha256')
+
+    def test_legacy(self) -> None:
+        legacy_signatures = Signatures('secret', version='0.6.3')
+        old_pack = UdpPack(legacy_signatures, codec=PickleCodec())
+        udp_pack = UdpPack(Signatures('secret'),
+                           legacy_signatures=legacy_signatures)
+        plain_pack = UdpPack(Signatures('secret'))
+        for legacy, packet in _legacy_packets:
+            packed = old_pack.pack(legacy)
+            self.assertEqual(packet, udp_pack.unpack(packed))
+            self.assertIsNone(plain_pack.unpack(packed))
+            payload = udp_pack.verify(packed)
+            assert payload is not None
+            self.assertEqual(LegacyCodec.codec_id, payload[0])
+        for packet in _packets:
+            self.assertEqual(packet, udp_pack.unpack(
+                plain_pack.pack(packet)))
+        self.assertIsNone(udp_pack.unpack(old_pack.pack(_legacy(
+            Gossip, source=_legacy_source, name='127.0.0.1:2003', clock=1,
+            status=Status.AVAILABLE, metadata=None))))
+        self.assertIsNone(udp_pack.unpack(old_pack.pack(
+            _legacy(Ping, source=_legacy_source, seq=len))))
+        with self.assertRaises(CodecError):
+            LegacyCodec().decode(memoryview(b'\x00' + pickle.dumps(len)))
@@ -0,0 +1,100 @@
+
+from __future__ import annotations
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from swimprotocol.address import Address
+from swimprotocol.packet import Source, Packet, Ping
+from swimprotocol.queue import merge_packets, PacketQueue
+from swimprotocol.sign import Signatures
+from swimprotocol.udp.offload import Offload
+from swimprotocol.udp.pack import UdpPack
+from swimprotocol.udp.pool import TcpPool
+from swimprotocol.udp.protocol import TcpProtocol
+from swimprotocol.udp.recv import UdpRecv
+
+
+class TestTcpPool(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        self.udp_pack = udp_pack = UdpPack(Signatures('secret'))
+        self.recv_queue: PacketQueue[Packet] = PacketQueue(
+            lambda packet: packet, lambda packet: packet.source,
+            merge_packets)
+        self.udp_recv = UdpRecv(udp_pack, Offload(4096), self.recv_queue)
+        self.packets = [Ping(source=Source(f'127.0.0.1:{port}', b'validity'),
+                             seq=port)
+                        for port in range(2000, 2004)]
+
+    async def _receive(self, count: int) -> list[Packet]:
+        return [await asyncio.wait_for(self.recv_queue.get(), 1.0)
+                for _ in range(count)]
+
+    async def test_send(self) -> None:
+        loop = asyncio.get_running_loop()
+        protocols: list[TcpProtocol] = []
+
+        def protocol_factory() -> TcpProtocol:
+            protocol = TcpProtocol(self.udp_recv)
+            protocols.append(protocol)
+            return protocol
+        server = await loop.create_server(
+            protocol_factory, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        address = Address('127.0.0.1', port)
+        data = [self.udp_pack.pack(packet) for packet in self.packets]
+        try:
+            async with self.udp_recv:
+                with TcpPool(idle_timeout=10.0, max_connections=2) as pool:
+                    pool.send(address, data[0])
+                    pool.send(address, data[1])
+                    self.assertEqual(self.packets[0:2],
+                                     await self._receive(2))
+                    split = len(data[2]) // 2
+                    pool.send(address, data[2][0:split])
+                    await asyncio.sleep(0.05)
+                    self.assertTrue(self.recv_queue.empty())
+                    pool.send(address, data[2][split:] + data[3])
+                    self.assertEqual(self.packets[2:4],
+                                     await self._receive(2))
+                    self.assertEqual(1, len(pool))
+        finally:
+            server.close()
+            await server.wait_closed()
+        self.assertEqual(1, len(protocols))
+
+    async def test_max_buffer_size(self) -> None:
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(
+            lambda: TcpProtocol(self.udp_recv), '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        address = Address('127.0.0.1', port)
+        data = [self.udp_pack.pack(packet) for packet in self.packets]
+        try:
+            async with self.udp_recv:
+                with TcpPool(idle_timeout=10.0, max_connections=2,
+                             max_buffer_size=len(data[0])) as pool:
+                    pool.send(address, data[0])
+                    pool.send(address, data[1])
+                    self.assertEqual(1, pool.dropped)
+                    self.assertEqual(self.packets[0:1],
+                                     await self._receive(1))
+                    pool.send(address, data[2])
+                    self.assertEqual(self.packets[2:3],
+                                     await self._receive(1))
+                    await asyncio.sleep(0.05)
+                    self.assertTrue(self.recv_queue.empty())
+                    self.assertEqual(1, pool.dropped)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    async def test_data_received(self) -> None:
+        protocol = TcpProtocol(self.udp_recv)
+        data = b''.join(self.udp_pack.pack(packet)
+                        for packet in self.packets)
+        async with self.udp_recv:
+            for i in range(0, len(data), 7):
+                protocol.data_received(data[i:i + 7])
+            self.assertEqual(self.packets, await self._receive(4))
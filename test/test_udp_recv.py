@@ -0,0 +1,37 @@
+
+from __future__ import annotations
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from swimprotocol.packet import Source, Packet, Ping
+from swimprotocol.queue import merge_packets, PacketQueue
+from swimprotocol.sign import Signatures
+from swimprotocol.udp.offload import Offload
+from swimprotocol.udp.pack import UdpPack
+from swimprotocol.udp.recv import UdpRecv
+
+
+class TestUdpRecv(IsolatedAsyncioTestCase):
+
+    async def test_push(self) -> None:
+        udp_pack = UdpPack(Signatures('secret'))
+        recv_queue: PacketQueue[Packet] = PacketQueue(
+            lambda packet: packet, lambda packet: packet.source,
+            merge_packets)
+        udp_recv = UdpRecv(udp_pack, Offload(4096), recv_queue,
+                           ring_size=4, batch_size=2)
+        packets = [Ping(source=Source(f'127.0.0.1:{port}', b'validity'))
+                   for port in range(2000, 2006)]
+        for packet in packets:
+            udp_recv.push(udp_pack.pack(packet))
+        udp_recv.push(b'invalid')
+        self.assertEqual(4, udp_recv.depth)
+        self.assertEqual(7, udp_recv.received)
+        self.assertEqual(3, udp_recv.dropped)
+        async with udp_recv:
+            received = [await asyncio.wait_for(recv_queue.get(), 1.0)
+                        for _ in range(3)]
+        self.assertEqual(packets[3:], received)
+        self.assertEqual(1, udp_recv.invalid)
+        self.assertEqual(0, udp_recv.depth)
@@ -0,0 +1,36 @@
+
+from __future__ import annotations
+
+import asyncio
+import socket
+from unittest import IsolatedAsyncioTestCase
+
+from swimprotocol.address import Address, AddressParser
+from swimprotocol.config import BaseConfig
+from swimprotocol.members import Members
+from swimprotocol.udp.resolve import Resolver
+
+
+class TestResolver(IsolatedAsyncioTestCase):
+
+    def _members(self) -> Members:
+        return Members(BaseConfig(secret=None, local_name='127.0.0.1:2001',
+                                  peers=['127.0.0.1:2002', 'localhost:2003']))
+
+    async def test_resolve(self) -> None:
+        members = self._members()
+        resolver = Resolver(AddressParser(), ttl=0.0,
+                            family=socket.AF_INET)
+        peer1 = members.get('127.0.0.1:2002')
+        peer2 = members.get('localhost:2003')
+        self.assertIsNone(resolver.get_cached(peer1))
+        resolved = await resolver.resolve(peer1)
+        self.assertEqual(Address('127.0.0.1', 2002), resolved.address)
+        self.assertEqual(('127.0.0.1', 2002), resolved.sockaddr)
+        self.assertIs(resolved, await resolver.resolve(peer1))
+        resolved = await resolver.resolve(peer2)
+        self.assertEqual(Address('localhost', 2003), resolved.address)
+        self.assertEqual(('127.0.0.1', 2003), resolved.sockaddr)
+        self.assertIs(resolved, await resolver.resolve(peer2))
+        await asyncio.sleep(0.01)
+        self.assertEqual(resolved, resolver.get_cached(peer2))
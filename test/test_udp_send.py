@@ -0,0 +1,79 @@
+
+from __future__ import annotations
+
+import math
+import unittest
+
+from swimprotocol.packet import Source, Ping, Gossip, GossipAck, GossipRecord
+from swimprotocol.sign import Signatures
+from swimprotocol.status import Status
+from swimprotocol.udp.pack import UdpPack
+from swimprotocol.udp.send import _split, _estimate_size
+
+_source = Source('local', b'validity')
+
+
+class TestUdpSend(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.udp_pack = UdpPack(Signatures('secret'))
+        self.records = [GossipRecord(f'member{i}', i, Status.ONLINE,
+                                     {'key': b'x' * 40})
+                        for i in range(20)]
+
+    def test_split_gossip(self) -> None:
+        mtu_size = 400
+        packet = Gossip(source=_source, gossip=self.records)
+        packet_data = self.udp_pack.pack(packet)
+        self.assertGreater(len(packet_data), mtu_size)
+        parts = _split(packet, math.ceil(len(packet_data) / mtu_size))
+        self.assertEqual(4, len(parts))
+        for part in parts:
+            assert isinstance(part, Gossip)
+            self.assertEqual(_source, part.source)
+            self.assertLessEqual(len(self.udp_pack.pack(part)), mtu_size)
+        self.assertEqual(self.records,
+                         [record for part in parts for record in part.gossip])
+
+    def test_split_gossip_acks(self) -> None:
+        gossip_acks = {f'member{i}': i for i in range(10)}
+        packet = GossipAck(source=_source, gossip_acks=gossip_acks)
+        parts = _split(packet, 3)
+        self.assertEqual(3, len(parts))
+        merged: dict[str, int] = {}
+        for part in parts:
+            assert isinstance(part, GossipAck)
+            self.assertLessEqual(len(part.gossip_acks), 4)
+            merged.update(part.gossip_acks)
+        self.assertEqual(gossip_acks, merged)
+
+    def test_split_single_record(self) -> None:
+        record = GossipRecord('member', 1, Status.ONLINE,
+                              {'key': b'x' * 4096})
+        packet = Gossip(source=_source, gossip=[record])
+        self.assertGreater(len(self.udp_pack.pack(packet)), 1500)
+        parts = _split(packet, 3)
+        self.assertEqual(1, len(parts))
+        self.assertIs(packet, parts[0])
+
+    def test_split_other(self) -> None:
+        packet = Ping(source=_source, seq=1, gossip=self.records)
+        parts = _split(packet, 4)
+        self.assertEqual(1, len(parts))
+        part = parts[0]
+        assert isinstance(part, Ping)
+        self.assertEqual(1, part.seq)
+        self.assertEqual(self.records[0:5], list(part.gossip))
+        packet = Ping(source=_source, seq=2)
+        self.assertEqual([packet], _split(packet, 4))
+
+    def test_estimate_size(self) -> None:
+        ping = Ping(source=_source, seq=1)
+        self.assertEqual(64, _estimate_size(ping))
+        packet = Gossip(source=_source, gossip=self.records)
+        self.assertGreaterEqual(_estimate_size(packet),
+                                len(self.udp_pack.pack(packet)))
+        record = GossipRecord('member', 1, Status.ONLINE,
+                              {'key': b'x' * 4096})
+        packet = Gossip(source=_source, gossip=[record])
+        self.assertGreater(_estimate_size(packet), 4096)
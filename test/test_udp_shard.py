@@ -0,0 +1,60 @@
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import sys
+import unittest
+from unittest import IsolatedAsyncioTestCase
+
+from swimprotocol.packet import Source, Packet, Ping
+from swimprotocol.queue import merge_packets, PacketQueue
+from swimprotocol.sign import Signatures
+from swimprotocol.udp.pack import UdpPack
+from swimprotocol.udp.shard import ShardedRecv
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+@unittest.skipUnless(sys.platform == 'linux', 'requires SO_REUSEPORT')
+class TestShardedRecv(IsolatedAsyncioTestCase):
+
+    async def test_recv(self) -> None:
+        udp_pack = UdpPack(Signatures('secret'))
+        bad_pack = UdpPack(Signatures('other'))
+        recv_queue: PacketQueue[Packet] = PacketQueue(
+            lambda packet: packet, lambda packet: packet.source,
+            merge_packets)
+        local_addr = ('127.0.0.1', _free_port())
+        senders = [socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                   for _ in range(8)]
+        received: dict[str, Packet] = {}
+        try:
+            with ShardedRecv(udp_pack, recv_queue, local_addr,
+                             processes=2) as sharded_recv:
+                for _ in range(100):
+                    for i, sender in enumerate(senders):
+                        sender.sendto(bad_pack.pack(Ping(
+                            source=Source(f'bad{i}', b'validity'),
+                            seq=i)), local_addr)
+                        sender.sendto(udp_pack.pack(Ping(
+                            source=Source(f'good{i}', b'validity'),
+                            seq=i)), local_addr)
+                    await asyncio.sleep(0.1)
+                    while not recv_queue.empty():
+                        packet = await recv_queue.get()
+                        received[packet.source.name] = packet
+                    if len(received) == len(senders):
+                        break
+                self.assertGreaterEqual(sharded_recv.received, len(senders))
+        finally:
+            for sender in senders:
+                sender.close()
+        self.assertEqual({f'good{i}': Ping(
+            source=Source(f'good{i}', b'validity'), seq=i)
+            for i in range(len(senders))}, received)
@@ -0,0 +1,229 @@
+
+from __future__ import annotations
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from swimprotocol.config import BaseConfig
+from swimprotocol.members import Member, Members
+from swimprotocol.packet import Source, Ping, PingReq, Ack, Gossip
+from swimprotocol.status import Status
+from swimprotocol.worker import Worker
+
+_peer1 = Source('peer1', b'validity1')
+_peer2 = Source('peer2', b'validity2')
+
+
+class TestWorker(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        config = BaseConfig(secret=None, local_name='local',
+                            peers=['peer1', 'peer2'],
+                            ping_timeout=10.0, ping_req_timeout=10.0)
+        self.members = members = Members(config)
+        for source in (_peer1, _peer2):
+            member = members.get(source.name, source.validity)
+            members.update(member, new_status=Status.ONLINE)
+        self.worker = worker = Worker(config, members)
+        self.handler = asyncio.create_task(worker._run_handler())
+
+    async def asyncTearDown(self) -> None:
+        self.handler.cancel()
+
+    async def test_check_ack(self) -> None:
+        peer1 = self.members.get('peer1')
+        check = asyncio.create_task(self.worker.check(peer1))
+        target, ping = await self.worker.send_queue.get()
+        self.assertIs(peer1, target)
+        assert isinstance(ping, Ping)
+        recv_queue = self.worker.recv_queue
+        await recv_queue.put(Gossip(source=_peer1))
+        await recv_queue.put(Ack(source=_peer1, seq=ping.seq + 1))
+        await recv_queue.put(Ack(source=_peer2, seq=ping.seq))
+        await asyncio.sleep(0.01)
+        self.assertFalse(check.done())
+        await recv_queue.put(Ack(source=_peer1, seq=ping.seq))
+        await asyncio.wait_for(check, 1.0)
+        self.assertEqual(Status.ONLINE, peer1.status)
+        self.assertIsNotNone(peer1.rtt)
+        self.assertEqual({}, self.worker._probes)
+
+    async def test_ping_req_forward(self) -> None:
+        peer1 = self.members.get('peer1')
+        peer2 = self.members.get('peer2')
+        recv_queue = self.worker.recv_queue
+        send_queue = self.worker.send_queue
+        await recv_queue.put(PingReq(source=_peer1, target='peer2', seq=7))
+        target, ping = await send_queue.get()
+        self.assertIs(peer2, target)
+        assert isinstance(ping, Ping)
+        await recv_queue.put(Ack(source=_peer2, seq=ping.seq))
+        await recv_queue.put(Ack(source=_peer2, seq=ping.seq))
+        target, ack = await send_queue.get()
+        self.assertIs(peer1, target)
+        self.assertEqual(Ack(source=_peer2, seq=7), ack)
+        await asyncio.sleep(0.01)
+        self.assertTrue(send_queue.empty())
+        self.assertEqual({}, self.worker._forwarding)
+
+    async def test_bad_packet(self) -> None:
+        errors: list[dict[str, object]] = []
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda loop, context: errors.append(
+            context))
+        bad = object.__new__(Ping)
+        object.__setattr__(bad, 'source', _peer1)
+        await self.worker.recv_queue.put(bad)
+        await self.worker.recv_queue.put(Ping(source=_peer1, seq=3))
+        target, ack = await asyncio.wait_for(
+            self.worker.send_queue.get(), 1.0)
+        assert isinstance(ack, Ack)
+        self.assertEqual(3, ack.seq)
+        self.assertEqual(1, len(errors))
+        self.assertFalse(self.handler.done())
+
+    def _with_rtt(self, name: str, rtt: float) -> Member:
+        member = self.members.get(name)
+        self.members.add_rtt(member, rtt)
+        return member
+
+    async def test_ping_timeout(self) -> None:
+        worker = self.worker
+        self.assertEqual(10.0, worker._ping_timeout(self.members.get('new')))
+        # a single sample of rtt gives a deviation of rtt / 2
+        self.assertAlmostEqual(0.3, worker._ping_timeout(
+            self._with_rtt('peer3', 0.1)))
+        self.assertEqual(0.05, worker._ping_timeout(
+            self._with_rtt('peer4', 0.01)))
+        self.assertEqual(1.0, worker._ping_timeout(
+            self._with_rtt('peer5', 0.5)))
+
+    async def test_ping_req_timeout(self) -> None:
+        worker = self.worker
+        target = self._with_rtt('peer3', 0.1)
+        indirect = self._with_rtt('peer4', 0.2)
+        self.assertEqual(10.0, worker._ping_req_timeout(
+            self.members.get('new'), {indirect}))
+        self.assertEqual(10.0, worker._ping_req_timeout(
+            target, {indirect, self.members.get('new')}))
+        self.assertAlmostEqual(1.8, worker._ping_req_timeout(
+            target, {indirect}))
+        self.assertEqual(0.15, worker._ping_req_timeout(
+            self._with_rtt('peer5', 0.01), {self._with_rtt('peer6', 0.01)}))
+        self.assertEqual(3.0, worker._ping_req_timeout(
+            self._with_rtt('peer7', 0.5), {self._with_rtt('peer8', 0.5)}))
+
+    async def test_reap_error(self) -> None:
+        def reap() -> None:
+            raise RuntimeError()
+        self.members.reap = reap  # type: ignore[method-assign]
+        scheduler = self.worker._scheduler
+        with self.assertRaises(RuntimeError):
+            self.worker._reap()
+        self.assertEqual(1, len(scheduler))
+        scheduler.close()
+
+
+class TestWorkerReconnect(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        config = BaseConfig(secret=None, local_name='local',
+                            peers=['peer1'], ping_timeout=0.01,
+                            reconnect_interval=0.01,
+                            reconnect_max_interval=0.04,
+                            offline_ttl=0.0, tombstone_retention=0.0)
+        self.members = members = Members(config)
+        self.peer1 = peer1 = members.get(_peer1.name, _peer1.validity)
+        members.update(peer1, new_status=Status.OFFLINE)
+        self.worker = worker = Worker(config, members)
+        self.handler = asyncio.create_task(worker._run_handler())
+
+    async def asyncTearDown(self) -> None:
+        self.handler.cancel()
+        self.worker._scheduler.close()
+
+    async def _next_ping(self) -> tuple[Ping, float]:
+        target, ping = await asyncio.wait_for(
+            self.worker.send_queue.get(), 1.0)
+        self.assertIs(self.peer1, target)
+        assert isinstance(ping, Ping)
+        return ping, self.worker._reconnect[self.peer1][0]
+
+    async def test_backoff(self) -> None:
+        worker = self.worker
+        peer1 = self.peer1
+        worker._refresh_reconnect(peer1)
+        intervals = [(await self._next_ping())[1] for _ in range(4)]
+        self.assertEqual([0.01, 0.02, 0.04, 0.04], intervals)
+        ping, _ = await self._next_ping()
+        await worker.recv_queue.put(Ack(source=_peer1, seq=ping.seq))
+        for _ in range(100):
+            if peer1.status == Status.ONLINE:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(Status.ONLINE, peer1.status)
+        self.assertNotIn(peer1, worker._reconnect)
+        self.members.update(peer1, new_status=Status.SUSPECT)
+        self.members.update(peer1, new_status=Status.OFFLINE)
+        worker._refresh_reconnect(peer1)
+        _, interval = await self._next_ping()
+        self.assertEqual(0.01, interval)
+
+    async def test_reap(self) -> None:
+        worker = self.worker
+        members = self.members
+        peer3 = members.get('peer3')
+        members.apply(peer3, peer3, 5, status=Status.OFFLINE, metadata={})
+        worker._refresh_reconnect(peer3)
+        worker._handle_status(peer3, Status.SUSPECT)
+        worker._get_cached_gossip(self.peer1, peer3)
+        self.assertIn(peer3, worker._gossip_cache)
+        worker._reap()
+        worker._reap()
+        self.assertTrue(peer3.removed)
+        self.assertEqual(2, len(worker._scheduler))
+        new_peer3 = members.get('peer3')
+        self.assertIsNot(peer3, new_peer3)
+        self.assertNotIn(new_peer3, worker._suspect)
+        self.assertNotIn(new_peer3, worker._reconnect)
+        self.assertNotIn(new_peer3, worker._gossip_cache)
+
+
+class TestWorkerGossip(IsolatedAsyncioTestCase):
+
+    def _worker(self, name: str, peers: list[str]) -> Worker:
+        config = BaseConfig(secret=None, local_name=name, peers=peers,
+                            local_metadata={'k1': b'1'})
+        members = Members(config)
+        for peer in peers:
+            members.update(members.get(peer), new_status=Status.ONLINE)
+        return Worker(config, members)
+
+    async def _gossip(self, src: Worker, dst: Worker) -> None:
+        target = src.members.get(dst.members.local.name)
+        gossip = src._get_gossip(target)
+        await dst._handle_packet(Gossip(source=src.members.local.source,
+                                        gossip=gossip))
+        while not dst.send_queue.empty():
+            _, packet = dst.send_queue.get_nowait()
+            await src._handle_packet(packet)
+
+    async def test_delta_removed_key(self) -> None:
+        x = self._worker('x', ['b', 'c'])
+        b = self._worker('b', ['x', 'c'])
+        c = self._worker('c', ['x', 'b'])
+        x_local = x.members.local
+        await self._gossip(x, b)
+        await self._gossip(x, c)
+        await self._gossip(b, c)
+        x.members.update(x_local, new_metadata={'k1': b'1', 'k4': b'4'})
+        await self._gossip(x, c)
+        self.assertEqual({'k1': b'1', 'k4': b'4'},
+                         c.members.get('x').metadata)
+        x.members.update(x_local, new_metadata={'k1': b'3'})
+        await self._gossip(x, b)
+        await self._gossip(b, c)
+        for worker in (b, c):
+            member = worker.members.get('x')
+            self.assertEqual(x_local.clock, member.clock)
+            self.assertEqual({'k1': b'3'}, member.metadata)